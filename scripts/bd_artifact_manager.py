@@ -8,11 +8,55 @@ import subprocess
 import json
 import os
 import re
+import sys
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from packaging import version
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+
+
+# groupId fragments of our own projects, matched anywhere in the groupId
+_OWNED_GROUP_RE = re.compile("|".join(map(re.escape, ("no.lau", "stiglau", "vdvil", "kompost"))),
+                             re.IGNORECASE)
+
+# Directories that never hold a project's own build files
+_SCAN_SKIP_DIRS = frozenset({"target", "node_modules", ".git", ".venv"})
+
+# Namespace-qualified POM tags, so parsing compares strings instead of resolving prefixes
+_POM_NS = "{http://maven.apache.org/POM/4.0.0}"
+_POM_REPOSITORY = _POM_NS + "repository"
+_POM_DEPENDENCY = _POM_NS + "dependency"
+_POM_MODULE = _POM_NS + "module"
+_POM_ID = _POM_NS + "id"
+_POM_URL = _POM_NS + "url"
+_POM_GROUP_ID = _POM_NS + "groupId"
+_POM_ARTIFACT_ID = _POM_NS + "artifactId"
+_POM_VERSION = _POM_NS + "version"
+
+# MAJOR[.MINOR[.PATCH[.BUILD]]][-QUALIFIER]; missing components count as 0
+_VERSION_RE = re.compile(r"(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:\.(\d+))?(?:[-.](.+))?$")
+# Qualifier name and optional number, e.g. "rc1", "beta-2", "SNAPSHOT"
+_QUALIFIER_RE = re.compile(r"([A-Za-z]+)[.-]?(\d*)$")
+# Qualifier ranks in the low 16 bits of a version key, ordered like Maven:
+# unknown < pre-releases (alpha < beta < milestone < rc, then by number) < SNAPSHOT < release.
+# The high byte ranks the qualifier name, the low byte its number.
+_QUALIFIER_RANK = {
+    "alpha": 1, "a": 1,
+    "beta": 2, "b": 2,
+    "milestone": 3, "m": 3,
+    "rc": 4, "cr": 4,
+    "snapshot": 0xFF,
+}
+_RELEASE_RANK = 0xFFFF
+# Qualifiers Maven treats as the release itself, e.g. "1.0.Final" == "1.0"
+_RELEASE_QUALIFIERS = frozenset({"final", "ga", "release"})
+# Bits per numeric component of a packed version key; date-stamped patches like 20231201 fit
+_VERSION_FIELD_BITS = 32
+_VERSION_FIELD_MAX = (1 << _VERSION_FIELD_BITS) - 1
 
 
 @dataclass
@@ -23,9 +67,109 @@ class Artifact:
     source: str  # "local", "github_packages", "maven_central"
     path: Optional[str] = None
     release_date: Optional[str] = None
+    
+    def __post_init__(self):
+        # A handful of groupIds and sources repeat across every artifact; share one string each
+        self.group_id = sys.intern(self.group_id)
+        self.source = sys.intern(self.source)
+
+
+def _iter_paginated(output: str) -> Iterator[Any]:
+    """Yield the items of `gh api --paginate` output, which concatenates one JSON array per page"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while pos < len(output) and output[pos].isspace():
+            pos += 1
+        if pos == len(output):
+            return
+        page, pos = decoder.raw_decode(output, pos)
+        yield from page
+
+
+# GitHub Packages version lists, reused for a day; BD_DISABLE_VERSION_CACHE=1 bypasses it
+VERSION_CACHE_FILE = Path.home() / ".cache" / "bd_artifact_manager" / "versions.json"
+VERSION_CACHE_TTL_SECONDS = 24 * 60 * 60
+_VERSION_CACHE_LOCK = threading.Lock()
+_version_cache: Optional[Dict[str, Any]] = None
+
+
+def _version_cache_enabled() -> bool:
+    return os.environ.get("BD_DISABLE_VERSION_CACHE") != "1"
+
+
+def _cached_versions(key: str) -> Optional[List[Artifact]]:
+    """Versions cached under `key` if fetched within the TTL"""
+    global _version_cache
+    with _VERSION_CACHE_LOCK:
+        if _version_cache is None:
+            try:
+                _version_cache = json.loads(VERSION_CACHE_FILE.read_text())
+            except (OSError, ValueError):
+                _version_cache = {}
+        entry = _version_cache.get(key)
+    if entry and time.time() - entry["fetched_at"] < VERSION_CACHE_TTL_SECONDS:
+        return [Artifact(**item) for item in entry["versions"]]
+    return None
+
+
+def _store_versions(key: str, artifacts: List[Artifact]):
+    """Cache the versions fetched for `key`, replacing the cache file atomically"""
+    with _VERSION_CACHE_LOCK:
+        if _version_cache is None:
+            return
+        _version_cache[key] = {
+            "fetched_at": time.time(),
+            "versions": [asdict(artifact) for artifact in artifacts]
+        }
+        try:
+            VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = VERSION_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(_version_cache))
+            os.replace(tmp_file, VERSION_CACHE_FILE)
+        except OSError:
+            pass  # A cold cache only costs another API call
+
+
+def _local_snapshot_recommendations(local: Artifact) -> List[str]:
+    if local.version.endswith("-SNAPSHOT"):
+        return [f"🔧 Using local SNAPSHOT {local.version} - good for development"]
+    return []
+
+
+def _compare_local_and_github(local: Artifact, github: Artifact) -> List[str]:
+    recommendations = _local_snapshot_recommendations(local)
+    try:
+        github_ver = ArtifactManager._version_key(github.version)
+        local_ver = ArtifactManager._version_key(local.version)
+        
+        if github_ver > local_ver:
+            recommendations.append(f"⬆️ GitHub has newer version: {github.version} > {local.version}")
+        elif local_ver > github_ver:
+            recommendations.append(f"🚀 Local version is ahead: {local.version} > {github.version}")
+    except TypeError:
+        # An unparseable version's fallback key doesn't compare with a packed one
+        recommendations.append("🔍 Version comparison failed - manual check needed")
+    return recommendations
+
+
+# Sources that have a version -> recommendations builder taking (local, github)
+_RECOMMENDATION_RULES = {
+    frozenset(): lambda local, github: [],
+    frozenset({"local"}): lambda local, github: _local_snapshot_recommendations(local) + [
+        "⚠️ No GitHub Packages found - only local available"
+    ],
+    frozenset({"github_packages"}): lambda local, github: [
+        f"📦 No local build - using GitHub Packages {github.version}"
+    ],
+    frozenset({"local", "github_packages"}): _compare_local_and_github,
+}
 
 
 class ArtifactManager:
+    # Concurrent `gh api` calls for bulk GitHub Packages lookups
+    GITHUB_API_WORKERS = 8
+    
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.local_m2 = Path.home() / ".m2" / "repository"
@@ -38,130 +182,171 @@ class ArtifactManager:
     
     def scan_project_dependencies(self) -> Dict[str, Any]:
         """Scan project for Maven/Gradle dependencies and repository configuration"""
-        pom_files = list(self.project_root.rglob("pom.xml"))
-        gradle_files = list(self.project_root.rglob("build.gradle*"))
-        
         results = {
             "build_system": "unknown",
             "repositories": [],
             "dependencies": [],
+            # The same dependency dicts keyed by "groupId:artifactId"
+            "dependencies_by_id": {},
             "modules": []
         }
         
-        if pom_files:
-            results["build_system"] = "maven"
-            for pom_file in pom_files:
-                self._parse_maven_pom(pom_file, results)
+        # POMs are parsed as the walk finds them
+        gradle_found = False
+        for build_file in self._iter_build_files():
+            if build_file.name == "pom.xml":
+                results["build_system"] = "maven"
+                self._parse_maven_pom(build_file, results)
+            else:
+                gradle_found = True
         
-        elif gradle_files:
+        if results["build_system"] != "maven" and gradle_found:
             results["build_system"] = "gradle"
             # TODO: Implement Gradle parsing
             results["note"] = "Gradle parsing not implemented yet"
             
         return results
     
+    def _iter_build_files(self) -> Iterator[Path]:
+        """Yield pom.xml and build.gradle* files, pruning build output, VCS and venv dirs"""
+        stack = [str(self.project_root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    entries = sorted(entries, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SCAN_SKIP_DIRS and not entry.name.startswith('.'):
+                        subdirs.append(entry.path)
+                elif entry.name == "pom.xml" or entry.name.startswith("build.gradle"):
+                    yield Path(entry.path)
+            # Visit subdirectories in name order
+            stack.extend(reversed(subdirs))
+    
     def _parse_maven_pom(self, pom_file: Path, results: Dict[str, Any]):
-        """Parse Maven POM file for dependencies and repositories"""
+        """Parse Maven POM file for dependencies and repositories
+        
+        Streams the file with iterparse, reading each <repository>, <dependency> and
+        <module> as it closes and clearing it, instead of building the whole tree first.
+        """
+        rel_pom = str(pom_file.relative_to(self.project_root))
+        repos, deps, modules = [], [], []
         try:
-            tree = ET.parse(pom_file)
-            root = tree.getroot()
-            ns = {'m': 'http://maven.apache.org/POM/4.0.0'}
-            
-            # Extract repositories
-            repos = root.findall('.//m:repository', ns)
-            for repo in repos:
-                repo_id = repo.find('m:id', ns)
-                repo_url = repo.find('m:url', ns)
-                if repo_id is not None and repo_url is not None:
-                    repo_info = {
-                        "id": repo_id.text,
-                        "url": repo_url.text,
-                        "file": str(pom_file.relative_to(self.project_root))
-                    }
-                    if repo_info not in results["repositories"]:
-                        results["repositories"].append(repo_info)
-            
-            # Extract dependencies (managed and direct)
-            deps = root.findall('.//m:dependency', ns)
-            for dep in deps:
-                group_id = dep.find('m:groupId', ns)
-                artifact_id = dep.find('m:artifactId', ns)
-                version_elem = dep.find('m:version', ns)
-                
-                if group_id is not None and artifact_id is not None:
-                    dep_version = version_elem.text if version_elem is not None else "unknown"
-                    dep_info = {
-                        "groupId": group_id.text,
-                        "artifactId": artifact_id.text,
-                        "version": dep_version,
-                        "file": str(pom_file.relative_to(self.project_root)),
-                        "is_owned": self._is_owned_artifact(group_id.text)
-                    }
-                    
-                    # Avoid duplicates
-                    dep_key = f"{group_id.text}:{artifact_id.text}"
-                    if not any(d.get("groupId") == group_id.text and d.get("artifactId") == artifact_id.text 
-                              for d in results["dependencies"]):
-                        results["dependencies"].append(dep_info)
-            
-            # Module information
-            modules = root.findall('.//m:module', ns)
-            for module in modules:
-                if module.text:
-                    module_path = pom_file.parent / module.text
-                    if module_path.exists():
-                        results["modules"].append({
-                            "name": module.text,
-                            "path": str(module_path.relative_to(self.project_root)),
-                            "parent_pom": str(pom_file.relative_to(self.project_root))
-                        })
-                        
+            for _, elem in ET.iterparse(pom_file, events=("end",)):
+                tag = elem.tag
+                if tag == _POM_REPOSITORY:
+                    repos.append((elem.findtext(_POM_ID), elem.findtext(_POM_URL)))
+                    elem.clear()
+                elif tag == _POM_DEPENDENCY:
+                    # Managed and direct dependencies alike
+                    deps.append((elem.findtext(_POM_GROUP_ID), elem.findtext(_POM_ARTIFACT_ID),
+                                 elem.findtext(_POM_VERSION)))
+                    elem.clear()
+                elif tag == _POM_MODULE:
+                    modules.append(elem.text)
         except ET.ParseError as e:
             results.setdefault("parse_errors", []).append(f"Error parsing {pom_file}: {e}")
+            return
+        
+        # Extract repositories
+        for repo_id, repo_url in repos:
+            if repo_id is not None and repo_url is not None:
+                repo_info = {
+                    "id": repo_id,
+                    "url": repo_url,
+                    "file": rel_pom
+                }
+                if repo_info not in results["repositories"]:
+                    results["repositories"].append(repo_info)
+        
+        # Extract dependencies (managed and direct), keeping the first declaration of each
+        dependencies_by_id = results["dependencies_by_id"]
+        for group_id, artifact_id, dep_version in deps:
+            dep_key = f"{group_id}:{artifact_id}"
+            if group_id is not None and artifact_id is not None and dep_key not in dependencies_by_id:
+                dep_info = {
+                    "groupId": group_id,
+                    "artifactId": artifact_id,
+                    "version": dep_version if dep_version is not None else "unknown",
+                    "file": rel_pom,
+                    "is_owned": self._is_owned_artifact(group_id)
+                }
+                dependencies_by_id[dep_key] = dep_info
+                results["dependencies"].append(dep_info)
+        
+        # Module information
+        for module in modules:
+            if module:
+                module_path = pom_file.parent / module
+                if module_path.exists():
+                    results["modules"].append({
+                        "name": module,
+                        "path": str(module_path.relative_to(self.project_root)),
+                        "parent_pom": rel_pom
+                    })
     
     def _is_owned_artifact(self, group_id: str) -> bool:
         """Check if artifact belongs to our owned projects"""
-        owned_patterns = ["no.lau", "stiglau", "vdvil", "kompost"]
-        return any(pattern in group_id.lower() for pattern in owned_patterns)
+        return _OWNED_GROUP_RE.search(group_id) is not None
     
     def scan_local_m2_versions(self, group_id: str, artifact_id: str) -> List[Artifact]:
         """Scan ~/.m2/repository for local versions of an artifact"""
-        group_path = self.local_m2 / group_id.replace('.', '/')
-        artifact_path = group_path / artifact_id
-        
-        artifacts = []
-        
-        if not artifact_path.exists():
-            return artifacts
+        return self.build_m2_index([(group_id, artifact_id)]).get((group_id, artifact_id), [])
+    
+    def build_m2_index(self, coordinates: Iterable[Tuple[str, str]]
+                       ) -> Dict[Tuple[str, str], List[Artifact]]:
+        """Index local ~/.m2 versions of the given (groupId, artifactId) pairs in one pass
         
-        # Find version directories
-        for version_dir in artifact_path.iterdir():
-            if version_dir.is_dir() and not version_dir.name.startswith('.'):
-                # Look for JAR files in this version
-                jar_files = list(version_dir.glob("*.jar"))
-                if jar_files:
+        Uses os.scandir, whose entries carry their file type, instead of a stat per path.
+        """
+        index = {}
+        for group_id, artifact_id in coordinates:
+            artifact_path = self.local_m2 / group_id.replace('.', '/') / artifact_id
+            artifacts = index.setdefault((group_id, artifact_id), [])
+            try:
+                with os.scandir(artifact_path) as entries:
+                    version_dirs = [entry for entry in entries
+                                    if entry.is_dir() and not entry.name.startswith('.')]
+            except OSError:
+                continue
+            
+            for version_dir in version_dirs:
+                # Only versions with a JAR built or downloaded count
+                with os.scandir(version_dir.path) as entries:
+                    has_jar = any(entry.name.endswith('.jar') for entry in entries)
+                if has_jar:
                     artifacts.append(Artifact(
                         group_id=group_id,
                         artifact_id=artifact_id,
                         version=version_dir.name,
                         source="local",
-                        path=str(version_dir)
+                        path=version_dir.path
                     ))
         
-        return artifacts
+        return index
     
     def check_github_packages_versions(self, repo: str, group_id: str, artifact_id: str) -> List[Artifact]:
         """Check GitHub Packages for available versions"""
+        cache_key = f"{repo}/{group_id}/{artifact_id}"
+        use_cache = _version_cache_enabled()
+        if use_cache:
+            cached = _cached_versions(cache_key)
+            if cached is not None:
+                return cached
+        
         artifacts = []
         
         try:
-            # Use GitHub CLI to get package versions
-            cmd = ['gh', 'api', f'/repos/{repo}/packages/maven/{group_id}.{artifact_id}/versions']
+            # Use GitHub CLI to get package versions, every page in one invocation
+            cmd = ['gh', 'api', '--paginate', f'/repos/{repo}/packages/maven/{group_id}.{artifact_id}/versions']
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
-                versions_data = json.loads(result.stdout)
-                for version_info in versions_data:
+                for version_info in _iter_paginated(result.stdout):
                     artifacts.append(Artifact(
                         group_id=group_id,
                         artifact_id=artifact_id,
@@ -169,6 +354,8 @@ class ArtifactManager:
                         source="github_packages",
                         release_date=version_info.get('created_at')
                     ))
+                if use_cache:
+                    _store_versions(cache_key, artifacts)
             
         except (subprocess.CalledProcessError, json.JSONDecodeError):
             # Silently fail for now
@@ -176,6 +363,20 @@ class ArtifactManager:
         
         return artifacts
     
+    def check_github_packages_versions_bulk(self, queries: Iterable[Tuple[str, str, str]]
+                                            ) -> Dict[Tuple[str, str, str], List[Artifact]]:
+        """Check GitHub Packages for many (repo, groupId, artifactId) at once
+        
+        Each lookup is a network-bound `gh api` call, so they run concurrently.
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.GITHUB_API_WORKERS, len(queries))) as executor:
+            return dict(zip(queries, executor.map(
+                lambda query: self.check_github_packages_versions(*query), queries
+            )))
+    
     def compare_versions(self, artifacts: List[Artifact]) -> Dict[str, Any]:
         """Compare versions and determine latest/recommended versions"""
         if not artifacts:
@@ -190,11 +391,8 @@ class ArtifactManager:
         latest_versions = {}
         for source, source_artifacts in by_source.items():
             try:
-                # Sort by version, handle SNAPSHOT versions specially
-                sorted_artifacts = sorted(source_artifacts, 
-                                        key=lambda a: self._version_key(a.version), 
-                                        reverse=True)
-                latest_versions[source] = sorted_artifacts[0] if sorted_artifacts else None
+                # Packed int keys compare in one step; only unparseable versions mix in tuples
+                latest_versions[source] = max(source_artifacts, key=lambda a: ArtifactManager._version_key(a.version))
             except Exception:
                 # Fallback to simple string comparison
                 latest_versions[source] = max(source_artifacts, key=lambda a: a.version)
@@ -205,54 +403,52 @@ class ArtifactManager:
             "recommendations": self._generate_recommendations(latest_versions)
         }
     
-    def _version_key(self, version_str: str) -> Tuple:
-        """Create sortable version key, handling SNAPSHOT versions"""
-        try:
-            # Handle SNAPSHOT versions by treating them as pre-release
-            if version_str.endswith('-SNAPSHOT'):
-                base_version = version_str[:-9]  # Remove -SNAPSHOT
-                return (version.parse(base_version), 1)  # 1 = snapshot (higher than release)
-            else:
-                return (version.parse(version_str), 0)  # 0 = release
-        except:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _version_key(version_str: str) -> Union[int, Tuple[str, int]]:
+        """Create sortable version key, packing MAJOR.MINOR.PATCH.BUILD into 32 bits each
+        above a 16-bit qualifier rank
+        
+        SNAPSHOTs sort after pre-releases and before the release of the same version.
+        Versions that don't fit (a component past 32 bits, a fifth numeric component or a
+        numeric qualifier) take the (str, 0) string-comparison path, like unparseable ones.
+        Cached, since the same version strings recur across artifacts and calls.
+        """
+        match = _VERSION_RE.match(version_str)
+        if not match:
             # Fallback to string comparison
             return (version_str, 0)
+        
+        *numbers, qualifier = match.groups()
+        numbers = [int(number or 0) for number in numbers]
+        if max(numbers) > _VERSION_FIELD_MAX or (qualifier is not None and qualifier.isdigit()):
+            # Packing would overflow into the neighbouring field or drop a component
+            return (version_str, 0)
+        
+        rank = _RELEASE_RANK
+        if qualifier is not None and qualifier.lower() not in _RELEASE_QUALIFIERS:
+            qualifier_match = _QUALIFIER_RE.match(qualifier)
+            name_rank = _QUALIFIER_RANK.get(qualifier_match.group(1).lower(), 0) if qualifier_match else 0
+            # Unknown qualifiers sort before any pre-release, whatever their number
+            rank = (name_rank << 8) | min(int(qualifier_match.group(2) or 0), 0xFF) if name_rank else 0
+        
+        key = 0
+        for number in numbers:
+            key = (key << _VERSION_FIELD_BITS) | number
+        return (key << 16) | rank
     
     def _generate_recommendations(self, latest_versions: Dict[str, Artifact]) -> List[str]:
         """Generate recommendations based on version analysis"""
-        recommendations = []
-        
         local = latest_versions.get("local")
         github = latest_versions.get("github_packages")
         
-        if local and local.version.endswith("-SNAPSHOT"):
-            recommendations.append(f"🔧 Using local SNAPSHOT {local.version} - good for development")
-        
-        if github and local:
-            try:
-                github_ver = self._version_key(github.version)
-                local_ver = self._version_key(local.version)
-                
-                if github_ver > local_ver:
-                    recommendations.append(f"⬆️ GitHub has newer version: {github.version} > {local.version}")
-                elif local_ver > github_ver:
-                    recommendations.append(f"🚀 Local version is ahead: {local.version} > {github.version}")
-            except:
-                recommendations.append("🔍 Version comparison failed - manual check needed")
-        
-        if not local and github:
-            recommendations.append(f"📦 No local build - using GitHub Packages {github.version}")
-        
-        if not github and local:
-            recommendations.append("⚠️ No GitHub Packages found - only local available")
-        
-        return recommendations
+        # Dispatch once on which of the two sources have a version
+        present = frozenset(name for name, artifact in (("local", local), ("github_packages", github)) if artifact)
+        return _RECOMMENDATION_RULES[present](local, github)
 
 
 def main():
     """Main entry point for artifact analysis"""
-    import sys
-    
     if len(sys.argv) > 1:
         project_path = Path(sys.argv[1])
     else:
@@ -291,11 +487,10 @@ def main():
             local_artifacts = manager.scan_local_m2_versions(group_id, artifact_id)
             
             # Check GitHub versions for owned repos
-            github_artifacts = []
-            for repo in manager.owned_repos:
-                github_artifacts.extend(
-                    manager.check_github_packages_versions(repo, group_id, artifact_id)
-                )
+            github_versions = manager.check_github_packages_versions_bulk(
+                (repo, group_id, artifact_id) for repo in manager.owned_repos
+            )
+            github_artifacts = [artifact for artifacts in github_versions.values() for artifact in artifacts]
             
             # Compare versions
             all_artifacts = local_artifacts + github_artifacts
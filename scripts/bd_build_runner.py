@@ -4,17 +4,61 @@ Build Detective Build Runner - Local Build Testing and Validation
 Handles Maven builds, test execution, and result comparison to save expensive tokens
 """
 
+import os
+import shutil
 import subprocess
-import json
+import sys
 import time
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, TextIO, Tuple
+from dataclasses import dataclass
 import hashlib
 
+from bd_json import json_dumps, json_loads
 
-@dataclass
+
+# Maven reactor summaries are short; never scan more than this past the header
+_REACTOR_SUMMARY_WINDOW = 64 * 1024
+_REACTOR_HEADER_RE = re.compile(r"Reactor Summary for (.+?):[ \t]*\n")
+_REACTOR_STATUS_RE = re.compile(r"BUILD (SUCCESS|FAILURE)")
+_REACTOR_MODULE_RE = re.compile(
+    r"\[INFO\]\s+(.+?)\s+\.+\s+(SUCCESS|FAILURE|SKIPPED)\s+\[\s*([0-9.]+)\s*s\s*\]"
+)
+_TOTAL_TIME_RE = re.compile(r"Total time:\s+([0-9.]+)\s*s")
+
+# One-pass Maven stdout tokenizer; dispatch on match.lastgroup
+_MAVEN_TOKEN_RE = re.compile(
+    r"Building jar: (?P<jar>.+\.jar)"
+    r"|Tests run: (?P<tests_run>\d+), Failures: (?P<failures>\d+), "
+    r"Errors: (?P<errors>\d+), Skipped: (?P<skipped>\d+)(?:.*?in (?P<test_module>.+))?"
+    r"|Total time:\s+(?P<total_time>\d+\.?\d*)\s*s"
+)
+
+# Project files whose (path, size, mtime) decide whether a cached build is still valid;
+# everything outside these directories counts, so resources and build scripts do too
+_FINGERPRINT_SKIP_DIRS = {'target', '.git', 'node_modules', '.bd_cache'}
+
+# SNAPSHOT dependencies declared in a POM; their ~/.m2 jars also feed the fingerprint
+_SNAPSHOT_DEP_RE = re.compile(
+    r"<groupId>\s*([^<\s]+)\s*</groupId>\s*<artifactId>\s*([^<\s]+)\s*</artifactId>"
+    r"\s*<version>\s*([^<\s]+-SNAPSHOT)\s*</version>"
+)
+
+# Errors kept on a BuildResult; the rest are only counted
+MAX_REPORTED_ERRORS = 10
+
+# Maven's report of a failed main compile; it follows every javac error, so it is looked
+# for in the full output rather than in the truncated error list
+_COMPILE_FAILURE_RE = re.compile(r"Failed to execute goal [^\n]*\(default-compile\)")
+
+# Output lines that feed the build hash
+_BUILD_HASH_KEYS_RE = re.compile(
+    r"tests run:|building jar:|compilation error|build success|build failure", re.IGNORECASE
+)
+
+
+@dataclass(slots=True)
 class BuildResult:
     timestamp: str
     project_path: str
@@ -29,25 +73,49 @@ class BuildResult:
     build_hash: str
     errors: List[str]
     warnings: List[str]
+    # Distinct errors found; `errors` only keeps the first MAX_REPORTED_ERRORS of them
+    error_count: int = 0
+    # Whether the compile goal failed, decided from the full build output
+    compile_failed: bool = False
 
 
 class BuildRunner:
+    # Fingerprint-keyed build results, relative to scripts/tests/
+    BUILD_CACHE_DIR = ".bd_cache"
+    # Maven Daemon JVM options when mvnd is used, unless MVND_OPTS is already set
+    MVND_DEFAULT_OPTS = "-Xmx2g"
+    
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.results_cache = {}
+        # mvnd keeps a warm JVM between invocations; fall back to plain Maven without it
+        self.maven_executable = "mvnd" if shutil.which("mvnd") else "mvn"
         
     def run_maven_build(self, subproject: str = "", 
                        goals: List[str] = None, 
                        profiles: List[str] = None,
-                       skip_tests: bool = False) -> BuildResult:
-        """Run Maven build and capture comprehensive results"""
+                       skip_tests: bool = False,
+                       use_cache: bool = False,
+                       threads: Optional[str] = None,
+                       log: Optional[TextIO] = None) -> BuildResult:
+        """Run Maven build and capture comprehensive results
+        
+        With `use_cache`, successful builds are cached on disk by a fingerprint of the
+        project files, SNAPSHOT jars in ~/.m2 and the JDK; an identical command over an
+        unchanged fingerprint returns the cached result without Maven, as long as the
+        jars it reported still exist. Off by default: the fingerprint can't see everything
+        a build depends on.
+        `threads` enables Maven's parallel reactor (`-T`, e.g. "1C" = one per core).
+        Progress lines go to `log` (default stdout), so concurrent builds can keep theirs apart.
+        """
+        log = log or sys.stdout
         if goals is None:
             goals = ["clean", "package"]
         
         build_path = self.project_root / subproject if subproject else self.project_root
         
         # Build Maven command
-        cmd = ["mvn"] + goals
+        cmd = [self.maven_executable] + (["-T", threads] if threads else []) + goals
         
         if profiles:
             cmd.extend([f"-P{','.join(profiles)}"])
@@ -56,26 +124,46 @@ class BuildRunner:
             cmd.append("-DskipTests")
         
         cmd_str = " ".join(cmd)
-        print(f"🔨 Running: {cmd_str}")
-        print(f"📁 In: {build_path}")
+        
+        cache_file = None
+        if use_cache:
+            fingerprint = self._source_fingerprint(build_path)
+            cache_id = hashlib.blake2b(
+                f"{subproject}\0{cmd_str}\0{fingerprint}".encode(), digest_size=8
+            ).hexdigest()
+            cache_file = f"{self.BUILD_CACHE_DIR}/{cache_id}.json"
+            cached = self.load_results(cache_file)
+            if cached and self._artifacts_present(cached[0]):
+                print(f"♻️ Cached: {cmd_str} (sources unchanged)", file=log)
+                self.results_cache[f"{subproject}:{cmd_str}"] = cached[0]
+                return cached[0]
+        
+        print(f"🔨 Running: {cmd_str}", file=log)
+        print(f"📁 In: {build_path}", file=log)
         
         start_time = time.time()
         
+        env = None
+        if self.maven_executable == "mvnd":
+            env = {**os.environ, "MVND_OPTS": os.environ.get("MVND_OPTS", self.MVND_DEFAULT_OPTS)}
+        
         try:
             result = subprocess.run(
                 cmd,
                 cwd=build_path,
                 capture_output=True,
                 text=True,
+                env=env,
                 timeout=600  # 10 minute timeout
             )
             
             duration = time.time() - start_time
             
             # Parse output for key information
-            test_results = self._parse_test_results(result.stdout, result.stderr)
-            artifact_info = self._parse_artifact_info(result.stdout, build_path)
-            errors = self._extract_errors(result.stderr, result.stdout)
+            tokens = self._scan_maven_output(result.stdout)
+            test_results = self._parse_test_results(result.stdout, result.stderr, tokens)
+            artifact_info = self._parse_artifact_info(result.stdout, build_path, tokens)
+            errors, error_count = self._extract_errors(result.stderr, result.stdout)
             warnings = self._extract_warnings(result.stderr, result.stdout)
             
             # Generate build hash for comparison
@@ -94,12 +182,16 @@ class BuildRunner:
                 artifact_info=artifact_info,
                 build_hash=build_hash,
                 errors=errors,
-                warnings=warnings
+                warnings=warnings,
+                error_count=error_count,
+                compile_failed=any(_COMPILE_FAILURE_RE.search(output) for output in (result.stderr, result.stdout))
             )
             
             # Cache result
             cache_key = f"{subproject}:{cmd_str}"
             self.results_cache[cache_key] = build_result
+            if cache_file and build_result.success:
+                self.save_results([build_result], cache_file, log)
             
             return build_result
             
@@ -117,11 +209,97 @@ class BuildRunner:
                 artifact_info={},
                 build_hash="timeout",
                 errors=["Build timeout after 10 minutes"],
-                warnings=[]
+                warnings=[],
+                error_count=1
             )
     
-    def _parse_test_results(self, stdout: str, stderr: str) -> Dict[str, Any]:
+    @staticmethod
+    def _artifacts_present(build_result: BuildResult) -> bool:
+        """Whether every jar a cached build reported is still on disk"""
+        jars = build_result.artifact_info.get("jars_created", [])
+        return all(os.path.exists(jar["path"]) for jar in jars)
+    
+    def _source_fingerprint(self, build_path: Path) -> str:
+        """Fingerprint build inputs by (path, size, mtime) without reading them
+        
+        Covers the project tree, the ~/.m2 jars of SNAPSHOT dependencies its POMs
+        declare, and the JDK and Maven in use.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        root = str(build_path)
+        pending = [root]
+        poms = []
+        
+        digest.update(f"{os.environ.get('JAVA_HOME', '')}\0{shutil.which('java')}\0"
+                      f"{shutil.which(self.maven_executable)}\n".encode())
+        
+        while pending:
+            try:
+                entries = sorted(os.scandir(pending.pop()), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _FINGERPRINT_SKIP_DIRS:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat()
+                    rel_path = os.path.relpath(entry.path, root)
+                    digest.update(f"{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+                    if entry.name == "pom.xml":
+                        poms.append(entry.path)
+        
+        m2_repository = Path.home() / ".m2" / "repository"
+        snapshots = set()
+        for pom in poms:
+            try:
+                with open(pom, encoding="utf-8", errors="replace") as f:
+                    snapshots.update(_SNAPSHOT_DEP_RE.findall(f.read()))
+            except OSError:
+                continue
+        for group_id, artifact_id, version in sorted(snapshots):
+            version_dir = m2_repository.joinpath(*group_id.split("."), artifact_id, version)
+            try:
+                with os.scandir(version_dir) as entries:
+                    jars = sorted(entry.name for entry in entries if entry.name.endswith(".jar"))
+            except OSError:
+                jars = []
+            for jar in jars:
+                st = os.stat(version_dir / jar)
+                digest.update(f"{version_dir / jar}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+        
+        return digest.hexdigest()
+    
+    def _scan_maven_output(self, stdout: str) -> Dict[str, Any]:
+        """Classify jar, Surefire and total-time lines of Maven output in a single pass"""
+        tokens = {
+            "jars": [],
+            "test_counts": [],
+            "total_time": None
+        }
+        
+        for match in _MAVEN_TOKEN_RE.finditer(stdout):
+            if match.group("jar") is not None:
+                tokens["jars"].append(match.group("jar"))
+            elif match.group("tests_run") is not None:
+                tokens["test_counts"].append((
+                    int(match.group("tests_run")),
+                    int(match.group("failures")),
+                    int(match.group("errors")),
+                    int(match.group("skipped")),
+                    match.group("test_module")
+                ))
+            elif tokens["total_time"] is None:
+                tokens["total_time"] = float(match.group("total_time"))
+        
+        return tokens
+    
+    def _parse_test_results(self, stdout: str, stderr: str,
+                            tokens: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Extract test results from Maven output with multi-module support"""
+        if tokens is None:
+            tokens = self._scan_maven_output(stdout)
+        
         test_info = {
             "tests_run": 0,
             "failures": 0,
@@ -134,33 +312,27 @@ class BuildRunner:
             "reactor_summary": {}
         }
         
-        # Look for Surefire test results (aggregate across all modules)
-        surefire_pattern = r"Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+)"
-        matches = re.findall(surefire_pattern, stdout)
-        
-        for match in matches:
-            test_info["tests_run"] += int(match[0])
-            test_info["failures"] += int(match[1])
-            test_info["errors"] += int(match[2])
-            test_info["skipped"] += int(match[3])
-        
-        # Parse per-module test results
-        module_test_pattern = r"Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+).*?in (.+)"
-        module_matches = re.findall(module_test_pattern, stdout)
-        
-        for match in module_matches:
-            module_name = match[4].strip()
-            test_info["module_results"][module_name] = {
-                "tests_run": int(match[0]),
-                "failures": int(match[1]),
-                "errors": int(match[2]), 
-                "skipped": int(match[3])
-            }
+        # Aggregate Surefire test results across all modules
+        for tests_run, failures, errors, skipped, module_name in tokens["test_counts"]:
+            test_info["tests_run"] += tests_run
+            test_info["failures"] += failures
+            test_info["errors"] += errors
+            test_info["skipped"] += skipped
+            
+            # Per-module test results
+            if module_name is not None:
+                test_info["module_results"][module_name.strip()] = {
+                    "tests_run": tests_run,
+                    "failures": failures,
+                    "errors": errors, 
+                    "skipped": skipped
+                }
         
         # Extract failed test names with module context
         failed_test_pattern = r"FAILURE.*?(\w+\.\w+\.\w+)\(\)"
-        failed_tests = re.findall(failed_test_pattern, stdout + stderr)
-        test_info["failed_tests"] = list(set(failed_tests))
+        failed_tests = set(re.findall(failed_test_pattern, stdout))
+        failed_tests.update(re.findall(failed_test_pattern, stderr))
+        test_info["failed_tests"] = list(failed_tests)
         
         # Parse multi-module reactor summary
         test_info["reactor_summary"] = self._parse_reactor_summary(stdout)
@@ -168,11 +340,8 @@ class BuildRunner:
         # Extract test duration (prefer reactor total time)
         if test_info["reactor_summary"].get("total_build_time"):
             test_info["duration_seconds"] = test_info["reactor_summary"]["total_build_time"]
-        else:
-            time_pattern = r"Total time:\s+(\d+\.?\d*)\s*s"
-            time_match = re.search(time_pattern, stdout)
-            if time_match:
-                test_info["duration_seconds"] = float(time_match.group(1))
+        elif tokens["total_time"] is not None:
+            test_info["duration_seconds"] = tokens["total_time"]
         
         return test_info
     
@@ -188,80 +357,96 @@ class BuildRunner:
             "build_status": "UNKNOWN"
         }
         
-        # Parse reactor summary section
-        summary_pattern = r"Reactor Summary for (.+?):\s*\n([\s\S]*?)BUILD (SUCCESS|FAILURE)"
-        summary_match = re.search(summary_pattern, stdout)
-        
-        if summary_match:
-            project_name = summary_match.group(1)
-            summary_content = summary_match.group(2)
-            reactor_info["build_status"] = summary_match.group(3)
+        # Locate the reactor summary directly instead of regex-scanning the whole log
+        summary_idx = stdout.rfind("Reactor Summary for ")
+        if summary_idx >= 0:
+            tail = stdout[summary_idx:summary_idx + _REACTOR_SUMMARY_WINDOW]
+            header_match = _REACTOR_HEADER_RE.match(tail)
+            status_match = _REACTOR_STATUS_RE.search(tail, header_match.end()) if header_match else None
             
-            # Parse individual module results
-            module_pattern = r"\[INFO\]\s+(.+?)\s+\.+\s+(SUCCESS|FAILURE|SKIPPED)\s+\[\s*([0-9.]+)\s*s\s*\]"
-            modules = re.findall(module_pattern, summary_content)
-            
-            for module_name, status, duration in modules:
-                module_info = {
-                    "name": module_name.strip(),
-                    "status": status,
-                    "duration_seconds": float(duration)
-                }
-                reactor_info["module_results"].append(module_info)
-                reactor_info["total_modules"] += 1
+            if status_match:
+                reactor_info["build_status"] = status_match.group(1)
                 
-                if status == "SUCCESS":
-                    reactor_info["successful_modules"] += 1
-                elif status == "FAILURE":
-                    reactor_info["failed_modules"] += 1
-                elif status == "SKIPPED":
-                    reactor_info["skipped_modules"] += 1
-        
-        # Parse total time
-        total_time_pattern = r"Total time:\s+([0-9.]+)\s*s"
-        time_match = re.search(total_time_pattern, stdout)
+                # Parse individual module results
+                modules = _REACTOR_MODULE_RE.finditer(tail, header_match.end(), status_match.start())
+                
+                for module_match in modules:
+                    module_name, status, duration = module_match.groups()
+                    module_info = {
+                        "name": module_name.strip(),
+                        "status": status,
+                        "duration_seconds": float(duration)
+                    }
+                    reactor_info["module_results"].append(module_info)
+                    reactor_info["total_modules"] += 1
+                    
+                    if status == "SUCCESS":
+                        reactor_info["successful_modules"] += 1
+                    elif status == "FAILURE":
+                        reactor_info["failed_modules"] += 1
+                    elif status == "SKIPPED":
+                        reactor_info["skipped_modules"] += 1
+        
+        # Parse total time (it follows the summary when there is one)
+        time_match = _TOTAL_TIME_RE.search(stdout, max(summary_idx, 0))
         if time_match:
             reactor_info["total_build_time"] = float(time_match.group(1))
         
         return reactor_info
     
-    def _parse_artifact_info(self, stdout: str, build_path: Path) -> Dict[str, Any]:
+    def _parse_artifact_info(self, stdout: str, build_path: Path,
+                             tokens: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Extract information about generated artifacts"""
+        if tokens is None:
+            tokens = self._scan_maven_output(stdout)
+        
         artifact_info = {
             "jars_created": [],
             "target_size_mb": 0,
             "main_artifact": None
         }
         
-        # Look for JAR creation messages
-        jar_pattern = r"Building jar: (.+\.jar)"
-        jar_matches = re.findall(jar_pattern, stdout)
+        # JAR creation messages
+        jar_matches = tokens["jars"]
         
-        for jar_path in jar_matches:
+        # Main artifact is usually the largest JAR; track it while collecting
+        main_artifact = None
+        main_size_mb = -1.0
+        
+        # Maven may report the same jar more than once; stat each path only once
+        for jar_path in dict.fromkeys(jar_matches):
+            try:
+                size_mb = round(os.stat(jar_path).st_size / (1024 * 1024), 2)
+            except FileNotFoundError:
+                continue
             jar_file = Path(jar_path)
-            if jar_file.exists():
-                size_mb = jar_file.stat().st_size / (1024 * 1024)
-                artifact_info["jars_created"].append({
-                    "path": str(jar_file),
-                    "size_mb": round(size_mb, 2),
-                    "name": jar_file.name
-                })
+            artifact_info["jars_created"].append({
+                "path": str(jar_file),
+                "size_mb": size_mb,
+                "name": jar_file.name
+            })
+            if size_mb > main_size_mb:
+                main_size_mb = size_mb
+                main_artifact = jar_file.name
         
         # Calculate total target directory size
         target_dir = build_path / "target"
         if target_dir.exists():
-            total_size = sum(f.stat().st_size for f in target_dir.rglob('*') if f.is_file())
+            total_size = 0
+            for dirpath, _, filenames in os.walk(target_dir):
+                for filename in filenames:
+                    try:
+                        total_size += os.stat(os.path.join(dirpath, filename)).st_size
+                    except FileNotFoundError:
+                        continue
             artifact_info["target_size_mb"] = round(total_size / (1024 * 1024), 2)
         
-        # Identify main artifact (usually the largest JAR)
-        if artifact_info["jars_created"]:
-            main_jar = max(artifact_info["jars_created"], key=lambda x: x["size_mb"])
-            artifact_info["main_artifact"] = main_jar["name"]
+        artifact_info["main_artifact"] = main_artifact
         
         return artifact_info
     
-    def _extract_errors(self, stderr: str, stdout: str) -> List[str]:
-        """Extract error messages from build output"""
+    def _extract_errors(self, stderr: str, stdout: str) -> Tuple[List[str], int]:
+        """Extract the first error messages from build output, plus how many distinct ones there are"""
         errors = []
         
         # Common Maven error patterns
@@ -273,20 +458,19 @@ class BuildRunner:
             r".*Exception.*?:\s*(.+)"
         ]
         
-        combined_output = stderr + "\n" + stdout
-        
+        # Scan each stream separately (stderr first) rather than concatenating them
         for pattern in error_patterns:
-            matches = re.findall(pattern, combined_output, re.MULTILINE)
-            errors.extend(matches)
+            for output in (stderr, stdout):
+                errors.extend(re.findall(pattern, output, re.MULTILINE))
         
-        # Clean and deduplicate
-        cleaned_errors = []
+        # Clean and deduplicate (dict keeps first-seen order with O(1) membership)
+        cleaned_errors = {}
         for error in errors:
             clean_error = error.strip()
-            if clean_error and clean_error not in cleaned_errors and len(clean_error) > 10:
-                cleaned_errors.append(clean_error)
+            if len(clean_error) > 10:
+                cleaned_errors[clean_error] = None
         
-        return cleaned_errors[:10]  # Limit to top 10 errors
+        return list(cleaned_errors)[:MAX_REPORTED_ERRORS], len(cleaned_errors)
     
     def _extract_warnings(self, stderr: str, stdout: str) -> List[str]:
         """Extract warning messages from build output"""
@@ -298,11 +482,10 @@ class BuildRunner:
             r"deprecated.*?:\s*(.+)"
         ]
         
-        combined_output = stderr + "\n" + stdout
-        
+        # Scan each stream separately (stderr first) rather than concatenating them
         for pattern in warning_patterns:
-            matches = re.findall(pattern, combined_output, re.MULTILINE | re.IGNORECASE)
-            warnings.extend(matches)
+            for output in (stderr, stdout):
+                warnings.extend(re.findall(pattern, output, re.MULTILINE | re.IGNORECASE))
         
         # Clean and deduplicate
         cleaned_warnings = []
@@ -316,22 +499,21 @@ class BuildRunner:
     def _generate_build_hash(self, stdout: str, stderr: str) -> str:
         """Generate hash of key build output for comparison"""
         # Focus on key indicators that would change between builds
-        key_content = []
+        digest = hashlib.blake2b(digest_size=6)
         
         # Extract test results, compilation info, artifact creation
         for line in stdout.split('\n'):
-            if any(keyword in line.lower() for keyword in 
-                   ['tests run:', 'building jar:', 'compilation error', 'build success', 'build failure']):
-                key_content.append(line.strip())
+            if _BUILD_HASH_KEYS_RE.search(line):
+                digest.update(line.strip().encode() + b"\n")
         
-        content_str = '\n'.join(key_content)
-        return hashlib.md5(content_str.encode()).hexdigest()[:12]
+        return digest.hexdigest()
     
     def compare_build_results(self, before: BuildResult, after: BuildResult) -> Dict[str, Any]:
         """Compare two build results and highlight differences"""
         comparison = {
             "timestamp_comparison": f"{before.timestamp} → {after.timestamp}",
             "success_change": before.success != after.success,
+            "after_success": after.success,
             "duration_change_seconds": round(after.duration_seconds - before.duration_seconds, 2),
             "test_changes": {},
             "artifact_changes": {},
@@ -358,15 +540,17 @@ class BuildRunner:
                 "before": before_artifacts,
                 "after": after_artifacts,
                 "size_changes": {name: after_artifacts.get(name, 0) - before_artifacts.get(name, 0) 
-                                for name in set(before_artifacts.keys()) | set(after_artifacts.keys())}
+                                for name in before_artifacts.keys() | after_artifacts.keys()}
             }
         
-        # Error changes
+        # Error changes (set lookups keep the diff linear, lists keep output order)
+        before_error_set = set(before.errors)
+        after_error_set = set(after.errors)
         comparison["error_changes"] = {
-            "before_errors": len(before.errors),
-            "after_errors": len(after.errors),
-            "new_errors": [e for e in after.errors if e not in before.errors],
-            "resolved_errors": [e for e in before.errors if e not in after.errors]
+            "before_errors": before.error_count,
+            "after_errors": after.error_count,
+            "new_errors": [e for e in after.errors if e not in before_error_set],
+            "resolved_errors": [e for e in before.errors if e not in after_error_set]
         }
         
         # Generate summary
@@ -397,17 +581,15 @@ class BuildRunner:
         
         return comparison
     
-    def save_results(self, results: List[BuildResult], filename: str = "build_results.json"):
+    def save_results(self, results: List[BuildResult], filename: str = "build_results.json",
+                     log: Optional[TextIO] = None):
         """Save build results to file for later analysis"""
-        results_data = [asdict(result) for result in results]
-        
         output_file = self.project_root / "scripts" / "tests" / filename
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_file, 'w') as f:
-            json.dump(results_data, f, indent=2)
+        output_file.write_bytes(json_dumps(results, indent=True))
         
-        print(f"💾 Build results saved to {output_file}")
+        print(f"💾 Build results saved to {output_file}", file=log or sys.stdout)
     
     def load_results(self, filename: str = "build_results.json") -> List[BuildResult]:
         """Load previously saved build results"""
@@ -416,19 +598,21 @@ class BuildRunner:
         if not results_file.exists():
             return []
         
-        with open(results_file, 'r') as f:
-            data = json.load(f)
+        data = json_loads(results_file.read_bytes())
         
-        return [BuildResult(**item) for item in data]
+        # Results saved before error_count existed held every error they counted
+        return [BuildResult(**{"error_count": len(item["errors"]), **item}) for item in data]
 
 
 def main():
     """Test build runner functionality"""
-    import sys
+    # --use-cache reuses a stored result when the build fingerprint is unchanged
+    use_cache = "--use-cache" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--use-cache"]
     
     project_root = Path.cwd()
-    if len(sys.argv) > 1:
-        project_root = Path(sys.argv[1])
+    if len(args) > 0:
+        project_root = Path(args[0])
     
     runner = BuildRunner(project_root)
     
@@ -437,13 +621,14 @@ def main():
     
     # Test VideoRenderer subproject
     print("\n🎥 Testing VideoRenderer build...")
-    vr_result = runner.run_maven_build("VideoRenderer", ["clean", "compile"], skip_tests=True)
+    vr_result = runner.run_maven_build("VideoRenderer", ["clean", "compile"], skip_tests=True,
+                                       use_cache=use_cache)
     
     print(f"✅ Success: {vr_result.success}")
     print(f"⏱️ Duration: {vr_result.duration_seconds}s")
     print(f"🧪 Tests: {vr_result.test_results}")
     print(f"📦 Artifacts: {len(vr_result.artifact_info.get('jars_created', []))} JARs")
-    print(f"🚨 Errors: {len(vr_result.errors)}")
+    print(f"🚨 Errors: {vr_result.error_count}")
     print(f"⚠️ Warnings: {len(vr_result.warnings)}")
     
     if vr_result.errors:
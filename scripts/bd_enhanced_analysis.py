@@ -7,36 +7,61 @@ import json
 import subprocess
 import sys
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from bd_json import json_loads
 
 def run_gh_command(cmd: List[str]) -> Dict:
     """Run GitHub CLI command and return parsed JSON"""
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return json.loads(result.stdout)
+        return json_loads(result.stdout)
     except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
         print(f"❌ GitHub CLI error: {e}")
         return {}
 
-def calculate_runtime_minutes(started_at: str) -> float:
+# Only IN_PROGRESS and FAILURE checks are analyzed, so let gh drop the rest
+_CHECKS_JQ_FILTER = (
+    '[.[] | select(.state == "IN_PROGRESS" or .state == "FAILURE") '
+    '| {name, state, startedAt}]'
+)
+
+# Filtered check lists per (repo, pr_number), reused across analyses
+_checks_cache: Dict[tuple, List[Dict]] = {}
+
+def get_pr_checks(repo: str, pr_number: str) -> Optional[List[Dict]]:
+    """Get IN_PROGRESS and FAILURE checks for a PR, filtered server-side by gh"""
+    key = (repo, pr_number)
+    if key not in _checks_cache:
+        checks = run_gh_command([
+            'gh', 'pr', 'checks', pr_number, '--repo', repo,
+            '--json', 'name,state,startedAt', '--jq', _CHECKS_JQ_FILTER
+        ])
+        if not isinstance(checks, list):
+            return None
+        _checks_cache[key] = checks
+    return _checks_cache[key]
+
+def calculate_runtime_minutes(started_at: str, now: Optional[datetime] = None) -> float:
     """Calculate how long a job has been running in minutes"""
-    if started_at == "0001-01-01T00:00:00Z":
+    if started_at.startswith("0001"):
         return 0.0
     
-    start_time = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-    now = datetime.now(timezone.utc)
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11
+    if started_at.endswith('Z'):
+        started_at = started_at[:-1] + '+00:00'
+    start_time = datetime.fromisoformat(started_at)
+    if now is None:
+        now = datetime.now(timezone.utc)
     return (now - start_time).total_seconds() / 60
 
 def analyze_pr_with_time_detection(repo: str, pr_number: str) -> Dict:
     """Enhanced PR analysis with IN_PROGRESS and time-based detection"""
     
-    # Get detailed check status with timing
-    checks = run_gh_command([
-        'gh', 'pr', 'checks', pr_number, '--repo', repo,
-        '--json', 'name,state,completedAt,startedAt,description,link'
-    ])
+    # Get relevant check status with timing
+    checks = get_pr_checks(repo, pr_number)
     
-    if not checks:
+    if checks is None:
         return {"error": "Failed to get PR checks"}
     
     analysis = {
@@ -47,15 +72,16 @@ def analyze_pr_with_time_detection(repo: str, pr_number: str) -> Dict:
         "takeover_recommended": False
     }
     
+    now = datetime.now(timezone.utc)
     for check in checks:
         name = check.get('name', 'Unknown')
         state = check.get('state', 'Unknown')
         started_at = check.get('startedAt', '0001-01-01T00:00:00Z')
-        completed_at = check.get('completedAt', '0001-01-01T00:00:00Z')
+        is_docker = 'docker' in name.lower()
         
         # Calculate runtime
         if state == 'IN_PROGRESS':
-            runtime_mins = calculate_runtime_minutes(started_at)
+            runtime_mins = calculate_runtime_minutes(started_at, now)
             analysis['time_analysis'][name] = {
                 'state': state,
                 'runtime_minutes': runtime_mins,
@@ -63,7 +89,7 @@ def analyze_pr_with_time_detection(repo: str, pr_number: str) -> Dict:
             }
             
             # CRITICAL: Docker jobs running >5 minutes are suspicious
-            if 'docker' in name.lower() and runtime_mins > 5:
+            if is_docker and runtime_mins > 5:
                 analysis['critical_issues'].append({
                     'job': name,
                     'issue': f'Docker build running {runtime_mins:.1f} minutes - likely Alpine build waste',
@@ -83,7 +109,7 @@ def analyze_pr_with_time_detection(repo: str, pr_number: str) -> Dict:
         
         # Pattern detection for failed jobs
         elif state == 'FAILURE':
-            if 'docker' in name.lower():
+            if is_docker:
                 analysis['suspicious_patterns'].append({
                     'job': name,
                     'issue': 'Docker build failure - check for Alpine compilation issues',
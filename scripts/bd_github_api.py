@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Build Detective GitHub REST Client
+Shared persistent connection for BD scripts, avoiding a gh fork + re-auth per call
+"""
+import os
+from typing import Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # Optional dependency, callers fall back to the gh CLI
+
+GITHUB_API_URL = "https://api.github.com"
+NO_TIMESTAMP = "0001-01-01T00:00:00Z"  # What gh reports for checks that never started
+
+_client = None
+
+def get_client():
+    """Return the shared GitHub REST client, or None when httpx or a token is unavailable"""
+    global _client
+    if _client is None and httpx is not None:
+        token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        if not token:
+            return None
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+        }
+        try:
+            _client = httpx.Client(base_url=GITHUB_API_URL, headers=headers, http2=True, timeout=30)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package; keep-alive HTTP/1.1 still saves the forks
+            _client = httpx.Client(base_url=GITHUB_API_URL, headers=headers, timeout=30)
+    return _client
+
+def _get_json(path: str, **params):
+    response = get_client().get(path, params=params)
+    response.raise_for_status()
+    return response.json()
+
+def _get_paginated(path: str, key: str, **params) -> List[Dict]:
+    """Collect `key` from every page of a list endpoint, following the Link header"""
+    response = get_client().get(path, params={"per_page": 100, **params})
+    response.raise_for_status()
+    items = response.json()[key]
+    while next_url := response.links.get("next", {}).get("url"):
+        response = get_client().get(next_url)
+        response.raise_for_status()
+        items.extend(response.json()[key])
+    return items
+
+def _check_state(check_run: Dict) -> str:
+    """Map a REST check run onto the state values `gh pr checks --json state` reports"""
+    if check_run.get("status") != "completed":
+        return (check_run.get("status") or "").upper()
+    return (check_run.get("conclusion") or "").upper()
+
+def get_pr_checks(repo: str, pr_number: str) -> Optional[List[Dict]]:
+    """Get PR check runs shaped like `gh pr checks --json name,state,startedAt,completedAt,link`"""
+    if get_client() is None:
+        return None
+
+    try:
+        head_sha = _get_json(f"/repos/{repo}/pulls/{pr_number}")["head"]["sha"]
+        check_runs = _get_paginated(f"/repos/{repo}/commits/{head_sha}/check-runs", "check_runs")
+    except (httpx.HTTPError, KeyError) as e:
+        print(f"❌ GitHub API error: {e}")
+        return None
+
+    return [{
+        "name": run.get("name", ""),
+        "state": _check_state(run),
+        "startedAt": run.get("started_at") or NO_TIMESTAMP,
+        "completedAt": run.get("completed_at") or NO_TIMESTAMP,
+        "link": run.get("html_url", "")
+    } for run in check_runs]
+
+def get_workflow_runs(repo: str, limit: int = 50) -> Optional[List[Dict]]:
+    """Get recent workflow runs shaped like `gh run list --json` output"""
+    if get_client() is None:
+        return None
+
+    try:
+        runs = _get_json(f"/repos/{repo}/actions/runs", per_page=min(limit, 100))["workflow_runs"]
+    except (httpx.HTTPError, KeyError) as e:
+        print(f"❌ GitHub API error: {e}")
+        return None
+
+    return [{
+        "status": run.get("status"),
+        "conclusion": run.get("conclusion"),
+        "workflowName": run.get("name", ""),
+        "number": run.get("run_number"),
+        "createdAt": run.get("created_at"),
+        "headBranch": run.get("head_branch"),
+        "event": run.get("event"),
+        "nodeId": run.get("node_id")  # Not in gh output; lets jobs be batched over GraphQL
+    } for run in runs]
+
+# GraphQL has no workflowRuns connection, but looks runs up by node id in bulk
+_RUN_JOBS_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on WorkflowRun {
+      id
+      checkSuite {
+        checkRuns(first: 100) { nodes { name status conclusion } }
+      }
+    }
+  }
+}
+"""
+
+def get_workflow_run_jobs(node_ids: List[str]) -> Optional[Dict[str, List[Dict]]]:
+    """Get the jobs of several workflow runs in one GraphQL request, keyed by run node id"""
+    if get_client() is None or not node_ids:
+        return None
+
+    try:
+        response = get_client().post("/graphql", json={"query": _RUN_JOBS_QUERY,
+                                                        "variables": {"ids": node_ids}})
+        response.raise_for_status()
+        nodes = response.json()["data"]["nodes"]
+    except (httpx.HTTPError, KeyError, TypeError) as e:
+        print(f"❌ GitHub API error: {e}")
+        return None
+
+    # Lower-case the GraphQL enums to match `gh run view --json jobs`
+    return {node["id"]: [{
+        "name": job["name"],
+        "status": (job.get("status") or "").lower(),
+        "conclusion": (job.get("conclusion") or "").lower()
+    } for job in node["checkSuite"]["checkRuns"]["nodes"]] for node in nodes if node}
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build Detective JSON Helpers
+One place for the optional orjson speedup shared by the BD scripts
+"""
+import dataclasses
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional dependency, falls back to stdlib json
+
+# Parses gh's str or bytes output as-is; orjson.JSONDecodeError subclasses json.JSONDecodeError
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _stdlib_default(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    """Serialize dataclasses as dicts like orjson does, deferring anything else to `default`"""
+    def serialize(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return dataclasses.asdict(value)
+        if default is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+        return default(value)
+    return serialize
+
+
+def json_dumps(data: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize to UTF-8 JSON bytes, compact or with 2-space indentation
+    
+    Dataclasses serialize as dicts either way; `default` handles any other unsupported type.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2, default=_stdlib_default(default)).encode()
+    return json.dumps(data, separators=(",", ":"), default=_stdlib_default(default)).encode()
@@ -4,15 +4,19 @@ Build Detective Local CI Verification
 Minimal implementation to validate changes before pushing
 """
 
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
 def run_command(cmd, description, cwd=None):
     """Run command and return success status"""
     print(f"🔍 BD: {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=cwd)
+        # Only stderr is reported on failure, so don't buffer (possibly huge) stdout
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, cwd=cwd, check=False)
         if result.returncode == 0:
             print(f"✅ {description} - PASSED")
             return True
@@ -24,6 +28,40 @@ def run_command(cmd, description, cwd=None):
         print(f"❌ {description} - ERROR: {e}")
         return False
 
+def run_steps(tests, cwd=None):
+    """Run steps concurrently as their dependencies pass, stopping at first failure"""
+    passed = set()
+    pending = list(tests)
+    running = {}
+    failed = False
+    
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        while running or (pending and not failed):
+            if not failed:
+                ready = [step for step in pending if all(dep in passed for dep in step[2])]
+                for step in ready:
+                    pending.remove(step)
+                    cmd, description, _ = step
+                    running[executor.submit(run_command, cmd, description, cwd)] = description
+            
+            if not running:
+                break  # Remaining steps depend on something that never ran
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                description = running.pop(future)
+                if future.cancelled():
+                    continue
+                if future.result():
+                    passed.add(description)
+                elif not failed:
+                    failed = True
+                    print(f"\n💥 BD: Stopping at first failure to prevent unnecessary processing")
+                    for other in running:
+                        other.cancel()
+    
+    return len(passed)
+
 def bd_local_ci_verify(include_docker=False):
     """Run minimal local CI verification"""
     project_root = Path(__file__).parent.parent
@@ -31,40 +69,37 @@ def bd_local_ci_verify(include_docker=False):
     print("🔧 Build Detective: Local CI Verification")
     print("=" * 50)
     
-    # Fast tests (always run)
+    # Fast tests (always run) - (argv, description, depends_on)
     tests = [
         # Test 1: UV sync and pytest availability
-        ("uv sync && uv run python -c 'import pytest; print(\"pytest OK\")'", 
-         "UV dependencies and pytest"),
+        (["uv", "sync"], 
+         "UV dependencies", ()),
+         
+        (["uv", "run", "python", "-c", 'import pytest; print("pytest OK")'], 
+         "pytest availability", ("UV dependencies",)),
          
         # Test 2: Core music video workflow CI test (fast)
-        ("uv run python -m pytest tests/ci/test_music_video_workflow_ci.py -v --tb=short", 
-         "Music video workflow CI"),
+        (["uv", "run", "python", "-m", "pytest", "tests/ci/test_music_video_workflow_ci.py", "-v", "--tb=short"], 
+         "Music video workflow CI", ("pytest availability",)),
     ]
     
     # Docker tests (optional, slower) - Enhanced with CI-specific validation
+    # Both image builds are independent and run alongside the fast tests
     if include_docker:
         tests.extend([
-            ("docker build -t ffmpeg-mcp:local-test . --quiet", 
-             "Main Docker build"),
+            (["docker", "build", "-t", "ffmpeg-mcp:local-test", ".", "--quiet"], 
+             "Main Docker build", ()),
              
-            ("docker build -f Dockerfile.ci -t ffmpeg-mcp:local-ci-test . --quiet", 
-             "CI Docker build"),
+            (["docker", "build", "-f", "Dockerfile.ci", "-t", "ffmpeg-mcp:local-ci-test", ".", "--quiet"], 
+             "CI Docker build", ()),
              
             # NEW: Test the CI Docker container actually runs the tests
-            ("docker run --rm ffmpeg-mcp:local-ci-test", 
-             "CI Docker test execution"),
+            (["docker", "run", "--rm", "ffmpeg-mcp:local-ci-test"], 
+             "CI Docker test execution", ("CI Docker build",)),
         ])
     
-    passed = 0
     total = len(tests)
-    
-    for cmd, description in tests:
-        if run_command(cmd, description, cwd=project_root):
-            passed += 1
-        else:
-            print(f"\n💥 BD: Stopping at first failure to prevent unnecessary processing")
-            break
+    passed = run_steps(tests, cwd=project_root)
     
     print(f"\n📊 BD Results: {passed}/{total} tests passed")
     
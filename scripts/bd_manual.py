@@ -4,11 +4,49 @@ Manual Build Detective - YOLO-FFMPEG-MCP CI Analysis
 Provides Build Detective functionality without relying on Claude Code agent system
 """
 
+import atexit
 import subprocess
 import json
 import sys
 import re
-from typing import Dict, List, Any
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from bd_json import json_loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # Optional dependency, falls back to json_loads + dict walking
+
+if msgspec is not None:
+    class Check(msgspec.Struct):
+        """One statusCheckRollup entry; unknown fields are skipped while decoding"""
+        name: str = ""
+        conclusion: Optional[str] = None
+        detailsUrl: Optional[str] = None
+        workflowName: Optional[str] = None
+
+    class PullRequestChecks(msgspec.Struct):
+        statusCheckRollup: List[Check] = []
+
+    _PR_DECODER = msgspec.json.Decoder(PullRequestChecks)
+    _DECODE_ERRORS = (ValueError, msgspec.DecodeError)
+else:
+    class Check(NamedTuple):
+        """One statusCheckRollup entry"""
+        name: str = ""
+        conclusion: Optional[str] = None
+        detailsUrl: Optional[str] = None
+        workflowName: Optional[str] = None
+
+    _DECODE_ERRORS = (ValueError,)
 
 def run_gh_command(cmd: List[str]) -> str:
     """Run GitHub CLI command and return output"""
@@ -19,6 +57,37 @@ def run_gh_command(cmd: List[str]) -> str:
         print(f"GitHub CLI error: {e}")
         return ""
 
+def run_gh_stream(cmd: List[str]) -> Iterator[bytes]:
+    """Run GitHub CLI command and yield its raw output line by line, without decoding"""
+    proc = subprocess.Popen(['gh'] + cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        yield from proc.stdout
+    finally:
+        if proc.poll() is None:
+            proc.kill()  # Consumer stopped reading early
+        proc.stdout.close()
+        if proc.wait() > 0:
+            print(f"GitHub CLI error: gh {' '.join(cmd)} exited with status {proc.returncode}")
+
+def parse_status_checks(pr_data: str) -> List[Check]:
+    """Decode `gh pr view --json statusCheckRollup` output into Check records"""
+    if msgspec is not None:
+        return _PR_DECODER.decode(pr_data).statusCheckRollup
+    
+    rollup = json_loads(pr_data).get('statusCheckRollup') or []
+    return [Check(*(check.get(field) for field in Check._fields)) for check in rollup]
+
+def parse_details_url(details_url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (run_id, job_id) from a '.../actions/runs/<run_id>/job/<job_id>' check URL"""
+    parts = urlparse(details_url).path.split('/')
+    try:
+        runs_index = parts.index('runs')
+    except ValueError:
+        return None, None
+    run_id = parts[runs_index + 1] if len(parts) > runs_index + 1 else None
+    job_id = parts[runs_index + 3] if len(parts) > runs_index + 3 and parts[runs_index + 2] == 'job' else None
+    return run_id or None, job_id or None
+
 def analyze_pr_failures(repo: str, pr_number: str) -> Dict[str, Any]:
     """Analyze PR failures and return structured analysis"""
     
@@ -29,26 +98,23 @@ def analyze_pr_failures(repo: str, pr_number: str) -> Dict[str, Any]:
         return {"error": "Could not fetch PR data"}
     
     try:
-        pr_json = json.loads(pr_data)
-        status_checks = pr_json.get('statusCheckRollup', [])
+        status_checks = parse_status_checks(pr_data)
         
-        failures = [check for check in status_checks if check.get('conclusion') == 'FAILURE']
-        
-        analysis_results = []
+        failures = [check for check in status_checks if check.conclusion == 'FAILURE']
         
+        failed_runs = []
         for failure in failures:
-            run_id = failure.get('detailsUrl', '').split('/')[-3] if 'detailsUrl' in failure else None
+            run_id, job_id = parse_details_url(failure.detailsUrl or '')
             if run_id:
-                # Get logs for this failure
-                logs = run_gh_command(['run', 'view', run_id, '--repo', repo, '--log'])
-                
-                # Apply Build Detective patterns
-                analysis = apply_bd_patterns(logs, failure['name'])
-                analysis['workflow_name'] = failure.get('workflowName', 'Unknown')
-                analysis['job_name'] = failure['name']
-                analysis['run_id'] = run_id
-                
-                analysis_results.append(analysis)
+                failed_runs.append((failure, run_id, job_id))
+        
+        # Log downloads are network-bound, fetch and analyze them concurrently
+        analysis_results = []
+        if failed_runs:
+            with ThreadPoolExecutor(max_workers=min(8, len(failed_runs))) as executor:
+                analysis_results = list(executor.map(
+                    lambda failed_run: analyze_failed_run(repo, *failed_run), failed_runs
+                ))
         
         return {
             "status": "SUCCESS",
@@ -56,71 +122,155 @@ def analyze_pr_failures(repo: str, pr_number: str) -> Dict[str, Any]:
             "analysis_results": analysis_results
         }
         
-    except json.JSONDecodeError:
+    except _DECODE_ERRORS:
         return {"error": "Could not parse PR data JSON"}
 
-def apply_bd_patterns(logs: str, job_name: str) -> Dict[str, Any]:
-    """Apply Build Detective error patterns to logs"""
-    
-    # YOLO-FFMPEG-MCP specific patterns
-    patterns = {
-        "docker_python_not_found": r'exec: "python": executable file not found in \$PATH',
-        "docker_build_missing_file": r"ERROR: failed to calculate checksum.*not found",
-        "pytest_missing": r"Failed to spawn.*pytest.*No such file",
-        "uv_dependency": r"uv.*not available",
-        "docker_copy_fail": r"COPY.*not found",
-        "mcp_import_fail": r"MCP module imports failed",
-        "docker_strange_files": r"=\d+\.\d+\.\d+",  # Strange version files
-    }
+def analyze_failed_run(repo: str, failure: Check, run_id: str, job_id: Optional[str] = None) -> Dict[str, Any]:
+    """Stream the failed steps' logs of one check through the Build Detective patterns"""
+    # Only download the failing job's failed steps rather than the whole run's logs
+    cmd = ['run', 'view', run_id, '--repo', repo, '--log-failed']
+    if job_id:
+        cmd += ['--job', job_id]
+    with closing(run_gh_stream(cmd)) as logs:
+        analysis = apply_bd_patterns(logs, failure.name)
+    analysis['workflow_name'] = failure.workflowName or 'Unknown'
+    analysis['job_name'] = failure.name
+    analysis['run_id'] = run_id
+    return analysis
+
+class BDRule(NamedTuple):
+    """One Build Detective diagnosis and the log pattern that triggers it"""
+    name: str
+    pattern: re.Pattern
+    primary_error: str
+    error_type: str
+    confidence: int
+    detail: str
+    suggested_action: str
+
+# YOLO-FFMPEG-MCP specific rules, compiled once per process. Patterns are bytes so
+# gh log output is matched as-is without decoding it to str. Gaps are bounded per
+# line to keep near-miss lines from backtracking; messages follow gh's log prefix,
+# so they cannot be anchored to the line start.
+# Ranked by confidence (most specific first); ties go to the earlier rule.
+_RULES = (
+    BDRule("docker_python_not_found",
+           re.compile(rb'exec: "python": executable file not found in \$PATH'),
+           "Docker container missing 'python' executable - Ubuntu uses 'python3'",
+           "docker_python_path", 10,
+           "Container has python3 but CI script uses 'python' command",
+           "Change CI script from 'python' to 'python3' command in Docker exec"),
+    BDRule("docker_build_missing_file",
+           re.compile(rb"ERROR: failed to calculate checksum[^\n]{0,200}not found"),
+           "Docker build failed - missing source files for COPY commands",
+           "docker_build", 9,
+           "Missing test files for Docker COPY",
+           "Add missing test files or fix Dockerfile COPY paths"),
+    BDRule("pytest_missing",
+           re.compile(rb"Failed to spawn[^\n]{0,200}pytest[^\n]{0,200}No such file"),
+           "pytest not available in UV environment",
+           "dependency", 9,
+           "UV missing --extra dev flag",
+           "Add --extra dev flag to uv sync commands"),
+    BDRule("mcp_import_fail",
+           re.compile(rb"MCP module imports failed"),
+           "MCP modules failed to import in Docker",
+           "python_import", 8,
+           "Docker Python environment issues",
+           "Fix Docker Python environment and dependency installation"),
+    # Strange version files; bounded to the first '=' of a line (gh log prefixes lines
+    # with job, step and timestamp, hence the generous bound)
+    BDRule("docker_strange_files",
+           re.compile(rb"^[^=\n]{0,256}=\d+\.\d+\.\d+", re.MULTILINE),
+           "Docker dependency installation created malformed files",
+           "docker_dependency", 7,
+           "UV/pip command parsing issue in Docker",
+           "Fix Docker UV/pip installation commands"),
+)
+
+# How often each diagnosis has fired, persisted so the scan order survives between runs
+_PATTERN_HITS_FILE = Path.home() / ".cache" / "bd_pattern_hits.json"
+_PATTERN_HITS_LOCK = threading.Lock()
+
+def _load_pattern_hits() -> Counter:
+    try:
+        return Counter(json_loads(_PATTERN_HITS_FILE.read_bytes()))
+    except (OSError, ValueError):
+        return Counter()
+
+_PATTERN_HITS = _load_pattern_hits()
+_PATTERN_HITS_DIRTY = False
+
+def _record_pattern_hit(name: str):
+    global _PATTERN_HITS_DIRTY
+    with _PATTERN_HITS_LOCK:
+        _PATTERN_HITS[name] += 1
+        _PATTERN_HITS_DIRTY = True
+
+@atexit.register
+def _save_pattern_hits():
+    """Write the hit counts once, when the process exits"""
+    if not _PATTERN_HITS_DIRTY:
+        return
+    with _PATTERN_HITS_LOCK:
+        try:
+            _PATTERN_HITS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _PATTERN_HITS_FILE.write_text(json.dumps(_PATTERN_HITS))
+        except OSError:
+            pass  # Ordering hint only, never fail the analysis over it
+
+# Rule indices by precedence: confidence, then position in _RULES
+_PRECEDENCE = sorted(range(len(_RULES)), key=lambda index: (-_RULES[index].confidence, index))
+_PRECEDENCE_RANK = {index: rank for rank, index in enumerate(_PRECEDENCE)}
+
+def _scan_order() -> List[int]:
+    """Rule indices by precedence, most frequently seen first within the same confidence
     
+    Only decides which rules get tried first; the diagnosis always follows _PRECEDENCE.
+    """
+    return sorted(_PRECEDENCE, key=lambda index: (-_RULES[index].confidence, -_PATTERN_HITS[_RULES[index].name]))
+
+# Lines joined per regex scan; all patterns are single-line so block boundaries are safe
+_LOG_BLOCK_LINES = 4096
+
+def _log_blocks(logs: Union[bytes, str, Iterable[bytes]]) -> Iterator[bytes]:
+    """Yield the log as bytes blocks of whole newline-terminated lines"""
+    if isinstance(logs, str):
+        logs = logs.encode()
+    if isinstance(logs, bytes):
+        yield logs
+        return
+    lines = iter(logs)
+    while block := b''.join(islice(lines, _LOG_BLOCK_LINES)):
+        yield block
+
+def apply_bd_patterns(logs: Union[bytes, str, Iterable[bytes]], job_name: str) -> Dict[str, Any]:
+    """Apply Build Detective error patterns to logs (full text or an iterable of raw lines)"""
     errors_found = []
     primary_error = "Unknown failure"
     error_type = "unknown"
     confidence = 5
+    suggested_action = "Check logs manually"
     
-    # Check for specific patterns (most specific first)
-    if re.search(patterns["docker_python_not_found"], logs):
-        primary_error = "Docker container missing 'python' executable - Ubuntu uses 'python3'"
-        error_type = "docker_python_path"
-        confidence = 10
-        errors_found.append("Container has python3 but CI script uses 'python' command")
-        
-    elif re.search(patterns["docker_build_missing_file"], logs):
-        primary_error = "Docker build failed - missing source files for COPY commands"
-        error_type = "docker_build"
-        confidence = 9
-        errors_found.append("Missing test files for Docker COPY")
-        
-    elif re.search(patterns["pytest_missing"], logs):
-        primary_error = "pytest not available in UV environment"
-        error_type = "dependency"
-        confidence = 9
-        errors_found.append("UV missing --extra dev flag")
-        
-    elif re.search(patterns["mcp_import_fail"], logs):
-        primary_error = "MCP modules failed to import in Docker"
-        error_type = "python_import"  
-        confidence = 8
-        errors_found.append("Docker Python environment issues")
-        
-    elif re.search(patterns["docker_strange_files"], logs):
-        primary_error = "Docker dependency installation created malformed files"
-        error_type = "docker_dependency"
-        confidence = 7
-        errors_found.append("UV/pip command parsing issue in Docker")
+    # Each rule scans a whole block in C, using its literal prefix to skip ahead, instead of
+    # being tried line by line. Earlier rules take precedence; only look for ones that
+    # would outrank the best so far. Frequently seen rules are tried first, so a common
+    # diagnosis rules out the rest early.
+    scan_order = _scan_order()
+    best = len(_RULES)
+    for block in _log_blocks(logs):
+        for index in scan_order:
+            if _PRECEDENCE_RANK[index] < best and _RULES[index].pattern.search(block):
+                best = _PRECEDENCE_RANK[index]
+        if best == 0:
+            break  # Nothing outranks the first rule, skip the rest of the log
     
-    # Determine suggested action
-    suggested_action = "Check logs manually"
-    if error_type == "docker_python_path":
-        suggested_action = "Change CI script from 'python' to 'python3' command in Docker exec"
-    elif error_type == "docker_build":
-        suggested_action = "Add missing test files or fix Dockerfile COPY paths"
-    elif error_type == "dependency":
-        suggested_action = "Add --extra dev flag to uv sync commands"
-    elif error_type == "python_import":
-        suggested_action = "Fix Docker Python environment and dependency installation"
-    elif error_type == "docker_dependency":
-        suggested_action = "Fix Docker UV/pip installation commands"
+    if best < len(_RULES):
+        rule = _RULES[_PRECEDENCE[best]]
+        primary_error, error_type, confidence = rule.primary_error, rule.error_type, rule.confidence
+        suggested_action = rule.suggested_action
+        errors_found.append(rule.detail)
+        _record_pattern_hit(rule.name)
     
     return {
         "primary_error": primary_error,
@@ -3,11 +3,47 @@
 Build Detective Success Analysis
 Find last 10 successful CI builds and compare with current failures
 """
+import copy
 import subprocess
 import json
 import sys
-from typing import Dict, List, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Any, IO, Iterator
+
+import bd_github_api
+from bd_json import json_loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # Optional dependency, falls back to json_loads
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None  # Optional dependency, details are then only reused in-process
+
+# Fields kept when streaming `gh run view --json` output
+_RUN_DETAIL_FIELDS = {'conclusion', 'status', 'workflowName', 'headBranch', 'createdAt'}
+_JOB_FIELD_PREFIXES = {'jobs.item.name': 'name', 'jobs.item.status': 'status',
+                       'jobs.item.conclusion': 'conclusion'}
+_JSON_SCALAR_EVENTS = {'string', 'number', 'boolean', 'null'}
+
+# Cross-invocation cache for run details; only finished runs are stored
+DETAILS_CACHE_DIR = '/tmp/bd-cache'
+DETAILS_CACHE_TTL_SECONDS = 600
+
+_details_cache = None
+# In-process copy of completed runs' details, by "repo#run_number"; failures and
+# in-progress runs are never kept
+_completed_details: Dict[str, Dict] = {}
+
+def _get_details_cache():
+    global _details_cache
+    if _details_cache is None and diskcache is not None:
+        _details_cache = diskcache.Cache(DETAILS_CACHE_DIR)
+    return _details_cache
 
 def run_gh_command(cmd: List[str]) -> str:
     """Run GitHub CLI command and return output"""
@@ -18,18 +54,47 @@ def run_gh_command(cmd: List[str]) -> str:
         print(f"GitHub CLI error: {e}")
         return ""
 
+@contextmanager
+def open_gh_stream(cmd: List[str]) -> Iterator[IO[bytes]]:
+    """Run GitHub CLI command and expose its raw stdout for streaming parsers"""
+    proc = subprocess.Popen(['gh'] + cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        yield proc.stdout
+    finally:
+        if proc.poll() is None:
+            proc.kill()  # Parser stopped reading early
+        proc.stdout.close()
+        if proc.wait() > 0:
+            print(f"GitHub CLI error: gh {' '.join(cmd)} exited with status {proc.returncode}")
+
 def get_recent_workflow_runs(repo: str, limit: int = 50) -> List[Dict]:
     """Get recent workflow runs with their status"""
-    runs_data = run_gh_command([
+    cmd = [
         'run', 'list', '--repo', repo, '--limit', str(limit), '--json',
         'status,conclusion,workflowName,number,createdAt,headBranch,event'
-    ])
+    ]
+    
+    # Shared REST connection avoids a gh fork + re-auth when a token is configured
+    runs = bd_github_api.get_workflow_runs(repo, limit)
+    if runs is not None:
+        return runs
+    
+    if ijson is not None:
+        # Stream runs straight from gh instead of buffering and parsing the whole payload
+        try:
+            with open_gh_stream(cmd) as stream:
+                return list(ijson.items(stream, 'item'))
+        except ijson.JSONError:
+            print("Failed to parse workflow runs data")
+            return []
+    
+    runs_data = run_gh_command(cmd)
     
     if not runs_data:
         return []
     
     try:
-        runs = json.loads(runs_data)
+        runs = json_loads(runs_data)
         return runs
     except json.JSONDecodeError:
         print("Failed to parse workflow runs data")
@@ -52,7 +117,8 @@ def find_successful_builds(repo: str, count: int = 10) -> List[Dict]:
                 'workflow_name': run['workflowName'],
                 'branch': run['headBranch'],
                 'created_at': run['createdAt'],
-                'event': run['event']
+                'event': run['event'],
+                'node_id': run.get('nodeId')
             })
             
             if len(successful_builds) >= count:
@@ -77,26 +143,91 @@ def find_recent_failures(repo: str, limit: int = 20) -> List[Dict]:
                 'workflow_name': run['workflowName'],
                 'branch': run['headBranch'],
                 'created_at': run['createdAt'],
-                'event': run['event']
+                'event': run['event'],
+                'node_id': run.get('nodeId')
             })
     
     return failed_builds
 
 def get_workflow_details(repo: str, run_number: int) -> Dict:
-    """Get detailed information about a specific workflow run"""
-    run_data = run_gh_command([
+    """Get detailed information about a specific workflow run
+    
+    Completed runs are cached per (repo, run_number); callers get their own copy.
+    """
+    key = f"{repo}#{run_number}"
+    details = _completed_details.get(key)
+    if details is not None:
+        return copy.deepcopy(details)
+    
+    cache = _get_details_cache()
+    details = cache.get(key) if cache is not None else None
+    if details is None:
+        details = _fetch_workflow_details(repo, run_number)
+    
+    # Completed runs no longer change, in-progress ones must be fetched again
+    if details.get('status') == 'completed':
+        if cache is not None and key not in cache:
+            cache.set(key, details, expire=DETAILS_CACHE_TTL_SECONDS)
+        _completed_details[key] = copy.deepcopy(details)
+    return details
+
+def _fetch_workflow_details(repo: str, run_number: int) -> Dict:
+    cmd = [
         'run', 'view', str(run_number), '--repo', repo, '--json',
         'jobs,conclusion,status,workflowName,headBranch,createdAt'
-    ])
+    ]
+    
+    if ijson is not None:
+        # Pick out run fields and job name/status/conclusion; job steps are never built
+        details = {'jobs': []}
+        try:
+            with open_gh_stream(cmd) as stream:
+                for prefix, event, value in ijson.parse(stream):
+                    if prefix == 'jobs.item' and event == 'start_map':
+                        details['jobs'].append({})
+                    elif prefix in _JOB_FIELD_PREFIXES and event in _JSON_SCALAR_EVENTS:
+                        details['jobs'][-1][_JOB_FIELD_PREFIXES[prefix]] = value
+                    elif prefix in _RUN_DETAIL_FIELDS and event in _JSON_SCALAR_EVENTS:
+                        details[prefix] = value
+        except ijson.JSONError:
+            return {}
+        return details
+    
+    run_data = run_gh_command(cmd)
     
     if not run_data:
         return {}
     
     try:
-        return json.loads(run_data)
+        return json_loads(run_data)
     except json.JSONDecodeError:
         return {}
 
+def _common_jobs(patterns) -> frozenset:
+    """Job names present in every analyzed build, intersected incrementally"""
+    common = None
+    for data in patterns:
+        jobs = frozenset(data['jobs'])
+        common = jobs if common is None else common & jobs
+    return common if common is not None else frozenset()
+
+def _fetch_compared_details(builds: List[Dict], repo: str) -> Dict[int, Dict]:
+    """Job details for the compared builds, keyed by run number"""
+    # Runs listed over REST carry node ids, so all their jobs come back in one GraphQL request
+    node_ids = [build.get('node_id') for build in builds]
+    if all(node_ids):
+        jobs_by_node = bd_github_api.get_workflow_run_jobs(node_ids)
+        if jobs_by_node is not None:
+            return {build['run_number']: {'jobs': jobs_by_node.get(build['node_id'], [])}
+                    for build in builds}
+    
+    # Otherwise fetch each run's details concurrently
+    run_numbers = [build['run_number'] for build in builds]
+    with ThreadPoolExecutor(max_workers=max(1, len(run_numbers))) as executor:
+        return dict(zip(run_numbers, executor.map(
+            lambda run_number: get_workflow_details(repo, run_number), run_numbers
+        )))
+
 def analyze_build_differences(successful_builds: List[Dict], failed_builds: List[Dict], repo: str) -> Dict:
     """Compare successful and failed builds to find differences"""
     print("🔍 Analyzing differences between successful and failed builds...")
@@ -108,12 +239,14 @@ def analyze_build_differences(successful_builds: List[Dict], failed_builds: List
         'missing_special_sauce': []
     }
     
+    details_map = _fetch_compared_details(successful_builds[:3] + failed_builds[:3], repo)
+    
     # Analyze successful builds
     for build in successful_builds[:3]:  # Analyze last 3 successful
-        details = get_workflow_details(repo, build['run_number'])
+        details = details_map[build['run_number']]
         if details:
             jobs = details.get('jobs', [])
-            job_names = [job.get('name', '') for job in jobs]
+            job_names = [sys.intern(job.get('name', '')) for job in jobs]
             analysis['successful_patterns'][build['run_number']] = {
                 'branch': build['branch'],
                 'jobs': job_names,
@@ -123,10 +256,10 @@ def analyze_build_differences(successful_builds: List[Dict], failed_builds: List
     
     # Analyze failed builds
     for build in failed_builds[:3]:  # Analyze last 3 failed
-        details = get_workflow_details(repo, build['run_number'])
+        details = details_map[build['run_number']]
         if details:
             jobs = details.get('jobs', [])
-            job_names = [job.get('name', '') for job in jobs]
+            job_names = [sys.intern(job.get('name', '')) for job in jobs]
             analysis['failed_patterns'][build['run_number']] = {
                 'branch': build['branch'],
                 'jobs': job_names,
@@ -136,20 +269,8 @@ def analyze_build_differences(successful_builds: List[Dict], failed_builds: List
     
     # Find differences
     if analysis['successful_patterns'] and analysis['failed_patterns']:
-        success_job_sets = [set(data['jobs']) for data in analysis['successful_patterns'].values()]
-        failed_job_sets = [set(data['jobs']) for data in analysis['failed_patterns'].values()]
-        
-        # Find common successful jobs
-        if success_job_sets:
-            common_success_jobs = set.intersection(*success_job_sets) if len(success_job_sets) > 1 else success_job_sets[0]
-        else:
-            common_success_jobs = set()
-            
-        # Find common failed jobs
-        if failed_job_sets:
-            common_failed_jobs = set.intersection(*failed_job_sets) if len(failed_job_sets) > 1 else failed_job_sets[0]
-        else:
-            common_failed_jobs = set()
+        common_success_jobs = _common_jobs(analysis['successful_patterns'].values())
+        common_failed_jobs = _common_jobs(analysis['failed_patterns'].values())
         
         # Identify missing jobs (in success but not in failed)
         missing_jobs = common_success_jobs - common_failed_jobs
@@ -170,6 +291,10 @@ def analyze_build_differences(successful_builds: List[Dict], failed_builds: List
     
     return analysis
 
+def format_created_at(created_at: str) -> str:
+    """Format a GitHub 'YYYY-MM-DDTHH:MM:SSZ' timestamp as 'YYYY-MM-DD HH:MM' by slicing"""
+    return f"{created_at[0:10]} {created_at[11:16]}"
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: python bd_success_analysis.py <repo>")
@@ -185,14 +310,14 @@ def main():
     successful_builds = find_successful_builds(repo, 10)
     print(f"✅ Found {len(successful_builds)} successful CI builds:")
     for i, build in enumerate(successful_builds, 1):
-        created_date = datetime.fromisoformat(build['created_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+        created_date = format_created_at(build['created_at'])
         print(f"   {i}. Run #{build['run_number']} - {build['branch']} - {created_date}")
     
     # Find failed builds
     failed_builds = find_recent_failures(repo, 10)
     print(f"\n❌ Found {len(failed_builds)} recent failed CI builds:")
     for i, build in enumerate(failed_builds, 1):
-        created_date = datetime.fromisoformat(build['created_at'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+        created_date = format_created_at(build['created_at'])
         print(f"   {i}. Run #{build['run_number']} - {build['branch']} - {created_date}")
     
     # Analyze differences
@@ -3,10 +3,24 @@
 Build Detective Takeover Protocol
 When BD confidence is low, take over with direct GitHub API analysis
 """
-import json
 import subprocess
+from collections import namedtuple
+from operator import attrgetter
 from typing import Dict, List
 
+import bd_github_api
+from bd_enhanced_analysis import calculate_runtime_minutes
+from bd_json import json_loads
+
+# The `gh pr checks --json` fields takeover reads, defaulted like the previous .get() calls
+Check = namedtuple('Check', 'name state link startedAt',
+                   defaults=('', '', '', bd_github_api.NO_TIMESTAMP))
+_check_fields = attrgetter(*Check._fields)
+
+def to_check(check: Dict) -> Check:
+    """Project a gh/REST check dict onto Check, ignoring fields takeover does not use"""
+    return Check(**{field: check[field] for field in Check._fields if field in check})
+
 def should_takeover(bd_confidence: int, enhanced_analysis: Dict) -> bool:
     """Determine if we should take over from BD"""
     
@@ -25,6 +39,25 @@ def should_takeover(bd_confidence: int, enhanced_analysis: Dict) -> bool:
         
     return False
 
+# Job-name keyword -> (runtime minutes threshold, diagnosis, root cause, action, urgency)
+_JOB_RULES = (
+    # Docker build patterns
+    ('docker', (
+        (30, 'Alpine compilation timeout - classic 2-6 hour build waste',
+         'CI workflow still using Alpine Docker base with heavy compilation',
+         'Update CI workflow to use Ubuntu Docker base or disable Alpine build', 'CRITICAL'),
+        (10, 'Docker build taking unusually long',
+         'Possible Alpine compilation or network issues',
+         'Check if workflow updated to use Ubuntu base', 'HIGH'),
+    )),
+    # Integration test patterns
+    ('integration', (
+        (15, 'Integration tests hanging or in infinite loop',
+         'Possible service startup timeout or test framework issue',
+         'Check test logs for hanging processes', 'HIGH'),
+    )),
+)
+
 def analyze_long_running_job(job_name: str, runtime_minutes: float, link: str) -> Dict:
     """Deep analysis of long-running jobs"""
     analysis = {
@@ -36,26 +69,18 @@ def analyze_long_running_job(job_name: str, runtime_minutes: float, link: str) -
         'urgency': 'LOW'
     }
     
-    # Docker build patterns
-    if 'docker' in job_name.lower():
-        if runtime_minutes > 30:
-            analysis['diagnosis'] = 'Alpine compilation timeout - classic 2-6 hour build waste'
-            analysis['root_cause'] = 'CI workflow still using Alpine Docker base with heavy compilation'
-            analysis['recommended_action'] = 'Update CI workflow to use Ubuntu Docker base or disable Alpine build'
-            analysis['urgency'] = 'CRITICAL'
-        elif runtime_minutes > 10:
-            analysis['diagnosis'] = 'Docker build taking unusually long'
-            analysis['root_cause'] = 'Possible Alpine compilation or network issues'
-            analysis['recommended_action'] = 'Check if workflow updated to use Ubuntu base'
-            analysis['urgency'] = 'HIGH'
-    
-    # Integration test patterns  
-    elif 'integration' in job_name.lower():
-        if runtime_minutes > 15:
-            analysis['diagnosis'] = 'Integration tests hanging or in infinite loop'
-            analysis['root_cause'] = 'Possible service startup timeout or test framework issue'
-            analysis['recommended_action'] = 'Check test logs for hanging processes'
-            analysis['urgency'] = 'HIGH'
+    # First job-name keyword that matches decides; thresholds are checked most severe first
+    name_lower = job_name.lower()
+    for keyword, rules in _JOB_RULES:
+        if keyword in name_lower:
+            for min_runtime, diagnosis, root_cause, action, urgency in rules:
+                if runtime_minutes > min_runtime:
+                    analysis['diagnosis'] = diagnosis
+                    analysis['root_cause'] = root_cause
+                    analysis['recommended_action'] = action
+                    analysis['urgency'] = urgency
+                    break
+            break
     
     return analysis
 
@@ -64,30 +89,29 @@ def takeover_analysis(repo: str, pr_number: str) -> Dict:
     print("🔄 Taking over from Build Detective...")
     print("=" * 50)
     
-    # Get current PR status
-    result = subprocess.run([
-        'gh', 'pr', 'checks', pr_number, '--repo', repo,
-        '--json', 'name,state,completedAt,startedAt,link'
-    ], capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        return {"error": "Failed to get PR status"}
+    # Get current PR status, over the shared REST connection when possible
+    checks = bd_github_api.get_pr_checks(repo, pr_number)
     
-    checks = json.loads(result.stdout)
+    if checks is None:
+        result = subprocess.run([
+            'gh', 'pr', 'checks', pr_number, '--repo', repo,
+            '--json', 'name,state,completedAt,startedAt,link'
+        ], capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            return {"error": "Failed to get PR status"}
+        
+        checks = json_loads(result.stdout)
     takeover_results = {
         'critical_jobs': [],
         'action_plan': [],
         'immediate_actions': []
     }
     
-    for check in checks:
-        name = check.get('name', '')
-        state = check.get('state', '')
-        link = check.get('link', '')
+    for check in map(to_check, checks):
+        name, state, link, started_at = _check_fields(check)
         
         if state == 'IN_PROGRESS':
-            from bd_enhanced_analysis import calculate_runtime_minutes
-            started_at = check.get('startedAt', '0001-01-01T00:00:00Z')
             runtime = calculate_runtime_minutes(started_at)
             
             if runtime > 5:  # Suspicious long-running job
@@ -4,32 +4,125 @@ Build Detective Upgrade Test - Before/After Version Testing
 Tests build status before upgrade, performs upgrade, tests after, and compares results
 """
 
+import io
+import os
+import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, TextIO, Tuple
 from bd_build_runner import BuildRunner, BuildResult
 from bd_artifact_manager import ArtifactManager
-import json
+from bd_json import json_dumps
 import time
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows; appends are then unlocked
+
+
+# javac diagnostics as Maven reports them, "[ERROR] /path/Foo.java:[12,5] cannot find symbol"
+_JAVAC_ERROR_RE = re.compile(r"\.java:\[\d+,\d+\]")
+
+# A POM's <parent> block and the <relativePath> inside it (empty or self-closing = none)
+_POM_PARENT_RE = re.compile(r"<parent>(.*?)</parent>", re.DOTALL)
+_POM_RELATIVE_PATH_RE = re.compile(r"<relativePath\s*(?:/>|>([^<]*)</relativePath>)")
+
+# Column order of the appended summaries TSV
+SUMMARY_COLUMNS = ("ts", "subproject", "target", "before_ok", "after_ok",
+                   "before_dur", "after_dur", "before_errs", "after_errs")
+
+
+# (predicate over the comparison facts, message template) in report order
+_RECOMMENDATION_RULES = (
+    (lambda c: c.both_succeeded and not c.new_errors,
+     "✅ Build stability maintained - upgrade appears safe"),
+    (lambda c: c.success_change,
+     "⚠️ Build success status changed - investigate before proceeding"),
+    (lambda c: c.test_count_change > 0,
+     "📈 {c.test_count_change} additional tests - good test coverage"),
+    (lambda c: c.test_count_change < 0,
+     "📉 {c.abs_test_count_change} fewer tests - verify test completeness"),
+    (lambda c: c.new_errors,
+     "🚨 New errors detected - upgrade may introduce issues"),
+    (lambda c: c.resolved_errors and not c.new_errors,
+     "✅ Some errors resolved - upgrade may fix existing issues"),
+    (lambda c: c.duration_change > 30,
+     "⏱️ Build time increased significantly - monitor performance"),
+    (lambda c: c.duration_change < -30,
+     "⚡ Build time improved - upgrade brings performance benefits"),
+)
+
+
+def _append_locked(path: Path, data: bytes, header: bytes = b""):
+    """Append to a shared log file, holding an exclusive lock where the OS supports it"""
+    with open(path, "ab") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)  # Released when the file is closed
+        if header and f.seek(0, os.SEEK_END) == 0:
+            f.write(header)
+        f.write(data)
+
 
 class UpgradeTestRunner:
+    # Per-phase working copies, so concurrent `mvn clean` runs don't share a target dir
+    PHASE_WORKDIR = ".bd_cache"
+    # Overlapping the before/after builds only pays off with spare cores for both JVMs
+    MIN_CPUS_FOR_PARALLEL_PHASES = 4
+    # Maven resolver (3.9+) file locks, so concurrent phases can share ~/.m2 safely
+    SHARED_REPO_LOCK_ARGS = ("-Daether.syncContext.named.factory=file-lock",
+                             "-Daether.syncContext.named.nameMapper=file-gav")
+    # Maven parallel reactor threads, overridable with BD_MVN_THREADS (empty = serial)
+    DEFAULT_MAVEN_THREADS = "1C"
+    # POM property that keeps a project's reactor serial, e.g. when modules share test state
+    SERIAL_BUILD_PROPERTY = "<bd.mvn.serial>true</bd.mvn.serial>"
+    # Reports from every run, appended under scripts/tests/
+    REPORTS_INDEX = "upgrade_reports.ndjson"
+    SUMMARIES_TSV = "upgrade_summaries.tsv"
+    # Maven names the failing execution in "[ERROR] Failed to execute goal ... (default-compile) ..."
+    COMPILE_GOAL_MARKER = "(default-compile)"
+    # Offline builds fail fast with this when ~/.m2 is missing something
+    UNRESOLVED_DEPS_MARKER = "Could not resolve dependencies"
+    # The slow integration profile only runs after a green unit smoke, and only on request
+    INTEGRATION_PROFILE = "ex-integration"
+    RUN_INTEGRATION_ENV = "BD_RUN_INTEGRATION"
+    
     def __init__(self, project_root: Path):
         self.project_root = project_root
         self.build_runner = BuildRunner(project_root)
         self.artifact_manager = ArtifactManager(project_root)
+        self.reports_dir = project_root / "scripts" / "tests"
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
         
     def run_upgrade_test_cycle(self, subproject: str = "VideoRenderer", 
-                              target_version: str = "1.3.8") -> Dict[str, Any]:
+                              target_version: str = "1.3.8",
+                              verbose: bool = False) -> Dict[str, Any]:
         """Run complete upgrade test cycle: test → upgrade → test → compare"""
         
         print(f"🔄 Starting upgrade test cycle for {subproject}")
         print(f"🎯 Target version: {target_version}")
         print("=" * 60)
         
+        # Phases 1 and 4 build the same sources independently; overlap them when cores allow
+        phase_logs = {}
+        if (os.cpu_count() or 1) >= self.MIN_CPUS_FOR_PARALLEL_PHASES:
+            # Per-phase copies hold only the subproject, so a POM that reaches outside it
+            # has to be built in place
+            if self._pom_reaches_outside(self.project_root / subproject):
+                print("\n➡️ POM refers outside the subproject, running the builds one after another")
+            else:
+                print("\n🔀 Running pre- and post-upgrade builds concurrently")
+                before_result, after_result, phase_logs = self._run_phases_concurrently(subproject)
+        
         # Phase 1: Pre-upgrade testing
         print("\n📋 Phase 1: Pre-upgrade baseline testing")
-        before_result = self._run_comprehensive_test(subproject, "before_upgrade")
+        if phase_logs:
+            print(phase_logs["before_upgrade"], end="")
+        else:
+            before_result = self._run_comprehensive_test(subproject, "before_upgrade")
         
         # Phase 2: Version analysis  
         print("\n🔍 Phase 2: Current version analysis")
@@ -41,7 +134,11 @@ class UpgradeTestRunner:
         
         # Phase 4: Post-upgrade testing (simulate same build to show comparison)
         print("\n📋 Phase 4: Post-upgrade testing (simulated)")
-        after_result = self._run_comprehensive_test(subproject, "after_upgrade")
+        if phase_logs:
+            print(phase_logs["after_upgrade"], end="")
+        else:
+            # The baseline build has just resolved everything into ~/.m2
+            after_result = self._run_comprehensive_test(subproject, "after_upgrade", force_offline=True)
         
         # Phase 5: Comparison and analysis
         print("\n📊 Phase 5: Results comparison")
@@ -65,53 +162,170 @@ class UpgradeTestRunner:
         }
         
         # Save comprehensive report
-        self._save_upgrade_report(full_report)
+        self._save_upgrade_report(full_report, verbose)
         
         return full_report
     
-    def _run_comprehensive_test(self, subproject: str, phase: str) -> BuildResult:
-        """Run comprehensive build test for a subproject"""
-        print(f"  🔨 Running comprehensive build test ({phase})")
+    def _run_phases_concurrently(self, subproject: str):
+        """Run the before/after builds side by side, each in its own working copy
+        
+        Returns both results plus each phase's buffered log, so output isn't interleaved.
+        Both phases resolve online, under resolver file locks: the baseline hasn't filled
+        ~/.m2 yet, so the post-upgrade build can't rely on `-o`.
+        """
+        phases = ("before_upgrade", "after_upgrade")
+        logs = {phase: io.StringIO() for phase in phases}
+        with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+            futures = {
+                phase: executor.submit(self._run_comprehensive_test, subproject, phase,
+                                       self._phase_build_runner(subproject, phase), logs[phase],
+                                       maven_args=self.SHARED_REPO_LOCK_ARGS)
+                for phase in phases
+            }
+            before_result, after_result = (futures[phase].result() for phase in phases)
+        return before_result, after_result, {phase: log.getvalue() for phase, log in logs.items()}
+    
+    def _phase_build_runner(self, subproject: str, phase: str) -> BuildRunner:
+        """Copy the subproject into a fresh per-phase working copy and build there
+        
+        Only the subproject is copied; callers check _pom_reaches_outside first.
+        """
+        phase_root = self.project_root / self.PHASE_WORKDIR / phase
+        shutil.rmtree(phase_root / subproject, ignore_errors=True)
+        shutil.copytree(self.project_root / subproject, phase_root / subproject,
+                        ignore=shutil.ignore_patterns("target", ".git"))
+        return BuildRunner(phase_root)
+    
+    def _run_comprehensive_test(self, subproject: str, phase: str,
+                                build_runner: Optional[BuildRunner] = None,
+                                log: Optional[TextIO] = None,
+                                parallel_threads: Optional[str] = None,
+                                force_offline: bool = False,
+                                maven_args: Tuple[str, ...] = ()) -> BuildResult:
+        """Run comprehensive build test for a subproject
+        
+        Runs unit tests only; set BD_RUN_INTEGRATION=1 to follow a green run with the
+        integration profile. `force_offline` builds with `-o`, skipping remote update
+        checks for dependencies already in ~/.m2; a build that can't resolve them
+        offline is retried online once. `maven_args` are passed to Maven ahead of the goals.
+        """
+        build_runner = build_runner or self.build_runner
+        log = log or sys.stdout
+        if parallel_threads is None:
+            parallel_threads = os.environ.get("BD_MVN_THREADS", self.DEFAULT_MAVEN_THREADS)
+        print(f"  🔨 Running comprehensive build test ({phase})", file=log)
+        
+        # One `clean test` unit smoke: the test lifecycle compiles first, so a separate
+        # `clean compile` only paid JVM startup and dependency resolution twice.
+        # Tests may share state across modules; respect a POM that opts out of `-T`.
+        build_path = build_runner.project_root / subproject
+        threads = None if self._pom_requests_serial(build_path) else parallel_threads
+        test_result = self._run_maven_tests(build_runner, subproject, [*maven_args, "clean", "test"],
+                                            None, threads, force_offline, log)
+        
+        # The runner decides the compile verdict before truncating the error list
+        compile_failed = test_result.compile_failed
+        
+        print(f"  ✅ Compile: {'FAILED' if compile_failed else 'SUCCESS'}", file=log)
+        print(f"  ⏱️ Duration: {test_result.duration_seconds}s", file=log)
+        
+        if compile_failed:
+            # The javac diagnostics themselves; the goal line alone says nothing about the cause
+            # (a line may be captured both bare and with its "[ERROR] " prefix)
+            compile_errors = list(dict.fromkeys(error.removeprefix("[ERROR] ") for error in test_result.errors
+                                                if _JAVAC_ERROR_RE.search(error)))
+            if not compile_errors:
+                compile_errors = [error for error in test_result.errors if self.COMPILE_GOAL_MARKER in error]
+            # Only the first MAX_REPORTED_ERRORS errors are kept, so there may be more
+            more = "+" if test_result.error_count > len(test_result.errors) else ""
+            print(f"  🚨 Compile errors: {len(compile_errors)}{more}", file=log)
+            for error in compile_errors[:2]:
+                print(f"     • {error[:100]}...", file=log)
+            return test_result
         
-        # Try compile first (fastest)
-        compile_result = self.build_runner.run_maven_build(
-            subproject, 
-            ["clean", "compile"], 
-            skip_tests=True
-        )
+        self._print_test_summary(test_result, log)
         
-        print(f"  ✅ Compile: {'SUCCESS' if compile_result.success else 'FAILED'}")
-        print(f"  ⏱️ Duration: {compile_result.duration_seconds}s")
+        # Escalate to integration tests only from a green smoke; classes are already compiled
+        tests = test_result.test_results
+        smoke_green = test_result.success and tests["tests_run"] > 0 and tests["failures"] + tests["errors"] == 0
+        if smoke_green and os.environ.get(self.RUN_INTEGRATION_ENV) == "1":
+            print(f"  🧪 Unit smoke green, running {self.INTEGRATION_PROFILE} profile", file=log)
+            test_result = self._run_maven_tests(build_runner, subproject, [*maven_args, "test"],
+                                                [self.INTEGRATION_PROFILE], threads, force_offline, log)
+            self._print_test_summary(test_result, log)
         
-        if compile_result.errors:
-            print(f"  🚨 Compile errors: {len(compile_result.errors)}")
-            for error in compile_result.errors[:2]:
-                print(f"     • {error[:100]}...")
+        return test_result
+    
+    def _run_maven_tests(self, build_runner: BuildRunner, subproject: str, goals: List[str],
+                         profiles: Optional[List[str]], threads: Optional[str],
+                         force_offline: bool, log: TextIO) -> BuildResult:
+        """Run Maven goals, offline when forced, retrying online if dependencies are missing"""
+        test_result = build_runner.run_maven_build(
+            subproject, 
+            ["-o"] + goals if force_offline else goals, 
+            profiles=profiles,
+            use_cache=False,
+            threads=threads,
+            log=log
+        )
         
-        # If compile succeeds, try with tests
-        if compile_result.success:
-            test_result = self.build_runner.run_maven_build(
+        if force_offline and any(self.UNRESOLVED_DEPS_MARKER in error for error in test_result.errors):
+            print("  ⚠️ Offline build could not resolve dependencies, retrying online", file=log)
+            test_result = build_runner.run_maven_build(
                 subproject, 
-                ["test"], 
-                profiles=["ex-integration"]  # Use integration profile if available
+                goals, 
+                profiles=profiles,
+                use_cache=False,
+                threads=threads,
+                log=log
             )
-            
-            print(f"  🧪 Tests: {'SUCCESS' if test_result.success else 'FAILED'}")
-            if test_result.test_results["tests_run"] > 0:
-                print(f"     Tests run: {test_result.test_results['tests_run']}")
-                print(f"     Failures: {test_result.test_results['failures']}")
-                print(f"     Errors: {test_result.test_results['errors']}")
-            
-            return test_result
-        else:
-            return compile_result
+        
+        return test_result
+    
+    @staticmethod
+    def _print_test_summary(test_result: BuildResult, log: TextIO):
+        """Print the test verdict and Surefire counts of a build"""
+        print(f"  🧪 Tests: {'SUCCESS' if test_result.success else 'FAILED'}", file=log)
+        if test_result.test_results["tests_run"] > 0:
+            print(f"     Tests run: {test_result.test_results['tests_run']}", file=log)
+            print(f"     Failures: {test_result.test_results['failures']}", file=log)
+            print(f"     Errors: {test_result.test_results['errors']}", file=log)
+    
+    @staticmethod
+    def _pom_reaches_outside(build_path: Path) -> bool:
+        """Whether the POM refers to files outside its own directory
+        
+        True for a parent POM found by relative path (../pom.xml unless <relativePath/>
+        says otherwise) and for ${project.basedir}/.. references. Such a project breaks
+        when copied on its own into a per-phase working copy.
+        """
+        try:
+            pom = (build_path / "pom.xml").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return False
+        if "basedir}/.." in pom:
+            return True
+        parent = _POM_PARENT_RE.search(pom)
+        if parent is None:
+            return False
+        relative_path = _POM_RELATIVE_PATH_RE.search(parent.group(1))
+        relative_path = (relative_path.group(1) or "").strip() if relative_path else "../pom.xml"
+        return bool(relative_path) and (build_path / relative_path).exists()
+    
+    @classmethod
+    def _pom_requests_serial(cls, build_path: Path) -> bool:
+        """Whether the project POM sets the <bd.mvn.serial>true</bd.mvn.serial> property"""
+        try:
+            pom = (build_path / "pom.xml").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return False
+        return cls.SERIAL_BUILD_PROPERTY in pom
     
     def _analyze_current_versions(self, subproject: str) -> Dict[str, Any]:
         """Analyze current versions in the subproject"""
         print(f"  📦 Analyzing versions in {subproject}")
         
-        subproject_path = self.project_root / subproject
-        subproject_manager = ArtifactManager(subproject_path)
+        subproject_manager = ArtifactManager(self.project_root / subproject)
         
         project_info = subproject_manager.scan_project_dependencies()
         
@@ -126,12 +340,15 @@ class UpgradeTestRunner:
         }
         
         # Check local vs GitHub versions for key components
-        for dep in owned_deps[:5]:  # Limit to first 5 to avoid token usage
+        key_deps = owned_deps[:5]  # Limit to first 5 to avoid token usage
+        # Read all their ~/.m2 directories in one batch, then probe per dependency
+        m2_index = subproject_manager.build_m2_index((dep['groupId'], dep['artifactId']) for dep in key_deps)
+        for dep in key_deps:
             group_id = dep['groupId']
             artifact_id = dep['artifactId']
             current_version = dep['version']
             
-            local_artifacts = subproject_manager.scan_local_m2_versions(group_id, artifact_id)
+            local_artifacts = m2_index.get((group_id, artifact_id), [])
             latest_local = max(local_artifacts, key=lambda x: x.version) if local_artifacts else None
             
             version_summary["key_versions"][f"{group_id}:{artifact_id}"] = {
@@ -190,93 +407,110 @@ class UpgradeTestRunner:
     def _generate_recommendations(self, comparison: Dict[str, Any], 
                                  upgrade_plan: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on test comparison"""
-        recommendations = []
-        
-        if comparison["success_change"]:
-            if not comparison["success_change"]:  # after.success == before.success
-                recommendations.append("✅ Build stability maintained - upgrade appears safe")
-            else:
-                recommendations.append("⚠️ Build success status changed - investigate before proceeding")
-        
-        if comparison["test_changes"]:
-            test_count_change = comparison["test_changes"].get("test_count_change", 0)
-            if test_count_change > 0:
-                recommendations.append(f"📈 {test_count_change} additional tests - good test coverage")
-            elif test_count_change < 0:
-                recommendations.append(f"📉 {abs(test_count_change)} fewer tests - verify test completeness")
-        
-        if comparison["error_changes"]["new_errors"]:
-            recommendations.append("🚨 New errors detected - upgrade may introduce issues")
-        elif comparison["error_changes"]["resolved_errors"]:
-            recommendations.append("✅ Some errors resolved - upgrade may fix existing issues")
-        
-        if abs(comparison["duration_change_seconds"]) > 30:
-            if comparison["duration_change_seconds"] > 0:
-                recommendations.append("⏱️ Build time increased significantly - monitor performance")
-            else:
-                recommendations.append("⚡ Build time improved - upgrade brings performance benefits")
+        test_count_change = comparison["test_changes"].get("test_count_change", 0)
+        facts = SimpleNamespace(
+            success_change=comparison["success_change"],
+            both_succeeded=comparison["after_success"] and not comparison["success_change"],
+            test_count_change=test_count_change,
+            abs_test_count_change=abs(test_count_change),
+            new_errors=bool(comparison["error_changes"]["new_errors"]),
+            resolved_errors=bool(comparison["error_changes"]["resolved_errors"]),
+            duration_change=comparison["duration_change_seconds"]
+        )
+        recommendations = [template.format(c=facts) for applies, template in _RECOMMENDATION_RULES
+                           if applies(facts)]
         
+        # Nothing notable changed, e.g. a build that failed the same way before and after
         if not recommendations:
             recommendations.append("📋 Minimal changes detected - upgrade appears low-risk")
         
         return recommendations
     
-    def _save_upgrade_report(self, report: Dict[str, Any]):
-        """Save comprehensive upgrade test report"""
-        # Convert BuildResult objects to dicts for JSON serialization
-        if isinstance(report["before_upgrade"]["build_result"], BuildResult):
-            report["before_upgrade"]["build_result"] = report["before_upgrade"]["build_result"].__dict__
-        if isinstance(report["after_upgrade"]["build_result"], BuildResult):  
-            report["after_upgrade"]["build_result"] = report["after_upgrade"]["build_result"].__dict__
-        
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
+    def _save_upgrade_report(self, report: Dict[str, Any], verbose: bool = False):
+        """Append the upgrade test report to the NDJSON index and the summary TSV
+        
+        With `verbose`, also keep the pretty-printed per-run JSON and text summary.
+        """
+        before = report["before_upgrade"]["build_result"]
+        after = report["after_upgrade"]["build_result"]
+        
+        # One compact line per run; BuildResult dataclasses are serialized in place
+        report_line = json_dumps(report, default=str) + b"\n"
+        reports_file = self.reports_dir / self.REPORTS_INDEX
+        _append_locked(reports_file, report_line)
+        print(f"\n💾 Upgrade test report appended: {reports_file}")
+        
+        summary_row = (
+            report["test_cycle_timestamp"], report["subproject"], report["target_version"],
+            before.success, after.success, before.duration_seconds, after.duration_seconds,
+            before.error_count, after.error_count
+        )
+        summaries_file = self.reports_dir / self.SUMMARIES_TSV
+        _append_locked(summaries_file, ("\t".join(map(str, summary_row)) + "\n").encode(),
+                       header=("\t".join(SUMMARY_COLUMNS) + "\n").encode())
+        print(f"📄 Summary appended: {summaries_file}")
+        
+        if verbose:
+            self._save_run_files(report)
+    
+    def _save_run_files(self, report: Dict[str, Any]):
+        """Save the pretty-printed per-run JSON report and text summary"""
+        # Reuse the cycle's "%Y-%m-%d %H:%M:%S" stamp as "%Y%m%d_%H%M%S" rather than re-reading the clock
+        timestamp = report["test_cycle_timestamp"].replace("-", "").replace(":", "").replace(" ", "_")
         filename = f"upgrade_test_report_{timestamp}.json"
         
-        report_file = self.project_root / "scripts" / "tests" / filename
-        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file = self.reports_dir / filename
         
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        report_file.write_bytes(json_dumps(report, indent=True, default=str))
         
-        print(f"\n💾 Full upgrade test report saved: {report_file}")
+        print(f"💾 Full upgrade test report saved: {report_file}")
         
         # Also create a summary report
-        summary_file = self.project_root / "scripts" / "tests" / f"upgrade_summary_{timestamp}.txt"
-        with open(summary_file, 'w') as f:
-            f.write(f"Build Detective Upgrade Test Summary\n")
-            f.write(f"{'=' * 50}\n\n")
-            f.write(f"Project: {report['subproject']}\n")
-            f.write(f"Target Version: {report['target_version']}\n")
-            f.write(f"Test Date: {report['test_cycle_timestamp']}\n\n")
-            
-            f.write("Pre-upgrade Status:\n")
-            f.write(f"  Build Success: {report['before_upgrade']['build_result']['success']}\n")
-            f.write(f"  Duration: {report['before_upgrade']['build_result']['duration_seconds']}s\n")
-            f.write(f"  Errors: {len(report['before_upgrade']['build_result']['errors'])}\n\n")
-            
-            f.write("Post-upgrade Status:\n") 
-            f.write(f"  Build Success: {report['after_upgrade']['build_result']['success']}\n")
-            f.write(f"  Duration: {report['after_upgrade']['build_result']['duration_seconds']}s\n")
-            f.write(f"  Errors: {len(report['after_upgrade']['build_result']['errors'])}\n\n")
-            
-            f.write("Recommendations:\n")
-            for rec in report['recommendations']:
-                f.write(f"  • {rec}\n")
+        before = report["before_upgrade"]["build_result"]
+        after = report["after_upgrade"]["build_result"]
+        summary_lines = [
+            "Build Detective Upgrade Test Summary",
+            "=" * 50,
+            "",
+            f"Project: {report['subproject']}",
+            f"Target Version: {report['target_version']}",
+            f"Test Date: {report['test_cycle_timestamp']}",
+            "",
+            "Pre-upgrade Status:",
+            f"  Build Success: {before.success}",
+            f"  Duration: {before.duration_seconds}s",
+            f"  Errors: {before.error_count}",
+            "",
+            "Post-upgrade Status:",
+            f"  Build Success: {after.success}",
+            f"  Duration: {after.duration_seconds}s",
+            f"  Errors: {after.error_count}",
+            "",
+            "Recommendations:",
+            *(f"  • {rec}" for rec in report['recommendations']),
+        ]
+        summary_file = self.reports_dir / f"upgrade_summary_{timestamp}.txt"
+        summary_file.write_text("\n".join(summary_lines) + "\n")
         
         print(f"📄 Summary report saved: {summary_file}")
 
 
 def main():
     """Run upgrade test cycle"""
-    project_root = Path.cwd()
+    # The repository root, wherever the script is invoked from
+    project_root = Path(__file__).resolve().parents[1]
+    
+    # --verbose also keeps the pretty-printed per-run report files
+    verbose = "--verbose" in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != "--verbose"]
     
-    if len(sys.argv) > 1:
-        subproject = sys.argv[1]
+    if len(args) > 0:
+        subproject = args[0]
     else:
         subproject = "VideoRenderer"
     
-    if len(sys.argv) > 2:
-        target_version = sys.argv[2]
+    if len(args) > 1:
+        target_version = args[1]
     else:
         target_version = "1.3.8"
     
@@ -284,7 +518,7 @@ def main():
     print("=" * 60)
     
     runner = UpgradeTestRunner(project_root)
-    report = runner.run_upgrade_test_cycle(subproject, target_version)
+    report = runner.run_upgrade_test_cycle(subproject, target_version, verbose)
     
     # Print executive summary
     print("\n" + "=" * 60)
@@ -300,9 +534,9 @@ def main():
     after = report["after_upgrade"]["build_result"] 
     
     print("Before → After:")
-    print(f"  ✅ Success: {before['success']} → {after['success']}")
-    print(f"  ⏱️ Duration: {before['duration_seconds']}s → {after['duration_seconds']}s")
-    print(f"  🚨 Errors: {len(before['errors'])} → {len(after['errors'])}")
+    print(f"  ✅ Success: {before.success} → {after.success}")
+    print(f"  ⏱️ Duration: {before.duration_seconds}s → {after.duration_seconds}s")
+    print(f"  🚨 Errors: {before.error_count} → {after.error_count}")
     print()
     
     print("🎯 Recommendations:")
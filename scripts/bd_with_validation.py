@@ -3,54 +3,107 @@
 Build Detective with Enhanced Validation
 Combines standard BD analysis with time-based validation and takeover protocol
 """
+import asyncio
+import os
+import re
 import sys
 import subprocess
-from bd_enhanced_analysis import analyze_pr_with_time_detection, cross_validate_bd_results
-from bd_takeover_protocol import should_takeover, takeover_analysis
+import threading
+from collections import deque
+
+# Only the tail of BD's report is kept; confidence is decided while streaming
+BD_OUTPUT_MAX_LINES = 2000
+BD_TIMEOUT_SECONDS = 60
+
+# Report markers in precedence order -> BD confidence, matched in one pass per line
+_BD_MARKER_CONFIDENCE = (('BLOCKING', 3), ('WARNING', 6), ('Found 0 failed checks', 9))
+_BD_MARKER_RE = re.compile('|'.join(re.escape(marker) for marker, _ in _BD_MARKER_CONFIDENCE))
+# BLOCKING outranks everything, and nothing follows "Found 0 failed checks",
+# so either marker settles the verdict; later lines are only kept for display
+_DECISIVE_MARKERS = frozenset({'BLOCKING', 'Found 0 failed checks'})
 
 def run_standard_bd(repo: str, pr_number: str) -> dict:
     """Run the standard BD manual analysis"""
+    cmd = ['uv', 'run', 'python', 'scripts/bd_manual.py', repo, pr_number]
     try:
-        result = subprocess.run([
-            'uv', 'run', 'python', 'scripts/bd_manual.py', repo, pr_number
-        ], capture_output=True, text=True, timeout=60)
-        
-        # Parse BD confidence from output (basic heuristic)
-        bd_confidence = 5  # Default medium confidence
-        
-        if 'BLOCKING' in result.stdout:
-            bd_confidence = 3
-        elif 'WARNING' in result.stdout:
-            bd_confidence = 6
-        elif 'Found 0 failed checks' in result.stdout:
-            bd_confidence = 9
-        
-        return {
-            'output': result.stdout,
-            'confidence': bd_confidence,
-            'success': result.returncode == 0
-        }
+        # Unbuffered so markers arrive as BD prints them, not when its pipe buffer fills
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, bufsize=1, env={**os.environ, 'PYTHONUNBUFFERED': '1'})
     except Exception as e:
         return {
             'output': f'BD Error: {e}',
             'confidence': 1,
             'success': False
         }
+    
+    timed_out = threading.Event()
+    def terminate_on_timeout():
+        timed_out.set()
+        proc.terminate()
+    timer = threading.Timer(BD_TIMEOUT_SECONDS, terminate_on_timeout)
+    timer.start()
+    
+    output = deque(maxlen=BD_OUTPUT_MAX_LINES)
+    seen = set()
+    try:
+        decided = False
+        for line in proc.stdout:
+            output.append(line)
+            if not decided:
+                seen.update(_BD_MARKER_RE.findall(line))
+                decided = bool(seen & _DECISIVE_MARKERS)
+        proc.stdout.close()
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+    
+    if timed_out.is_set():
+        return {
+            'output': f'BD Error: {subprocess.TimeoutExpired(cmd, BD_TIMEOUT_SECONDS)}',
+            'confidence': 1,
+            'success': False
+        }
+    
+    # Parse BD confidence from output (basic heuristic), default medium confidence
+    bd_confidence = next((confidence for marker, confidence in _BD_MARKER_CONFIDENCE
+                          if marker in seen), 5)
+    
+    return {
+        'output': ''.join(output),
+        'confidence': bd_confidence,
+        'success': returncode == 0
+    }
 
-def enhanced_bd_analysis(repo: str, pr_number: str) -> dict:
+async def _standard_bd_with_validation(repo: str, pr_number: str):
+    """Steps 1 and 3: cross-validation needs the standard BD confidence first"""
+    from bd_enhanced_analysis import cross_validate_bd_results
+    
+    bd_result = await asyncio.to_thread(run_standard_bd, repo, pr_number)
+    validation = await asyncio.to_thread(cross_validate_bd_results, repo, pr_number,
+                                         bd_result['confidence'])
+    return bd_result, validation
+
+async def enhanced_bd_analysis(repo: str, pr_number: str) -> dict:
     """Run BD analysis with enhanced validation and takeover protocol"""
+    # Imported on use so usage errors exit without loading the GitHub clients
+    from bd_enhanced_analysis import analyze_pr_with_time_detection
+    from bd_takeover_protocol import should_takeover, takeover_analysis
     
     print("🔍 Running Build Detective with Enhanced Validation")
     print("=" * 60)
     
+    # Steps 1-3 only wait on gh/CI; run step 2 alongside steps 1 -> 3 and report in order
+    (bd_result, validation), enhanced_result = await asyncio.gather(
+        _standard_bd_with_validation(repo, pr_number),
+        asyncio.to_thread(analyze_pr_with_time_detection, repo, pr_number)
+    )
+    
     # Step 1: Run standard BD analysis
     print("📊 Step 1: Standard Build Detective Analysis")
-    bd_result = run_standard_bd(repo, pr_number)
     print(bd_result['output'])
     
     # Step 2: Run enhanced time-based analysis
     print("\n⏱️ Step 2: Enhanced Time-Based Analysis")
-    enhanced_result = analyze_pr_with_time_detection(repo, pr_number)
     
     if enhanced_result.get('critical_issues'):
         print("🚨 CRITICAL ISSUES DETECTED:")
@@ -64,7 +117,6 @@ def enhanced_bd_analysis(repo: str, pr_number: str) -> dict:
     
     # Step 3: Cross-validate BD results
     print(f"\n🔄 Step 3: Cross-Validation")
-    validation = cross_validate_bd_results(repo, pr_number, bd_result['confidence'])
     
     print(f"BD Confidence: {validation['bd_confidence']}/10")
     print(f"Enhanced Confidence: {validation['enhanced_confidence']}/10")
@@ -128,7 +180,7 @@ if __name__ == "__main__":
     repo = sys.argv[1]
     pr_number = sys.argv[2]
     
-    result = enhanced_bd_analysis(repo, pr_number)
+    result = asyncio.run(enhanced_bd_analysis(repo, pr_number))
     
     print(f"\n📋 FINAL SUMMARY")
     print("=" * 30)
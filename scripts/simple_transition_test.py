@@ -8,14 +8,19 @@ import sys
 import json
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+SRC_DIR = Path(__file__).parent.parent / "src"
 
-from server import process_file
-from server import list_files
+def load_server():
+    """Import the MCP server on first use; it pulls in FFmpeg wrappers, MCP and registries"""
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    import server
+    return server
 
 async def test_simple_transition():
     """Test basic transition using MCP server functions directly"""
+    server = load_server()
+    process_file, list_files = server.process_file, server.list_files
     
     print("🧪 Simple Transition Test")
     print("=" * 30)
@@ -36,42 +41,37 @@ async def test_simple_transition():
     
     print(f"Using files: {file1}, {file2}")
     
-    # Test direct crossfade operation
-    try:
-        print("Testing crossfade_transition operation directly...")
-        result = await process_file(
-            input_file_id=file1,
-            operation="crossfade_transition",
-            output_extension="mp4",
-            params=f"second_video={file2} duration=2.0 offset=1.0"
-        )
-        
-        if result.success:
-            print(f"✅ Crossfade test successful: {result.output_file_id}")
-            print(f"   Output size: {result.processing_details.get('output_size_bytes', 'unknown')} bytes")
-        else:
-            print(f"❌ Crossfade test failed: {result.error}")
-            
-    except Exception as e:
-        print(f"❌ Exception during crossfade test: {e}")
+    # Both transitions only wait on their own FFmpeg run; start them together
+    print("Testing crossfade_transition and gradient_wipe operations directly...")
+    crossfade_task = asyncio.create_task(process_file(
+        input_file_id=file1,
+        operation="crossfade_transition",
+        output_extension="mp4",
+        params=f"second_video={file2} duration=2.0 offset=1.0"
+    ))
+    wipe_task = asyncio.create_task(process_file(
+        input_file_id=file1,
+        operation="gradient_wipe",
+        output_extension="mp4", 
+        params=f"second_video={file2} duration=1.5 offset=0.5"
+    ))
+    crossfade_result, wipe_result = await asyncio.gather(crossfade_task, wipe_task,
+                                                         return_exceptions=True)
     
-    # Test gradient wipe
-    try:
-        print("\nTesting gradient_wipe operation directly...")
-        result = await process_file(
-            input_file_id=file1,
-            operation="gradient_wipe",
-            output_extension="mp4", 
-            params=f"second_video={file2} duration=1.5 offset=0.5"
-        )
-        
-        if result.success:
-            print(f"✅ Gradient wipe test successful: {result.output_file_id}")
-        else:
-            print(f"❌ Gradient wipe test failed: {result.error}")
-            
-    except Exception as e:
-        print(f"❌ Exception during gradient wipe test: {e}")
+    if isinstance(crossfade_result, Exception):
+        print(f"❌ Exception during crossfade test: {crossfade_result}")
+    elif crossfade_result.success:
+        print(f"✅ Crossfade test successful: {crossfade_result.output_file_id}")
+        print(f"   Output size: {crossfade_result.processing_details.get('output_size_bytes', 'unknown')} bytes")
+    else:
+        print(f"❌ Crossfade test failed: {crossfade_result.error}")
+    
+    if isinstance(wipe_result, Exception):
+        print(f"❌ Exception during gradient wipe test: {wipe_result}")
+    elif wipe_result.success:
+        print(f"✅ Gradient wipe test successful: {wipe_result.output_file_id}")
+    else:
+        print(f"❌ Gradient wipe test failed: {wipe_result.error}")
 
 if __name__ == "__main__":
     asyncio.run(test_simple_transition())
\ No newline at end of file
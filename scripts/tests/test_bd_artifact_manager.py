@@ -6,30 +6,54 @@ Validates artifact discovery, version comparison, and GitHub integration
 
 import unittest
 import tempfile
+import io
 import json
+import os
+import time
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
 import sys
 
 # Add parent directory to path to import the module
 sys.path.insert(0, str(Path(__file__).parent.parent))
+import bd_artifact_manager
 from bd_artifact_manager import ArtifactManager, Artifact
 
 
 class TestArtifactManager(unittest.TestCase):
     
+    @classmethod
+    def setUpClass(cls):
+        """Share one manager across tests that never touch the filesystem"""
+        # Never created; tests that write files get their own root from _ensure_tmp()
+        cls.project_root = Path(tempfile.gettempdir()) / "bd-artifact-manager-unused"
+        cls.manager = ArtifactManager(cls.project_root)
+    
     def setUp(self):
-        """Set up test environment with temporary directories"""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.project_root = Path(self.temp_dir.name)
-        self.manager = ArtifactManager(self.project_root)
+        """Set up test environment"""
+        self.temp_dir = None
+        # Always exercise the mocked gh calls, never the on-disk version cache
+        env_patcher = patch.dict(os.environ, {"BD_DISABLE_VERSION_CACHE": "1"})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
     
     def tearDown(self):
-        """Clean up temporary directories"""
-        self.temp_dir.cleanup()
+        """Clean up the temporary directory, if the test created one"""
+        if self.temp_dir is not None:
+            self.temp_dir.cleanup()
+    
+    def _ensure_tmp(self):
+        """Give this test a fresh temporary project root and manager on first use"""
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.TemporaryDirectory()
+            self.project_root = Path(self.temp_dir.name)
+            self.manager = ArtifactManager(self.project_root)
     
     def create_test_pom(self, content: str, filename: str = "pom.xml") -> Path:
         """Helper to create test POM files"""
+        self._ensure_tmp()
         pom_path = self.project_root / filename
         pom_path.parent.mkdir(parents=True, exist_ok=True)
         pom_path.write_text(content)
@@ -79,13 +103,13 @@ class TestArtifactManager(unittest.TestCase):
         self.assertEqual(repo["url"], "https://maven.pkg.github.com/StigLau/VideoRenderer")
         
         # Check dependency parsing
-        deps = results["dependencies"]
-        video_renderer = next(d for d in deps if d["artifactId"] == "video-renderer")
+        deps = results["dependencies_by_id"]
+        video_renderer = deps["no.lau.vdvil:video-renderer"]
         self.assertEqual(video_renderer["groupId"], "no.lau.vdvil")
         self.assertEqual(video_renderer["version"], "1.3.8")
         self.assertTrue(video_renderer["is_owned"])
         
-        kompost_core = next(d for d in deps if d["artifactId"] == "kompost-core")
+        kompost_core = deps["no.lau.kompost:kompost-core"]
         self.assertEqual(kompost_core["version"], "0.10.1-SNAPSHOT")
         self.assertTrue(kompost_core["is_owned"])
     
@@ -128,8 +152,15 @@ class TestArtifactManager(unittest.TestCase):
         """Test version key generation for proper sorting"""
         test_cases = [
             ("1.0.0", "1.1.0", True),  # 1.1.0 > 1.0.0
-            ("1.0.0-SNAPSHOT", "1.0.0", False),  # 1.0.0-SNAPSHOT < 1.0.0 (snapshot before release)
+            ("1.0.0-SNAPSHOT", "1.0.0", True),  # 1.0.0-SNAPSHOT < 1.0.0 (snapshot before release)
             ("1.1.0-SNAPSHOT", "1.0.0", False),  # 1.1.0-SNAPSHOT > 1.0.0
+            ("1.0.0-rc1", "1.0.0-SNAPSHOT", True),  # pre-releases before SNAPSHOT
+            ("1.0.0-beta2", "1.0.0-rc1", True),
+            ("1.10.0", "1.9.0", False),  # numeric, not lexicographic
+            ("1.0.20231201", "1.1.0", True),  # date-stamped patch doesn't spill into minor
+            ("1.2.3", "1.2.3.4", True),  # fourth component is numeric, not a qualifier
+            ("1.2.3.4-SNAPSHOT", "1.2.3.4", True),
+            ("1.0.Final", "1.0.1", True),
         ]
         
         for ver1, ver2, ver1_should_be_less in test_cases:
@@ -141,18 +172,21 @@ class TestArtifactManager(unittest.TestCase):
                     self.assertLess(key1, key2)
                 else:
                     self.assertGreater(key1, key2)
+        
+        # Release qualifiers name the release itself
+        self.assertEqual(self.manager._version_key("1.0.Final"), self.manager._version_key("1.0"))
+        # Components that can't be packed take the string-comparison path
+        self.assertIsInstance(self.manager._version_key("1.0.4294967296"), tuple)
+        self.assertIsInstance(self.manager._version_key("1.2.3.4.5"), tuple)
     
     @patch('subprocess.run')
     def test_github_packages_api_call(self, mock_run):
         """Test GitHub Packages API integration"""
         # Mock successful API response
-        mock_response = MagicMock()
-        mock_response.returncode = 0
-        mock_response.stdout = json.dumps([
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=json.dumps([
             {"name": "1.3.8", "created_at": "2024-01-01T10:00:00Z"},
             {"name": "1.3.7", "created_at": "2024-01-01T09:00:00Z"},
-        ])
-        mock_run.return_value = mock_response
+        ]))
         
         artifacts = self.manager.check_github_packages_versions(
             "StigLau/VideoRenderer", "no.lau.vdvil", "video-renderer"
@@ -174,9 +208,7 @@ class TestArtifactManager(unittest.TestCase):
     def test_github_packages_api_failure(self, mock_run):
         """Test handling of GitHub Packages API failures"""
         # Mock failed API response
-        mock_response = MagicMock()
-        mock_response.returncode = 1
-        mock_run.return_value = mock_response
+        mock_run.return_value = SimpleNamespace(returncode=1, stdout="")
         
         artifacts = self.manager.check_github_packages_versions(
             "StigLau/VideoRenderer", "no.lau.vdvil", "video-renderer"
@@ -185,6 +217,70 @@ class TestArtifactManager(unittest.TestCase):
         # Should return empty list on failure
         self.assertEqual(len(artifacts), 0)
     
+    @patch('subprocess.run')
+    def test_github_packages_pagination(self, mock_run):
+        """Test that every page of `gh api --paginate` output is read"""
+        # --paginate concatenates one JSON array per page
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=(
+            json.dumps([{"name": "1.3.8"}, {"name": "1.3.7"}]) + "\n" + json.dumps([{"name": "1.3.6"}])
+        ))
+        
+        artifacts = self.manager.check_github_packages_versions(
+            "StigLau/VideoRenderer", "no.lau.vdvil", "video-renderer"
+        )
+        
+        self.assertEqual([a.version for a in artifacts], ["1.3.8", "1.3.7", "1.3.6"])
+        self.assertIn("--paginate", mock_run.call_args[0][0])
+    
+    @patch('subprocess.run')
+    def test_github_packages_bulk(self, mock_run):
+        """Test bulk lookups are keyed by query and run once per distinct query"""
+        def gh_api(cmd, **kwargs):
+            artifact_id = cmd[-1].split("/")[-2].rsplit(".", 1)[-1]
+            return SimpleNamespace(returncode=0, stdout=json.dumps([{"name": f"{artifact_id}-1.0"}]))
+        mock_run.side_effect = gh_api
+        
+        renderer = ("StigLau/VideoRenderer", "no.lau.vdvil", "video-renderer")
+        common = ("StigLau/vdvil", "no.lau.vdvil", "common")
+        results = self.manager.check_github_packages_versions_bulk([renderer, common, renderer])
+        
+        self.assertEqual(list(results), [renderer, common])
+        self.assertEqual([a.version for a in results[renderer]], ["video-renderer-1.0"])
+        self.assertEqual([a.version for a in results[common]], ["common-1.0"])
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(self.manager.check_github_packages_versions_bulk([]), {})
+    
+    @patch('subprocess.run')
+    def test_github_packages_version_cache(self, mock_run):
+        """Test the on-disk version cache: fresh hits, expiry, and failed lookups"""
+        self._ensure_tmp()
+        cache_file = self.project_root / "cache" / "versions.json"
+        with patch.dict(os.environ, {"BD_DISABLE_VERSION_CACHE": "0"}), \
+                patch.object(bd_artifact_manager, "VERSION_CACHE_FILE", cache_file), \
+                patch.object(bd_artifact_manager, "_version_cache", None):
+            query = ("StigLau/VideoRenderer", "no.lau.vdvil", "video-renderer")
+            mock_run.return_value = SimpleNamespace(returncode=0, stdout=json.dumps([{"name": "1.3.8"}]))
+            
+            # A fresh entry is served without calling gh again
+            self.manager.check_github_packages_versions(*query)
+            cached = self.manager.check_github_packages_versions(*query)
+            self.assertEqual([a.version for a in cached], ["1.3.8"])
+            self.assertEqual(mock_run.call_count, 1)
+            self.assertIn("StigLau/VideoRenderer/no.lau.vdvil/video-renderer", json.loads(cache_file.read_text()))
+            
+            # An entry older than the TTL is fetched again
+            expired = time.time() + bd_artifact_manager.VERSION_CACHE_TTL_SECONDS + 1
+            with patch.object(bd_artifact_manager.time, "time", return_value=expired):
+                self.manager.check_github_packages_versions(*query)
+            self.assertEqual(mock_run.call_count, 2)
+            
+            # A failed lookup is not stored, so the next call retries
+            mock_run.return_value = SimpleNamespace(returncode=1, stdout="")
+            self.manager.check_github_packages_versions("StigLau/vdvil", "no.lau.vdvil", "common")
+            self.manager.check_github_packages_versions("StigLau/vdvil", "no.lau.vdvil", "common")
+            self.assertEqual(mock_run.call_count, 4)
+            self.assertNotIn("StigLau/vdvil/no.lau.vdvil/common", json.loads(cache_file.read_text()))
+    
     def test_recommendations_generation(self):
         """Test recommendation generation logic"""
         test_cases = [
@@ -220,6 +316,24 @@ class TestArtifactManager(unittest.TestCase):
                 for expected_text in case["expected_contains"]:
                     found = any(expected_text in rec for rec in recommendations)
                     self.assertTrue(found, f"Expected '{expected_text}' in recommendations: {recommendations}")
+    
+    def test_m2_index(self):
+        """Test ~/.m2 indexing only counts version directories holding a JAR"""
+        self._ensure_tmp()
+        self.manager.local_m2 = self.project_root / "m2"
+        artifact_dir = self.manager.local_m2 / "no" / "lau" / "vdvil" / "video-renderer"
+        for version, files in (("1.3.7", ["video-renderer-1.3.7.jar"]),
+                               ("1.3.8", ["video-renderer-1.3.8.pom"]),
+                               (".cache", ["video-renderer.jar"])):
+            (artifact_dir / version).mkdir(parents=True)
+            for name in files:
+                (artifact_dir / version / name).touch()
+        
+        index = self.manager.build_m2_index([("no.lau.vdvil", "video-renderer"), ("no.lau", "missing")])
+        
+        self.assertEqual([a.version for a in index[("no.lau.vdvil", "video-renderer")]], ["1.3.7"])
+        self.assertEqual(index[("no.lau", "missing")], [])
+        self.assertEqual(self.manager.scan_local_m2_versions("no.lau.vdvil", "video-renderer")[0].source, "local")
 
 
 class TestBDArtifactManagerIntegration(unittest.TestCase):
@@ -249,7 +363,7 @@ class TestBDArtifactManagerIntegration(unittest.TestCase):
         self.assertGreater(len(owned_deps), 0, "Should find at least some owned dependencies")
         
         # Check that we found VideoRenderer and VDVIL components
-        artifact_ids = [dep["artifactId"] for dep in owned_deps]
+        artifact_ids = {dep["artifactId"] for dep in owned_deps}
         expected_components = ["video-renderer", "ffmpeg", "renderer"]
         
         found_expected = [comp for comp in expected_components if comp in artifact_ids]
@@ -257,22 +371,29 @@ class TestBDArtifactManagerIntegration(unittest.TestCase):
                           f"Should find some expected components: {expected_components}")
 
 
+def run_test_class(test_class) -> tuple:
+    """Run one TestCase class, buffering its report"""
+    stream = io.StringIO()
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return result, stream.getvalue()
+
+
 def main():
     """Run all tests"""
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestArtifactManager))
-    suite.addTests(loader.loadTestsFromTestCase(TestBDArtifactManagerIntegration))
+    # The classes share no state: the unit tests patch subprocess.run and os.environ,
+    # the integration tests only read the project tree. Tests within a class stay
+    # serial since their patches are process-wide.
+    test_classes = [TestArtifactManager, TestBDArtifactManagerIntegration]
+    with ThreadPoolExecutor(max_workers=len(test_classes)) as executor:
+        outcomes = list(executor.map(run_test_class, test_classes))
     
-    # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    # Report in class order
+    for _, report in outcomes:
+        sys.stderr.write(report)
     
     # Return exit code based on test results
-    return 0 if result.wasSuccessful() else 1
+    return 0 if all(result.wasSuccessful() for result, _ in outcomes) else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for Build Detective Build Runner
+Validates the fingerprint build cache without running Maven
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import the module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from bd_build_runner import BuildRunner
+
+
+class TestBuildCache(unittest.TestCase):
+
+    def setUp(self):
+        """Give each test a project with one subproject and its own cache directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.project_root = Path(self.temp_dir.name)
+        self.build_path = self.project_root / "sub"
+        (self.build_path / "src" / "main" / "resources").mkdir(parents=True)
+        (self.build_path / "pom.xml").write_text("<project/>")
+        (self.build_path / "src" / "main" / "resources" / "app.properties").write_text("a=1")
+        self.runner = BuildRunner(self.project_root)
+
+        patcher = patch('bd_build_runner.subprocess.run')
+        self.mock_run = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_run.return_value = SimpleNamespace(returncode=0, stdout="[INFO] BUILD SUCCESS\n", stderr="")
+
+    def build(self, use_cache: bool = True):
+        return self.runner.run_maven_build("sub", ["clean", "package"], use_cache=use_cache)
+
+    def test_unchanged_build_is_a_hit(self):
+        """Test an identical command over an unchanged project skips Maven"""
+        first = self.build()
+        second = self.build()
+
+        self.assertEqual(self.mock_run.call_count, 1)
+        self.assertEqual(second, first)
+
+    def test_cache_is_opt_in(self):
+        """Test builds always run Maven unless the cache is requested"""
+        self.build(use_cache=False)
+        self.build(use_cache=False)
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+    def test_changed_resource_is_a_miss(self):
+        """Test a changed non-source file invalidates the cached result"""
+        self.build()
+        (self.build_path / "src" / "main" / "resources" / "app.properties").write_text("a=22")
+        self.build()
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+    def test_changed_command_is_a_miss(self):
+        """Test a different Maven command over the same project is built again"""
+        self.build()
+        self.runner.run_maven_build("sub", ["clean", "test"], use_cache=True)
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+    def test_changed_snapshot_dependency_is_a_miss(self):
+        """Test a rebuilt SNAPSHOT jar in ~/.m2 invalidates the cached result"""
+        (self.build_path / "pom.xml").write_text(
+            "<project><dependencies><dependency><groupId>no.lau</groupId>"
+            "<artifactId>lib</artifactId><version>1.0-SNAPSHOT</version></dependency></dependencies></project>"
+        )
+        home = self.project_root / "home"
+        jar = home / ".m2" / "repository" / "no" / "lau" / "lib" / "1.0-SNAPSHOT" / "lib-1.0-SNAPSHOT.jar"
+        jar.parent.mkdir(parents=True)
+        jar.write_bytes(b"1")
+
+        with patch.object(Path, "home", return_value=home):
+            self.build()
+            jar.write_bytes(b"22")
+            self.build()
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+    def test_missing_artifact_is_a_miss(self):
+        """Test a cached build whose jar is gone is built again"""
+        jar = self.build_path / "target" / "sub-1.0.jar"
+        jar.parent.mkdir()
+        jar.write_bytes(b"jar")
+        self.mock_run.return_value = SimpleNamespace(
+            returncode=0, stdout=f"[INFO] Building jar: {jar}\n[INFO] BUILD SUCCESS\n", stderr=""
+        )
+
+        self.build()
+        jar.unlink()
+        self.build()
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+    def test_failed_build_is_not_cached(self):
+        """Test only successful builds are stored"""
+        self.mock_run.return_value = SimpleNamespace(returncode=1, stdout="[INFO] BUILD FAILURE\n", stderr="")
+        self.build()
+        self.build()
+
+        self.assertEqual(self.mock_run.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
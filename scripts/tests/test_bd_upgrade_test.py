@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test suite for Build Detective Upgrade Test
+Validates compile verdicts and recommendations without running Maven
+"""
+
+import unittest
+import tempfile
+import io
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import the module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from bd_build_runner import MAX_REPORTED_ERRORS, BuildResult
+from bd_upgrade_test import UpgradeTestRunner
+
+
+def maven_compile_failure(error_total: int) -> str:
+    """Maven output for a failed compile: every javac error, then the failed goal"""
+    lines = ["[ERROR] COMPILATION ERROR : "]
+    lines.extend(f"[ERROR] /src/main/java/a/Foo{i}.java:[{i + 1},5] cannot find symbol"
+                 for i in range(error_total))
+    lines.append("[INFO] BUILD FAILURE")
+    lines.append("[ERROR] Failed to execute goal org.apache.maven.plugins:maven-compiler-plugin:3.8.1:"
+                 "compile (default-compile) on project vr: Compilation failure")
+    return "\n".join(lines) + "\n"
+
+
+def build_result(success: bool, errors=(), tests_run: int = 4) -> BuildResult:
+    """A finished build with the given verdict, errors and test count"""
+    return BuildResult(
+        timestamp="2026-10-17 10:00:00", project_path="sub", build_command="mvn clean test",
+        success=success, duration_seconds=10.0, exit_code=0 if success else 1,
+        stdout_lines=1, stderr_lines=1,
+        test_results={"tests_run": tests_run, "failures": 0, "errors": 0, "skipped": 0},
+        artifact_info={"jars_created": []}, build_hash="h", errors=list(errors), warnings=[],
+        error_count=len(errors)
+    )
+
+
+class TestUpgradeTestRunner(unittest.TestCase):
+
+    def setUp(self):
+        """Give each test its own project root; reports are written beneath it"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.project_root = Path(self.temp_dir.name)
+        (self.project_root / "sub").mkdir()
+        self.runner = UpgradeTestRunner(self.project_root)
+
+    @patch('bd_build_runner.subprocess.run')
+    def test_compile_failure_beyond_reported_errors(self, mock_run):
+        """Test a compile failure is reported even when its goal line is past the error cap"""
+        mock_run.return_value = SimpleNamespace(returncode=1, stdout=maven_compile_failure(15), stderr="")
+        log = io.StringIO()
+
+        result = self.runner._run_comprehensive_test("sub", "before_upgrade", log=log)
+
+        self.assertEqual(len(result.errors), MAX_REPORTED_ERRORS)
+        self.assertGreater(result.error_count, MAX_REPORTED_ERRORS)
+        self.assertTrue(result.compile_failed)
+        self.assertIn("Compile: FAILED", log.getvalue())
+        self.assertRegex(log.getvalue(), r"Compile errors: \d+\+")
+        self.assertNotIn("Tests:", log.getvalue())
+
+    @patch('bd_build_runner.subprocess.run')
+    def test_tests_only_failure_compiles(self, mock_run):
+        """Test a build that fails in tests is not reported as a compile failure"""
+        mock_run.return_value = SimpleNamespace(returncode=1, stderr="", stdout=(
+            "[INFO] Tests run: 4, Failures: 1, Errors: 0, Skipped: 0\n"
+            "[ERROR] Failed to execute goal org.apache.maven.plugins:maven-surefire-plugin:3.0.0:"
+            "test (default-test) on project vr: There are test failures.\n"
+        ))
+        log = io.StringIO()
+
+        result = self.runner._run_comprehensive_test("sub", "before_upgrade", log=log)
+
+        self.assertFalse(result.compile_failed)
+        self.assertIn("Compile: SUCCESS", log.getvalue())
+        self.assertIn("Tests: FAILED", log.getvalue())
+
+    @patch('bd_build_runner.subprocess.run')
+    def test_concurrent_phases_log_to_their_buffers(self, mock_run):
+        """Test every line of a concurrent phase, including the runner's, goes to its own log"""
+        mock_run.return_value = SimpleNamespace(returncode=0, stderr="", stdout=(
+            "[INFO] Tests run: 4, Failures: 0, Errors: 0, Skipped: 0\n[INFO] BUILD SUCCESS\n"
+        ))
+        stdout = io.StringIO()
+
+        with redirect_stdout(stdout):
+            _, _, logs = self.runner._run_phases_concurrently("sub")
+
+        self.assertEqual(stdout.getvalue(), "")
+        for phase, log in logs.items():
+            with self.subTest(phase=phase):
+                self.assertIn("🔨 Running:", log)
+                self.assertIn(f"{UpgradeTestRunner.PHASE_WORKDIR}/{phase}/sub", log)
+                self.assertIn("Tests: SUCCESS", log)
+
+    def test_recommendations(self):
+        """Test recommendations for stable, regressed and unchanged failing upgrades"""
+        stable = "✅ Build stability maintained - upgrade appears safe"
+        changed = "⚠️ Build success status changed - investigate before proceeding"
+        minimal = "📋 Minimal changes detected - upgrade appears low-risk"
+        new_errors = "🚨 New errors detected - upgrade may introduce issues"
+        test_cases = [
+            ("both green", build_result(True), build_result(True), [stable]),
+            ("regressed", build_result(True), build_result(False, ["Some failure in module"]),
+             [changed, new_errors]),
+            ("both failing the same way", build_result(False, ["Same old failure"]),
+             build_result(False, ["Same old failure"]), [minimal]),
+            ("green with more tests", build_result(True), build_result(True, tests_run=6),
+             [stable, "📈 2 additional tests - good test coverage"]),
+        ]
+
+        for name, before, after, expected in test_cases:
+            with self.subTest(case=name):
+                comparison = self.runner.build_runner.compare_build_results(before, after)
+                self.assertEqual(self.runner._generate_recommendations(comparison, {}), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,13 +5,15 @@ Validates transition outputs and generates examples with visual comparison
 """
 
 import asyncio
+import os
 import sys
 import json
-import subprocess
 from pathlib import Path
 from typing import Dict, List, Any
 import time
 
+from bd_json import json_dumps
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
@@ -25,6 +27,10 @@ except ImportError as e:
     print("Make sure you're running from the project root directory")
     sys.exit(1)
 
+def _write_json(path: Path, data: Any):
+    """Write pretty-printed JSON in a single write"""
+    path.write_bytes(json_dumps(data, indent=True))
+
 class TransitionVerifier:
     """Verifies transition effects with visual and technical validation"""
     
@@ -40,6 +46,12 @@ class TransitionVerifier:
         # Source files (check availability)
         self.source_dir = Path("/tmp/music/source")
         self.available_sources = self._check_available_sources()
+        # Komposition source URLs name files relative to the source directory
+        self._source_urls = [f"file://{filename}" for filename in self.available_sources]
+        
+        # Transitions are verified concurrently; ffmpeg is CPU-bound, so only let
+        # about half the cores' worth of them render at once
+        self._render_slots = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
         
     def _check_available_sources(self) -> List[str]:
         """Check which source files are available for testing"""
@@ -78,8 +90,8 @@ class TransitionVerifier:
             "bpm": 120,
             "effects_schema_version": "1.0",
             "sources": [
-                {"id": "video1", "url": f"file://{self.available_sources[0]}"},
-                {"id": "video2", "url": f"file://{self.available_sources[1]}"}
+                {"id": "video1", "url": self._source_urls[0]},
+                {"id": "video2", "url": self._source_urls[1]}
             ],
             "segments": [
                 {
@@ -108,8 +120,14 @@ class TransitionVerifier:
             }
         }
     
-    async def verify_transition(self, transition_type: str, params: Dict = None) -> Dict[str, Any]:
-        """Verify a specific transition type with given parameters"""
+    async def verify_transition(self, transition_type: str, params: Dict = None,
+                                file_stem: str = None) -> Dict[str, Any]:
+        """Verify a specific transition type with given parameters
+        
+        Output files are named after `file_stem` (default: the transition type); give
+        concurrent runs of the same transition distinct stems.
+        """
+        file_stem = file_stem or transition_type
         
         print(f"🧪 Testing {transition_type}...")
         
@@ -121,14 +139,14 @@ class TransitionVerifier:
             )
             
             # Save komposition for reference
-            komposition_file = self.output_dir / f"{transition_type}_test.json"
-            with open(komposition_file, 'w') as f:
-                json.dump(komposition, f, indent=2)
+            komposition_file = self.output_dir / f"{file_stem}_test.json"
+            _write_json(komposition_file, komposition)
             
             # Process transition
-            start_time = time.time()
-            result = await self.transition_processor.process_effects_tree(komposition)
-            processing_time = time.time() - start_time
+            async with self._render_slots:
+                start_time = time.time()
+                result = await self.transition_processor.process_effects_tree(komposition)
+                processing_time = time.time() - start_time
             
             if not result.get("success"):
                 return {
@@ -157,7 +175,7 @@ class TransitionVerifier:
             metadata = await self._get_video_metadata(output_path)
             
             # Copy to verification output directory with descriptive name
-            verification_output = self.output_dir / f"{transition_type}_verified.mp4"
+            verification_output = self.output_dir / f"{file_stem}_verified.mp4"
             output_path.rename(verification_output)
             
             return {
@@ -183,26 +201,41 @@ class TransitionVerifier:
     async def _get_video_metadata(self, video_path: Path) -> Dict[str, Any]:
         """Get video metadata using ffprobe"""
         try:
+            # Only ask for the fields read below instead of every format/stream property
             cmd = [
                 "ffprobe", "-v", "quiet", "-print_format", "json", 
-                "-show_format", "-show_streams", str(video_path)
+                "-show_entries",
+                "format=duration:stream=codec_type,codec_name,width,height,r_frame_rate,sample_rate",
+                str(video_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                metadata = json.loads(result.stdout)
+            # Probe without blocking the event loop other transitions are running on
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+            if process.returncode == 0:
+                metadata = json.loads(stdout.decode())
                 
                 # Extract key info
                 video_stream = next((s for s in metadata["streams"] if s["codec_type"] == "video"), None)
                 audio_stream = next((s for s in metadata["streams"] if s["codec_type"] == "audio"), None)
                 
+                # r_frame_rate is a fraction such as "30000/1001"; divide it rather than eval() it
+                fps = None
+                if video_stream:
+                    num, _, den = video_stream["r_frame_rate"].partition("/")
+                    fps = int(num) / int(den) if den else float(num)
+                
                 return {
                     "duration": float(metadata["format"]["duration"]),
                     "video": {
                         "width": video_stream["width"] if video_stream else None,
                         "height": video_stream["height"] if video_stream else None,
                         "codec": video_stream["codec_name"] if video_stream else None,
-                        "fps": eval(video_stream["r_frame_rate"]) if video_stream else None
+                        "fps": fps
                     } if video_stream else None,
                     "audio": {
                         "codec": audio_stream["codec_name"] if audio_stream else None,
@@ -210,7 +243,7 @@ class TransitionVerifier:
                     } if audio_stream else None
                 }
             else:
-                return {"error": "ffprobe failed", "stderr": result.stderr}
+                return {"error": "ffprobe failed", "stderr": stderr.decode(errors="replace")}
                 
         except Exception as e:
             return {"error": str(e)}
@@ -253,15 +286,18 @@ class TransitionVerifier:
             }
         ]
         
-        results = []
+        async def run_config(index: int, config: Dict[str, Any]):
+            # Two configs test crossfade_transition; number the files so they don't overwrite
+            file_stem = f"{index}_{config['transition_type']}"
+            return config, await self.verify_transition(config["transition_type"], config["params"], file_stem)
         
-        for config in test_configs:
-            print(f"Testing: {config['description']}")
-            result = await self.verify_transition(
-                config["transition_type"],
-                config["params"]
-            )
-            results.append(result)
+        # The configs are independent; run them together and report each as it finishes
+        tasks = [asyncio.create_task(run_config(index, config))
+                 for index, config in enumerate(test_configs, start=1)]
+        
+        for finished in asyncio.as_completed(tasks):
+            config, result = await finished
+            print(f"Finished: {config['description']}")
             
             if result["success"]:
                 print(f"  ✅ Success - {result['file_size_mb']}MB, {result['processing_time_seconds']}s")
@@ -272,6 +308,9 @@ class TransitionVerifier:
                 print(f"  ❌ Failed - {result['error']}")
             print()
         
+        # Keep the report in configuration order
+        results = [task.result()[1] for task in tasks]
+        
         # Generate summary report
         successful_tests = [r for r in results if r["success"]]
         failed_tests = [r for r in results if not r["success"]]
@@ -288,8 +327,7 @@ class TransitionVerifier:
         
         # Save summary report
         report_file = self.output_dir / "verification_report.json"
-        with open(report_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        _write_json(report_file, summary)
         
         print("📊 VERIFICATION SUMMARY")
         print("=" * 30)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Numeric scoring kernels for AI Context Enhancement
+
+Complexity and similarity scoring reduced to plain numbers so they can be
+compiled with Numba. Categorical fields arrive as small integer ids; the
+factor tables below are indexed by them.
+"""
+
+from types import MappingProxyType
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Optional dependency, falls back to running the kernels as plain Python
+
+def _kernel(func):
+    """Compile func with Numba when it is installed"""
+    return njit(cache=True)(func) if njit is not None else func
+
+# Motion level id (MotionLevel value) -> complexity factor: low, medium, high, unknown
+_MOTION_FACTORS = (0.2, 1.0, 2.0, 0.5)
+
+# Target operation id -> complexity multiplier; anything else is OPERATION_OTHER
+OPERATION_IDS = MappingProxyType({
+    "concat": 0,
+    "segment": 1,
+    "transcode": 2,
+    "normalize": 3,
+    "crossfade": 4,
+    "stabilize": 5,
+    "denoise": 6
+})
+OPERATION_OTHER = len(OPERATION_IDS)
+_OPERATION_FACTORS = (1.0, 0.8, 2.0, 1.5, 1.8, 3.0, 2.5, 1.0)
+
+@_kernel
+def complexity_level(duration, width, height, bitrate, motion_id, operation_id):
+    """Complexity level index, TRIVIAL (0) to EXTREME (4)"""
+    score = 0.0
+    
+    # Duration factor
+    if duration > 300:
+        score += 2.0
+    elif duration > 120:
+        score += 1.0
+    elif duration > 30:
+        score += 0.5
+    
+    # Resolution factor
+    pixels = width * height
+    if pixels > 3840 * 2160:
+        score += 3.0
+    elif pixels > 1920 * 1080:
+        score += 2.0
+    elif pixels > 1280 * 720:
+        score += 1.0
+    
+    # Bitrate factor
+    if bitrate > 20000000:
+        score += 2.0
+    elif bitrate > 10000000:
+        score += 1.0
+    elif bitrate > 5000000:
+        score += 0.5
+    
+    score += _MOTION_FACTORS[motion_id]
+    score *= _OPERATION_FACTORS[operation_id]
+    
+    if score < 1.0:
+        return 0
+    elif score < 3.0:
+        return 1
+    elif score < 6.0:
+        return 2
+    elif score < 10.0:
+        return 3
+    return 4
+
+@_kernel
+def _relative_similarity(a, b):
+    """1 for equal values down to 0 for values a whole magnitude apart"""
+    return 1.0 - min(abs(a - b) / max(a, b), 1.0)
+
+@_kernel
+def similarity(d1, p1, b1, c1, m1, s1, d2, p2, b2, c2, m2, s2):
+    """Weighted similarity of two videos' duration, pixels, bitrate, codec, motion and size"""
+    score = 0.0
+    total_weight = 0.0
+    
+    if max(d1, d2) > 0:
+        score += _relative_similarity(d1, d2) * 0.3
+        total_weight += 0.3
+    
+    if max(p1, p2) > 0:
+        score += _relative_similarity(p1, p2) * 0.2
+        total_weight += 0.2
+    
+    if max(b1, b2) > 0:
+        score += _relative_similarity(b1, b2) * 0.15
+        total_weight += 0.15
+    
+    score += (1.0 if c1 == c2 else 0.5) * 0.1
+    total_weight += 0.1
+    
+    score += (1.0 if m1 == m2 else 0.3) * 0.15
+    total_weight += 0.15
+    
+    if max(s1, s2) > 0:
+        score += _relative_similarity(s1, s2) * 0.1
+        total_weight += 0.1
+    
+    return score / total_weight
@@ -15,14 +15,36 @@ Key Features:
 """
 
 import asyncio
+import heapq
 import json
 import logging
+import os
+import struct
 import time
+from collections import OrderedDict, deque
+from itertools import count
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, asdict
-from enum import Enum
+from enum import Enum, IntEnum, IntFlag
 from datetime import datetime, timedelta
+from functools import cached_property, wraps
+
+try:
+    from orjson import loads as json_loads  # Decodes ffprobe's bytes output directly
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Optional dependency, falls back to scoring history one record at a time
+
+try:
+    from . import _numba_kernels as kernels
+except ImportError:
+    import _numba_kernels as kernels
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +64,21 @@ class ToolRecommendation(Enum):
     NORMALIZE_FIRST = "normalize_first"
     SEGMENT_PROCESS = "segment_process"
 
-@dataclass
+class MotionLevel(IntEnum):
+    """Estimated amount of motion in a video"""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    UNKNOWN = 3
+
+class ColorComplexity(IntEnum):
+    """Estimated color complexity of a video"""
+    SIMPLE = 0
+    MODERATE = 1
+    COMPLEX = 2
+    UNKNOWN = 3
+
+@dataclass(slots=True, frozen=True)
 class VideoCharacteristics:
     """Detailed video characteristics for AI context"""
     duration: float
@@ -52,9 +88,25 @@ class VideoCharacteristics:
     frame_rate: float
     has_audio: bool
     estimated_keyframes: int
-    motion_level: str  # "low", "medium", "high"
-    color_complexity: str  # "simple", "moderate", "complex"
+    motion_level: MotionLevel
+    color_complexity: ColorComplexity
     file_size_mb: float
+    
+    def __post_init__(self):
+        # Accept the level names ("medium") older callers and history files use
+        if not isinstance(self.motion_level, MotionLevel):
+            object.__setattr__(self, 'motion_level', _enum_level(MotionLevel, self.motion_level))
+        if not isinstance(self.color_complexity, ColorComplexity):
+            object.__setattr__(self, 'color_complexity', _enum_level(ColorComplexity, self.color_complexity))
+
+def _enum_level(enum_type, value):
+    """Enum member for a level name or value, UNKNOWN when unrecognized"""
+    if isinstance(value, str):
+        return enum_type.__members__.get(value.upper(), enum_type.UNKNOWN)
+    try:
+        return enum_type(value)
+    except ValueError:
+        return enum_type.UNKNOWN
 
 @dataclass
 class ProcessingHistory:
@@ -69,6 +121,29 @@ class ProcessingHistory:
     timestamp: datetime
     error_message: Optional[str] = None
 
+class RiskFlag(IntFlag):
+    """Risk factors a tool recommendation can carry"""
+    LONG_DURATION = 1
+    LARGE_FILE = 2
+    UNCOMMON_CODEC = 4
+    FEW_KEYFRAMES = 8
+    NO_AUDIO = 16
+    NORMALIZATION_TIME = 32
+    NORMALIZATION_QUALITY = 64
+    LARGE_FILE_NORMALIZATION = 128
+
+# Risk flag -> description, in the order risk_factors lists them
+_RISK_MESSAGES = (
+    (RiskFlag.LONG_DURATION, "Long duration may cause timeout issues"),
+    (RiskFlag.LARGE_FILE, "Large file size may cause memory issues"),
+    (RiskFlag.UNCOMMON_CODEC, "Uncommon codec {codec} may cause compatibility issues"),
+    (RiskFlag.FEW_KEYFRAMES, "Few keyframes may limit alignment options"),
+    (RiskFlag.NO_AUDIO, "No audio track - crossfade benefits limited to video only"),
+    (RiskFlag.NORMALIZATION_TIME, "Normalization adds significant processing time"),
+    (RiskFlag.NORMALIZATION_QUALITY, "May reduce output quality if source is already optimized"),
+    (RiskFlag.LARGE_FILE_NORMALIZATION, "Large file size will significantly increase processing time"),
+)
+
 @dataclass
 class ContextualRecommendation:
     """AI-enhanced tool recommendation with rich context"""
@@ -80,9 +155,16 @@ class ContextualRecommendation:
     expected_memory_mb: float
     cost_estimate: float
     quality_expectation: float
-    risk_factors: List[str]
+    risk_flags: RiskFlag
     optimization_tips: List[str]
     fallback_options: List[ToolRecommendation]
+    video_codec: str = ""  # Named in the UNCOMMON_CODEC description
+    
+    @cached_property
+    def risk_factors(self) -> List[str]:
+        """Risk descriptions, built from risk_flags the first time they are read"""
+        return [message.format(codec=self.video_codec)
+                for flag, message in _RISK_MESSAGES if flag in self.risk_flags]
 
 @dataclass
 class AIContext:
@@ -96,6 +178,283 @@ class AIContext:
     contextual_warnings: List[str]
     optimization_opportunities: List[str]
 
+@dataclass(frozen=True)
+class _ProbeResult:
+    """The ffprobe fields video analysis is derived from"""
+    duration: float
+    width: int
+    height: int
+    bitrate: int
+    codec: str
+    frame_rate: float
+    has_audio: bool
+
+# ISO base media containers whose moov atom is read directly instead of spawning ffprobe
+MP4_SUFFIXES = frozenset({'.mp4', '.m4v', '.mov'})
+# A moov larger than this (hours of footage) is left to ffprobe rather than read into memory
+MP4_MAX_MOOV_BYTES = 16 * 1024 * 1024
+
+# Sample entry fourcc -> the codec_name ffprobe reports for it
+_MP4_CODEC_NAMES = {
+    b'avc1': 'h264', b'avc3': 'h264',
+    b'hvc1': 'hevc', b'hev1': 'hevc',
+    b'vp08': 'vp8', b'vp09': 'vp9',
+    b'av01': 'av1', b'mp4v': 'mpeg4',
+}
+
+def _iter_mp4_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """Yield (type, payload_start, box_end) for the boxes in data[start:end]"""
+    end = len(data) if end is None else end
+    while start + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, start)
+        header = 8
+        if size == 1:
+            if start + 16 > end:
+                return
+            size = struct.unpack_from('>Q', data, start + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header or start + size > end:
+            return
+        yield box_type, start + header, start + size
+        start += size
+
+def _find_mp4_box(data: bytes, path: Tuple[bytes, ...], start: int = 0, end: Optional[int] = None):
+    """Return (payload_start, box_end) of the first box along the given type path"""
+    for box_type, payload, box_end in _iter_mp4_boxes(data, start, end):
+        if box_type == path[0]:
+            return (payload, box_end) if len(path) == 1 else _find_mp4_box(data, path[1:], payload, box_end)
+    return None
+
+def _read_mp4_moov(path_str: str) -> Optional[bytes]:
+    """Read the moov box, walking top-level box headers wherever it sits in the file"""
+    with open(path_str, 'rb') as f:
+        offset = 0
+        while True:
+            f.seek(offset)
+            header = f.read(16)
+            if len(header) < 8:
+                return None
+            size, box_type = struct.unpack_from('>I4s', header)
+            header_size = 8
+            if size == 1:
+                if len(header) < 16:
+                    return None
+                size = struct.unpack_from('>Q', header, 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = f.seek(0, 2) - offset
+            if size < header_size:
+                return None
+            if box_type == b'moov':
+                if size > MP4_MAX_MOOV_BYTES:
+                    return None
+                f.seek(offset + header_size)
+                return f.read(size - header_size)
+            offset += size
+
+def _probe_mp4_atoms(path_str: str, size: int) -> Optional[_ProbeResult]:
+    """
+    Read duration, resolution, codec, frame rate and audio presence from an MP4/MOV moov atom.
+    
+    Returns None whenever something needed is missing (fragmented files, no video track,
+    unknown layout) so the caller falls back to ffprobe.
+    """
+    try:
+        moov = _read_mp4_moov(path_str)
+        if moov is None:
+            return None
+        
+        mvhd = _find_mp4_box(moov, (b'mvhd',))
+        if mvhd is None:
+            return None
+        version = moov[mvhd[0]]
+        if version == 1:
+            timescale, movie_duration = struct.unpack_from('>IQ', moov, mvhd[0] + 20)
+        else:
+            timescale, movie_duration = struct.unpack_from('>II', moov, mvhd[0] + 12)
+        if not timescale or not movie_duration:
+            return None
+        duration = movie_duration / timescale
+        
+        video = None
+        has_audio = False
+        for box_type, trak, trak_end in _iter_mp4_boxes(moov):
+            if box_type != b'trak':
+                continue
+            hdlr = _find_mp4_box(moov, (b'mdia', b'hdlr'), trak, trak_end)
+            handler = moov[hdlr[0] + 8:hdlr[0] + 12] if hdlr else b''
+            if handler == b'soun':
+                has_audio = True
+            elif handler == b'vide' and video is None:
+                video = (trak, trak_end)
+        if video is None:
+            return None
+        trak, trak_end = video
+        
+        # tkhd ends with width/height as 16.16 fixed point
+        tkhd = _find_mp4_box(moov, (b'tkhd',), trak, trak_end)
+        mdhd = _find_mp4_box(moov, (b'mdia', b'mdhd'), trak, trak_end)
+        stbl = _find_mp4_box(moov, (b'mdia', b'minf', b'stbl'), trak, trak_end)
+        if tkhd is None or mdhd is None or stbl is None:
+            return None
+        width, height = struct.unpack_from('>II', moov, tkhd[1] - 8)
+        
+        media_timescale = struct.unpack_from('>I', moov, mdhd[0] + (20 if moov[mdhd[0]] == 1 else 12))[0]
+        
+        stsd = _find_mp4_box(moov, (b'stsd',), *stbl)
+        if stsd is None:
+            return None
+        sample_entry = moov[stsd[0] + 12:stsd[0] + 16]
+        
+        # Frame rate from the sample durations: samples / media seconds
+        frame_rate = 0.0
+        stts = _find_mp4_box(moov, (b'stts',), *stbl)
+        if stts is not None and media_timescale:
+            entry_count = struct.unpack_from('>I', moov, stts[0] + 4)[0]
+            entries = struct.unpack_from(f'>{2 * entry_count}I', moov, stts[0] + 8)
+            samples = sum(entries[0::2])
+            ticks = sum(count * delta for count, delta in zip(entries[0::2], entries[1::2]))
+            if ticks:
+                frame_rate = samples * media_timescale / ticks
+        
+        return _ProbeResult(
+            duration=duration,
+            width=width >> 16,
+            height=height >> 16,
+            # What ffprobe reports as the container bit_rate
+            bitrate=int(size * 8 / duration),
+            codec=_MP4_CODEC_NAMES.get(sample_entry, sample_entry.decode('latin-1').strip()),
+            frame_rate=frame_rate,
+            has_audio=has_audio
+        )
+    except (OSError, struct.error, IndexError):
+        return None
+
+# Probe results by (resolved path, st_mtime_ns, st_size), least recently used first
+PROBE_CACHE_SIZE = 512
+FFPROBE_TIMEOUT_SECONDS = 15
+_probe_cache: "OrderedDict[Tuple[str, int, int], _ProbeResult]" = OrderedDict()
+
+def _clear_probe_cache():
+    """Forget every cached probe result"""
+    _probe_cache.clear()
+
+async def _probe_cached(path_str: str, mtime_ns: int, size: int,
+                        probe_slots: asyncio.Semaphore) -> _ProbeResult:
+    """
+    Probe a video file.
+    
+    mtime_ns and size only key the cache, so a modified file is probed again.
+    Failed probes raise and are not cached. Tests reset it with _clear_probe_cache().
+    MP4/MOV files are read straight from their moov atom when possible; ffprobe
+    runs only while holding one of probe_slots.
+    """
+    key = (path_str, mtime_ns, size)
+    probe = _probe_cache.get(key)
+    if probe is not None:
+        _probe_cache.move_to_end(key)
+        return probe
+    
+    if Path(path_str).suffix.lower() in MP4_SUFFIXES:
+        probe = await asyncio.to_thread(_probe_mp4_atoms, path_str, size)
+    if probe is None:
+        async with probe_slots:
+            probe = await _run_ffprobe(path_str)
+    
+    _probe_cache[key] = probe
+    if len(_probe_cache) > PROBE_CACHE_SIZE:
+        _probe_cache.popitem(last=False)
+    return probe
+
+async def _run_ffprobe(path_str: str) -> _ProbeResult:
+    """Run ffprobe without blocking the event loop, so probes of several files overlap"""
+    
+    # Only the fields read below; every stream is kept since audio presence is one of them
+    cmd = ['ffprobe', '-v', 'quiet', '-threads', '0', '-print_format', 'json',
+           '-show_entries', 'format=duration,bit_rate:stream=codec_type,codec_name,width,height,r_frame_rate',
+           path_str]
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), FFPROBE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    if process.returncode != 0:
+        raise RuntimeError(f"ffprobe exited with status {process.returncode}")
+    
+    data = json_loads(stdout)
+    format_info = data.get('format', {})
+    video_stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), {})
+    has_audio = any(s.get('codec_type') == 'audio' for s in data.get('streams', []))
+    
+    # Calculate frame rate
+    r_frame_rate = video_stream.get('r_frame_rate', '0/1')
+    if '/' in r_frame_rate:
+        num, den = map(int, r_frame_rate.split('/'))
+        frame_rate = num / den if den != 0 else 0.0
+    else:
+        frame_rate = float(r_frame_rate)
+    
+    return _ProbeResult(
+        duration=float(format_info.get('duration', 0)),
+        width=int(video_stream.get('width', 0)),
+        height=int(video_stream.get('height', 0)),
+        bitrate=int(format_info.get('bit_rate', 0)),
+        codec=video_stream.get('codec_name', 'unknown'),
+        frame_rate=frame_rate,
+        has_audio=has_audio
+    )
+
+# Recommendations kept per enhancer, least recently used first
+EVALUATION_CACHE_SIZE = 1024
+
+def _evaluation_key_part(value):
+    """Hashable stand-in for an evaluator argument"""
+    if isinstance(value, list):
+        # Evaluators only read each historical record's tool name and outcome
+        return tuple((record.tool_name, record.success) for record in value)
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return value
+
+def _memoized_evaluation(evaluate):
+    """Reuse an _evaluate_* result when it is called again with equivalent inputs"""
+    
+    @wraps(evaluate)
+    def wrapper(self, *args):
+        key = (evaluate.__name__,) + tuple(_evaluation_key_part(arg) for arg in args)
+        cache = self._evaluation_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        recommendation = cache[key] = evaluate(self, *args)
+        if len(cache) > EVALUATION_CACHE_SIZE:
+            cache.popitem(last=False)
+        return recommendation
+    return wrapper
+
+# Indexed by the complexity level kernels.complexity_level returns
+_COMPLEXITY_LEVELS = tuple(ProcessingComplexity)
+
+# Success/efficiency penalty applied to performance predictions per complexity level
+_COMPLEXITY_PENALTIES = MappingProxyType({
+    ProcessingComplexity.TRIVIAL: 0.0,
+    ProcessingComplexity.SIMPLE: 0.05,
+    ProcessingComplexity.MODERATE: 0.1,
+    ProcessingComplexity.COMPLEX: 0.15,
+    ProcessingComplexity.EXTREME: 0.25
+})
+
+# Parallel per-record columns kept alongside each tool's history
+_HISTORY_COLUMNS = ('duration', 'pixels', 'bitrate', 'codec', 'motion', 'size')
+_CATEGORY_COLUMNS = frozenset({'codec', 'motion'})
+
 class AIContextEnhancer:
     """
     AI Context Enhancement system that provides rich contextual information
@@ -104,12 +463,30 @@ class AIContextEnhancer:
     
     def __init__(self, history_retention_days: int = 30):
         self.history_retention_days = history_retention_days
-        self.processing_history: List[ProcessingHistory] = []
+        # Records by insertion sequence, with a heap of (timestamp, sequence) to expire the oldest
+        self._history_records: Dict[int, ProcessingHistory] = {}
+        self._history_expiry: List[Tuple[datetime, int]] = []
+        self._history_sequence = count()
+        # processing_history split per tool, oldest first, so lookups only scan one tool's records
+        self._history_by_tool: Dict[str, deque] = {}
+        # Structure-of-arrays view of each tool's history for vectorized similarity scoring
+        self._history_columns: Dict[str, Dict[str, deque]] = {}
+        self._history_soa: Dict[str, Dict[str, Any]] = {}
+        self._category_ids: Dict[str, Dict[str, int]] = {'codec': {}}
+        # _evaluate_* results by evaluator and inputs; VideoCharacteristics is frozen, so hashable
+        self._evaluation_cache: "OrderedDict[Tuple, Optional[ContextualRecommendation]]" = OrderedDict()
+        # ffprobe is CPU-bound; concurrent analyses start at most one probe per core
+        self._probe_slots = asyncio.Semaphore(os.cpu_count() or 4)
         self.performance_baselines = self._initialize_performance_baselines()
         
         # Load historical data if available
         self._load_processing_history()
     
+    @property
+    def processing_history(self) -> List[ProcessingHistory]:
+        """Retained processing records, oldest first"""
+        return list(self._history_records.values())
+    
     async def generate_ai_context(self, 
                                 video_path: Union[str, Path],
                                 target_operation: str,
@@ -181,7 +558,10 @@ class AIContextEnhancer:
         
         video_path = Path(video_path)
         
-        if not video_path.exists():
+        # One stat answers existence, size and the probe cache key
+        try:
+            stat = os.stat(video_path)
+        except OSError:
             return VideoCharacteristics(
                 duration=0.0,
                 resolution=(0, 0),
@@ -190,36 +570,22 @@ class AIContextEnhancer:
                 frame_rate=0.0,
                 has_audio=False,
                 estimated_keyframes=0,
-                motion_level="unknown",
-                color_complexity="unknown", 
+                motion_level=MotionLevel.UNKNOWN,
+                color_complexity=ColorComplexity.UNKNOWN,
                 file_size_mb=0.0
             )
+        file_size_mb = stat.st_size / 1024 / 1024
         
         try:
-            # Get comprehensive video info using ffprobe
-            import subprocess
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json',
-                   '-show_format', '-show_streams', str(video_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=15)
-            
-            data = json.loads(result.stdout)
-            format_info = data.get('format', {})
-            video_stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), {})
-            audio_streams = [s for s in data.get('streams', []) if s.get('codec_type') == 'audio']
-            
-            duration = float(format_info.get('duration', 0))
-            width = int(video_stream.get('width', 0))
-            height = int(video_stream.get('height', 0))
-            bitrate = int(format_info.get('bit_rate', 0))
-            codec = video_stream.get('codec_name', 'unknown')
-            
-            # Calculate frame rate
-            r_frame_rate = video_stream.get('r_frame_rate', '0/1')
-            if '/' in r_frame_rate:
-                num, den = map(int, r_frame_rate.split('/'))
-                frame_rate = num / den if den != 0 else 0.0
-            else:
-                frame_rate = float(r_frame_rate)
+            # Re-probe only when the file changed; repeat analyses of one video are cache hits
+            probe = await _probe_cached(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size,
+                                        self._probe_slots)
+            duration = probe.duration
+            width = probe.width
+            height = probe.height
+            bitrate = probe.bitrate
+            codec = probe.codec
+            frame_rate = probe.frame_rate
             
             # Estimate keyframes (typically every 2-10 seconds depending on codec)
             keyframe_interval = 5.0  # Conservative estimate
@@ -230,23 +596,21 @@ class AIContextEnhancer:
             if pixels_per_second > 0:
                 bitrate_per_pixel = bitrate / pixels_per_second
                 if bitrate_per_pixel > 0.1:
-                    motion_level = "high"
+                    motion_level = MotionLevel.HIGH
                 elif bitrate_per_pixel > 0.05:
-                    motion_level = "medium" 
+                    motion_level = MotionLevel.MEDIUM
                 else:
-                    motion_level = "low"
+                    motion_level = MotionLevel.LOW
             else:
-                motion_level = "unknown"
+                motion_level = MotionLevel.UNKNOWN
             
             # Assess color complexity based on codec and bitrate
             if codec in ['h264', 'h265'] and bitrate > 5000000:
-                color_complexity = "complex"
+                color_complexity = ColorComplexity.COMPLEX
             elif bitrate > 2000000:
-                color_complexity = "moderate"
+                color_complexity = ColorComplexity.MODERATE
             else:
-                color_complexity = "simple"
-            
-            file_size_mb = video_path.stat().st_size / 1024 / 1024
+                color_complexity = ColorComplexity.SIMPLE
             
             return VideoCharacteristics(
                 duration=duration,
@@ -254,7 +618,7 @@ class AIContextEnhancer:
                 bitrate=bitrate,
                 codec=codec,
                 frame_rate=frame_rate,
-                has_audio=len(audio_streams) > 0,
+                has_audio=probe.has_audio,
                 estimated_keyframes=estimated_keyframes,
                 motion_level=motion_level,
                 color_complexity=color_complexity,
@@ -265,8 +629,6 @@ class AIContextEnhancer:
             logger.error(f"❌ Video analysis failed for {video_path}: {e}")
             
             # Return basic file info as fallback
-            file_size_mb = video_path.stat().st_size / 1024 / 1024 if video_path.exists() else 0.0
-            
             return VideoCharacteristics(
                 duration=0.0,
                 resolution=(0, 0),
@@ -275,8 +637,8 @@ class AIContextEnhancer:
                 frame_rate=0.0,
                 has_audio=False,
                 estimated_keyframes=0,
-                motion_level="unknown",
-                color_complexity="unknown",
+                motion_level=MotionLevel.UNKNOWN,
+                color_complexity=ColorComplexity.UNKNOWN,
                 file_size_mb=file_size_mb
             )
     
@@ -285,61 +647,13 @@ class AIContextEnhancer:
                                     target_operation: str) -> ProcessingComplexity:
         """Assess the processing complexity level for AI context"""
         
-        complexity_score = 0.0
-        
-        # Duration factor
-        if video_analysis.duration > 300:  # > 5 minutes
-            complexity_score += 2.0
-        elif video_analysis.duration > 120:  # > 2 minutes
-            complexity_score += 1.0
-        elif video_analysis.duration > 30:  # > 30 seconds
-            complexity_score += 0.5
-        
-        # Resolution factor
         width, height = video_analysis.resolution
-        pixels = width * height
-        if pixels > 3840 * 2160:  # 4K+
-            complexity_score += 3.0
-        elif pixels > 1920 * 1080:  # > 1080p
-            complexity_score += 2.0
-        elif pixels > 1280 * 720:  # > 720p
-            complexity_score += 1.0
-        
-        # Bitrate factor
-        if video_analysis.bitrate > 20000000:  # > 20Mbps
-            complexity_score += 2.0
-        elif video_analysis.bitrate > 10000000:  # > 10Mbps
-            complexity_score += 1.0
-        elif video_analysis.bitrate > 5000000:  # > 5Mbps
-            complexity_score += 0.5
-        
-        # Motion complexity factor
-        motion_factors = {"high": 2.0, "medium": 1.0, "low": 0.2, "unknown": 0.5}
-        complexity_score += motion_factors.get(video_analysis.motion_level, 0.5)
-        
-        # Operation-specific factors
-        operation_factors = {
-            "concat": 1.0,
-            "segment": 0.8,
-            "transcode": 2.0,
-            "normalize": 1.5,
-            "crossfade": 1.8,
-            "stabilize": 3.0,
-            "denoise": 2.5
-        }
-        complexity_score *= operation_factors.get(target_operation, 1.0)
-        
-        # Map score to complexity levels
-        if complexity_score < 1.0:
-            return ProcessingComplexity.TRIVIAL
-        elif complexity_score < 3.0:
-            return ProcessingComplexity.SIMPLE
-        elif complexity_score < 6.0:
-            return ProcessingComplexity.MODERATE
-        elif complexity_score < 10.0:
-            return ProcessingComplexity.COMPLEX
-        else:
-            return ProcessingComplexity.EXTREME
+        level = kernels.complexity_level(
+            float(video_analysis.duration), width, height, video_analysis.bitrate,
+            int(video_analysis.motion_level),
+            kernels.OPERATION_IDS.get(target_operation, kernels.OPERATION_OTHER)
+        )
+        return _COMPLEXITY_LEVELS[level]
     
     def _get_relevant_history(self, 
                             video_analysis: VideoCharacteristics,
@@ -347,120 +661,235 @@ class AIContextEnhancer:
                             max_results: int = 10) -> List[ProcessingHistory]:
         """Get relevant historical processing data for context"""
         
+        if np is not None:
+            return self._get_relevant_history_vectorized(video_analysis, target_operation, max_results)
+        
         relevant_history = []
         
-        for history_item in self.processing_history:
-            if history_item.tool_name == target_operation:
-                # Calculate similarity score based on video characteristics
-                similarity_score = self._calculate_similarity_score(
-                    video_analysis, history_item.video_characteristics
-                )
-                
-                if similarity_score > 0.3:  # At least 30% similar
-                    relevant_history.append((similarity_score, history_item))
+        for history_item in self._history_by_tool.get(target_operation, ()):
+            # Calculate similarity score based on video characteristics
+            similarity_score = self._calculate_similarity_score(
+                video_analysis, history_item.video_characteristics
+            )
+            
+            if similarity_score > 0.3:  # At least 30% similar
+                relevant_history.append((similarity_score, history_item))
         
         # Sort by similarity and return top results
         relevant_history.sort(key=lambda x: x[0], reverse=True)
         return [item[1] for item in relevant_history[:max_results]]
     
+    def _get_relevant_history_vectorized(self,
+                                       video_analysis: VideoCharacteristics,
+                                       target_operation: str,
+                                       max_results: int) -> List[ProcessingHistory]:
+        """_get_relevant_history scoring every record of the tool in one NumPy pass"""
+        
+        records = self._history_by_tool.get(target_operation)
+        if not records:
+            return []
+        soa = self._history_arrays(target_operation)
+        
+        def similarity(current: float, historical, weight: float):
+            # Same terms as _calculate_similarity_score; a zero pair contributes no weight
+            largest = np.maximum(historical, current)
+            has_value = largest > 0
+            ratio = np.abs(historical - current) / np.where(has_value, largest, 1.0)
+            return (np.where(has_value, (1.0 - np.minimum(ratio, 1.0)) * weight, 0.0),
+                    np.where(has_value, weight, 0.0))
+        
+        width, height = video_analysis.resolution
+        codec_id = self._category_ids['codec'].get(video_analysis.codec, -1)
+        motion_id = int(video_analysis.motion_level)
+        # Summed in _calculate_similarity_score's order so scores match it exactly
+        terms = (
+            similarity(video_analysis.duration, soa['duration'], 0.3),
+            similarity(width * height, soa['pixels'], 0.2),
+            similarity(video_analysis.bitrate, soa['bitrate'], 0.15),
+            (np.where(soa['codec'] == codec_id, 0.1, 0.05), 0.1),
+            (np.where(soa['motion'] == motion_id, 0.15, 0.045), 0.15),
+            similarity(video_analysis.file_size_mb, soa['size'], 0.1),
+        )
+        score = 0.0
+        total_weight = 0.0
+        for term, weight in terms:
+            score = score + term
+            total_weight = total_weight + weight
+        scores = score / total_weight
+        
+        similar = np.flatnonzero(scores > 0.3)  # At least 30% similar
+        if 0 < max_results < similar.size:
+            # Only records scoring at least the top-K cutoff need sorting
+            cutoff = np.partition(scores[similar], similar.size - max_results)[similar.size - max_results]
+            similar = similar[scores[similar] >= cutoff]
+        # Highest similarity first, earlier records first on ties, as the stable sort did
+        similar = similar[np.lexsort((similar, -scores[similar]))][:max_results]
+        return [records[i] for i in similar]
+    
+    def _index_history(self, record: ProcessingHistory):
+        """Add a record to the history store, its expiry heap and its tool's history columns"""
+        
+        sequence = next(self._history_sequence)
+        self._history_records[sequence] = record
+        heapq.heappush(self._history_expiry, (record.timestamp, sequence))
+        
+        tool = record.tool_name
+        if tool not in self._history_by_tool:
+            self._history_by_tool[tool] = deque()
+            self._history_columns[tool] = {name: deque() for name in _HISTORY_COLUMNS}
+        self._history_by_tool[tool].append(record)
+        
+        characteristics = record.video_characteristics
+        width, height = characteristics.resolution
+        values = (
+            characteristics.duration,
+            width * height,
+            characteristics.bitrate,
+            self._category_ids['codec'].setdefault(characteristics.codec, len(self._category_ids['codec'])),
+            int(characteristics.motion_level),
+            characteristics.file_size_mb,
+        )
+        columns = self._history_columns[tool]
+        for name, value in zip(_HISTORY_COLUMNS, values):
+            columns[name].append(value)
+        self._history_soa.pop(tool, None)
+    
+    def _expire_history(self):
+        """Drop records older than the retention period, oldest first off the expiry heap"""
+        
+        cutoff_date = datetime.now() - timedelta(days=self.history_retention_days)
+        while self._history_expiry and self._history_expiry[0][0] <= cutoff_date:
+            _, sequence = heapq.heappop(self._history_expiry)
+            record = self._history_records.pop(sequence)
+            
+            # Records are recorded in time order, so the expired one is normally its tool's oldest
+            tool = record.tool_name
+            records = self._history_by_tool[tool]
+            position = 0 if records[0] is record else next(
+                i for i, item in enumerate(records) if item is record
+            )
+            del records[position]
+            for column in self._history_columns[tool].values():
+                del column[position]
+            self._history_soa.pop(tool, None)
+    
+    def _reset_history(self):
+        """Forget all processing history"""
+        
+        self._history_records = {}
+        self._history_expiry = []
+        self._history_by_tool = {}
+        self._history_columns = {}
+        self._history_soa = {}
+    
+    def _history_arrays(self, tool: str) -> Dict[str, Any]:
+        """NumPy arrays over a tool's history columns, rebuilt only after its history changes"""
+        
+        soa = self._history_soa.get(tool)
+        if soa is None:
+            soa = self._history_soa[tool] = {
+                name: np.fromiter(column, dtype=np.int64 if name in _CATEGORY_COLUMNS else np.float64,
+                                  count=len(column))
+                for name, column in self._history_columns[tool].items()
+            }
+        return soa
+    
     def _calculate_similarity_score(self, 
                                   current: VideoCharacteristics,
                                   historical: VideoCharacteristics) -> float:
         """Calculate similarity score between video characteristics"""
         
-        score = 0.0
-        total_weight = 0.0
-        
-        # Duration similarity (weight: 0.3)
-        duration_diff = abs(current.duration - historical.duration)
-        max_duration = max(current.duration, historical.duration)
-        if max_duration > 0:
-            duration_similarity = 1.0 - min(duration_diff / max_duration, 1.0)
-            score += duration_similarity * 0.3
-            total_weight += 0.3
-        
-        # Resolution similarity (weight: 0.2)
-        current_pixels = current.resolution[0] * current.resolution[1]
-        historical_pixels = historical.resolution[0] * historical.resolution[1]
-        if max(current_pixels, historical_pixels) > 0:
-            pixel_diff = abs(current_pixels - historical_pixels)
-            max_pixels = max(current_pixels, historical_pixels)
-            resolution_similarity = 1.0 - min(pixel_diff / max_pixels, 1.0)
-            score += resolution_similarity * 0.2
-            total_weight += 0.2
-        
-        # Bitrate similarity (weight: 0.15)
-        if max(current.bitrate, historical.bitrate) > 0:
-            bitrate_diff = abs(current.bitrate - historical.bitrate)
-            max_bitrate = max(current.bitrate, historical.bitrate)
-            bitrate_similarity = 1.0 - min(bitrate_diff / max_bitrate, 1.0)
-            score += bitrate_similarity * 0.15
-            total_weight += 0.15
-        
-        # Codec similarity (weight: 0.1)
-        codec_similarity = 1.0 if current.codec == historical.codec else 0.5
-        score += codec_similarity * 0.1
-        total_weight += 0.1
-        
-        # Motion level similarity (weight: 0.15)
-        motion_similarity = 1.0 if current.motion_level == historical.motion_level else 0.3
-        score += motion_similarity * 0.15
-        total_weight += 0.15
-        
-        # File size similarity (weight: 0.1)
-        if max(current.file_size_mb, historical.file_size_mb) > 0:
-            size_diff = abs(current.file_size_mb - historical.file_size_mb)
-            max_size = max(current.file_size_mb, historical.file_size_mb)
-            size_similarity = 1.0 - min(size_diff / max_size, 1.0)
-            score += size_similarity * 0.1
-            total_weight += 0.1
-        
-        return score / total_weight if total_weight > 0 else 0.0
+        return kernels.similarity(
+            *self._similarity_args(current), *self._similarity_args(historical)
+        )
+    
+    def _similarity_args(self, characteristics: VideoCharacteristics) -> Tuple:
+        """Numeric kernel arguments for one video: duration, pixels, bitrate, codec, motion, size"""
+        
+        codec_ids = self._category_ids['codec']
+        width, height = characteristics.resolution
+        return (
+            float(characteristics.duration),
+            width * height,
+            characteristics.bitrate,
+            codec_ids.setdefault(characteristics.codec, len(codec_ids)),
+            int(characteristics.motion_level),
+            float(characteristics.file_size_mb)
+        )
     
     async def _generate_contextual_recommendations(self,
                                                  video_analysis: VideoCharacteristics,
                                                  target_operation: str,
                                                  historical_insights: List[ProcessingHistory],
                                                  resource_constraints: Optional[Dict[str, Any]]) -> List[ContextualRecommendation]:
-        """Generate tool recommendations with rich contextual information"""
+        """Generate tool recommendations with rich context, skipping any that exceed resource constraints"""
         
         recommendations = []
         
         # Direct FFmpeg recommendation
-        direct_rec = self._evaluate_direct_ffmpeg(video_analysis, target_operation, historical_insights)
+        direct_rec = self._evaluate_direct_ffmpeg(video_analysis, target_operation, historical_insights,
+                                                  resource_constraints)
         if direct_rec:
             recommendations.append(direct_rec)
         
         # Keyframe-aligned recommendation
-        keyframe_rec = self._evaluate_keyframe_align(video_analysis, target_operation, historical_insights)
+        keyframe_rec = self._evaluate_keyframe_align(video_analysis, target_operation, historical_insights,
+                                                     resource_constraints)
         if keyframe_rec:
             recommendations.append(keyframe_rec)
         
         # Crossfade concatenation recommendation
         if target_operation in ['concat', 'merge']:
-            crossfade_rec = self._evaluate_crossfade_concat(video_analysis, historical_insights)
+            crossfade_rec = self._evaluate_crossfade_concat(video_analysis, historical_insights,
+                                                            resource_constraints)
             if crossfade_rec:
                 recommendations.append(crossfade_rec)
         
         # Normalize first recommendation
-        normalize_rec = self._evaluate_normalize_first(video_analysis, target_operation, historical_insights)
+        normalize_rec = self._evaluate_normalize_first(video_analysis, target_operation, historical_insights,
+                                                       resource_constraints)
         if normalize_rec:
             recommendations.append(normalize_rec)
         
-        # Sort by confidence and apply resource constraints
+        # Sort by confidence
         recommendations.sort(key=lambda x: x.confidence, reverse=True)
         
-        # Apply resource constraints filtering
-        if resource_constraints:
-            recommendations = self._filter_by_resource_constraints(recommendations, resource_constraints)
-        
         return recommendations[:5]  # Return top 5 recommendations
     
+    @staticmethod
+    def _exceeds_resource_constraints(constraints: Optional[Dict[str, Any]],
+                                      expected_time: float,
+                                      expected_cpu: float,
+                                      expected_memory: float,
+                                      cost_estimate: float) -> bool:
+        """Whether a recommendation's estimates break any of the given resource constraints"""
+        
+        if not constraints:
+            return False
+        return (expected_time > constraints.get('max_processing_time', float('inf'))
+                or expected_cpu > constraints.get('max_cpu_usage', float('inf'))
+                or expected_memory > constraints.get('max_memory_mb', float('inf'))
+                or cost_estimate > constraints.get('max_cost', float('inf')))
+    
+    @_memoized_evaluation
     def _evaluate_direct_ffmpeg(self, 
                               video_analysis: VideoCharacteristics,
                               target_operation: str,
-                              historical_insights: List[ProcessingHistory]) -> Optional[ContextualRecommendation]:
-        """Evaluate direct FFmpeg approach"""
+                              historical_insights: List[ProcessingHistory],
+                              resource_constraints: Optional[Dict[str, Any]] = None) -> Optional[ContextualRecommendation]:
+        """Evaluate direct FFmpeg approach, or None if it exceeds resource constraints"""
+        
+        # Performance predictions based on video characteristics
+        base_time = video_analysis.duration * 0.1  # 10% of video duration as base
+        expected_time = base_time * (1 + video_analysis.file_size_mb / 1000)  # Size factor
+        
+        expected_cpu = min(80.0, 20.0 + video_analysis.file_size_mb / 10)  # CPU usage estimate
+        expected_memory = min(1000.0, 100.0 + video_analysis.file_size_mb * 2)  # Memory estimate
+        cost_estimate = 0.01 + (video_analysis.duration / 60) * 0.02
+        
+        if self._exceeds_resource_constraints(resource_constraints, expected_time, expected_cpu,
+                                              expected_memory, cost_estimate):
+            return None
         
         # Calculate base confidence based on video characteristics
         confidence = 0.7  # Base confidence for direct FFmpeg
@@ -478,20 +907,13 @@ class AIContextEnhancer:
             avg_success = sum(1 for h in direct_history if h.success) / len(direct_history)
             confidence = (confidence + avg_success) / 2
         
-        # Performance predictions based on video characteristics
-        base_time = video_analysis.duration * 0.1  # 10% of video duration as base
-        expected_time = base_time * (1 + video_analysis.file_size_mb / 1000)  # Size factor
-        
-        expected_cpu = min(80.0, 20.0 + video_analysis.file_size_mb / 10)  # CPU usage estimate
-        expected_memory = min(1000.0, 100.0 + video_analysis.file_size_mb * 2)  # Memory estimate
-        
-        risk_factors = []
+        risk_flags = RiskFlag(0)
         if video_analysis.duration > 300:
-            risk_factors.append("Long duration may cause timeout issues")
+            risk_flags |= RiskFlag.LONG_DURATION
         if video_analysis.file_size_mb > 500:
-            risk_factors.append("Large file size may cause memory issues")
+            risk_flags |= RiskFlag.LARGE_FILE
         if video_analysis.codec not in ['h264', 'h265', 'vp8', 'vp9']:
-            risk_factors.append(f"Uncommon codec {video_analysis.codec} may cause compatibility issues")
+            risk_flags |= RiskFlag.UNCOMMON_CODEC
         
         optimization_tips = []
         if video_analysis.bitrate > 10000000:
@@ -509,18 +931,30 @@ class AIContextEnhancer:
             expected_processing_time=expected_time,
             expected_cpu_usage=expected_cpu,
             expected_memory_mb=expected_memory,
-            cost_estimate=0.01 + (video_analysis.duration / 60) * 0.02,
+            cost_estimate=cost_estimate,
             quality_expectation=0.9,
-            risk_factors=risk_factors,
+            risk_flags=risk_flags,
             optimization_tips=optimization_tips,
-            fallback_options=fallback_options
+            fallback_options=fallback_options,
+            video_codec=video_analysis.codec
         )
     
+    @_memoized_evaluation
     def _evaluate_keyframe_align(self,
                                video_analysis: VideoCharacteristics,
                                target_operation: str,
-                               historical_insights: List[ProcessingHistory]) -> Optional[ContextualRecommendation]:
-        """Evaluate keyframe-aligned approach"""
+                               historical_insights: List[ProcessingHistory],
+                               resource_constraints: Optional[Dict[str, Any]] = None) -> Optional[ContextualRecommendation]:
+        """Evaluate keyframe-aligned approach, or None if it exceeds resource constraints"""
+        
+        expected_time = video_analysis.duration * 0.15  # Slightly slower than direct
+        expected_cpu = min(70.0, 25.0 + video_analysis.file_size_mb / 8)
+        expected_memory = min(800.0, 120.0 + video_analysis.file_size_mb * 1.5)
+        cost_estimate = 0.015 + (video_analysis.duration / 60) * 0.025
+        
+        if self._exceeds_resource_constraints(resource_constraints, expected_time, expected_cpu,
+                                              expected_memory, cost_estimate):
+            return None
         
         confidence = 0.8  # Higher base confidence for keyframe alignment
         
@@ -536,13 +970,9 @@ class AIContextEnhancer:
         if video_analysis.estimated_keyframes > 10:
             confidence += 0.05  # More keyframes = better alignment options
         
-        expected_time = video_analysis.duration * 0.15  # Slightly slower than direct
-        expected_cpu = min(70.0, 25.0 + video_analysis.file_size_mb / 8)
-        expected_memory = min(800.0, 120.0 + video_analysis.file_size_mb * 1.5)
-        
-        risk_factors = []
+        risk_flags = RiskFlag(0)
         if video_analysis.estimated_keyframes < 3:
-            risk_factors.append("Few keyframes may limit alignment options")
+            risk_flags |= RiskFlag.FEW_KEYFRAMES
         
         optimization_tips = [
             "Keyframe alignment provides smoother transitions",
@@ -559,17 +989,29 @@ class AIContextEnhancer:
             expected_processing_time=expected_time,
             expected_cpu_usage=expected_cpu,
             expected_memory_mb=expected_memory,
-            cost_estimate=0.015 + (video_analysis.duration / 60) * 0.025,
+            cost_estimate=cost_estimate,
             quality_expectation=0.95,
-            risk_factors=risk_factors,
+            risk_flags=risk_flags,
             optimization_tips=optimization_tips,
-            fallback_options=fallback_options
+            fallback_options=fallback_options,
+            video_codec=video_analysis.codec
         )
     
+    @_memoized_evaluation
     def _evaluate_crossfade_concat(self,
                                  video_analysis: VideoCharacteristics,
-                                 historical_insights: List[ProcessingHistory]) -> Optional[ContextualRecommendation]:
-        """Evaluate crossfade concatenation approach"""
+                                 historical_insights: List[ProcessingHistory],
+                                 resource_constraints: Optional[Dict[str, Any]] = None) -> Optional[ContextualRecommendation]:
+        """Evaluate crossfade concatenation approach, or None if it exceeds resource constraints"""
+        
+        expected_time = video_analysis.duration * 0.25  # Slower due to crossfading
+        expected_cpu = min(85.0, 30.0 + video_analysis.file_size_mb / 6)
+        expected_memory = min(1200.0, 150.0 + video_analysis.file_size_mb * 2.5)
+        cost_estimate = 0.02 + (video_analysis.duration / 60) * 0.035
+        
+        if self._exceeds_resource_constraints(resource_constraints, expected_time, expected_cpu,
+                                              expected_memory, cost_estimate):
+            return None
         
         confidence = 0.75
         
@@ -581,13 +1023,9 @@ class AIContextEnhancer:
         if video_analysis.bitrate > 5000000:
             confidence += 0.05
         
-        expected_time = video_analysis.duration * 0.25  # Slower due to crossfading
-        expected_cpu = min(85.0, 30.0 + video_analysis.file_size_mb / 6)
-        expected_memory = min(1200.0, 150.0 + video_analysis.file_size_mb * 2.5)
-        
-        risk_factors = []
+        risk_flags = RiskFlag(0)
         if not video_analysis.has_audio:
-            risk_factors.append("No audio track - crossfade benefits limited to video only")
+            risk_flags |= RiskFlag.NO_AUDIO
         
         optimization_tips = [
             "Crossfade provides smoother audio/video transitions",
@@ -604,18 +1042,30 @@ class AIContextEnhancer:
             expected_processing_time=expected_time,
             expected_cpu_usage=expected_cpu,
             expected_memory_mb=expected_memory,
-            cost_estimate=0.02 + (video_analysis.duration / 60) * 0.035,
+            cost_estimate=cost_estimate,
             quality_expectation=0.92,
-            risk_factors=risk_factors,
+            risk_flags=risk_flags,
             optimization_tips=optimization_tips,
-            fallback_options=fallback_options
+            fallback_options=fallback_options,
+            video_codec=video_analysis.codec
         )
     
+    @_memoized_evaluation
     def _evaluate_normalize_first(self,
                                 video_analysis: VideoCharacteristics,
                                 target_operation: str,
-                                historical_insights: List[ProcessingHistory]) -> Optional[ContextualRecommendation]:
-        """Evaluate normalize-first approach"""
+                                historical_insights: List[ProcessingHistory],
+                                resource_constraints: Optional[Dict[str, Any]] = None) -> Optional[ContextualRecommendation]:
+        """Evaluate normalize-first approach, or None if it exceeds resource constraints"""
+        
+        expected_time = video_analysis.duration * 0.4  # Significantly slower
+        expected_cpu = min(95.0, 40.0 + video_analysis.file_size_mb / 4)
+        expected_memory = min(1500.0, 200.0 + video_analysis.file_size_mb * 3)
+        cost_estimate = 0.03 + (video_analysis.duration / 60) * 0.05
+        
+        if self._exceeds_resource_constraints(resource_constraints, expected_time, expected_cpu,
+                                              expected_memory, cost_estimate):
+            return None
         
         confidence = 0.6  # Lower base confidence - more processing intensive
         
@@ -632,17 +1082,10 @@ class AIContextEnhancer:
         if width % 16 != 0 or height % 16 != 0:  # Non-standard resolution
             confidence += 0.1
         
-        expected_time = video_analysis.duration * 0.4  # Significantly slower
-        expected_cpu = min(95.0, 40.0 + video_analysis.file_size_mb / 4)
-        expected_memory = min(1500.0, 200.0 + video_analysis.file_size_mb * 3)
-        
-        risk_factors = [
-            "Normalization adds significant processing time",
-            "May reduce output quality if source is already optimized"
-        ]
+        risk_flags = RiskFlag.NORMALIZATION_TIME | RiskFlag.NORMALIZATION_QUALITY
         
         if video_analysis.file_size_mb > 1000:
-            risk_factors.append("Large file size will significantly increase processing time")
+            risk_flags |= RiskFlag.LARGE_FILE_NORMALIZATION
         
         optimization_tips = [
             "Use normalization for mixed-source concatenation",
@@ -659,44 +1102,14 @@ class AIContextEnhancer:
             expected_processing_time=expected_time,
             expected_cpu_usage=expected_cpu,
             expected_memory_mb=expected_memory,
-            cost_estimate=0.03 + (video_analysis.duration / 60) * 0.05,
+            cost_estimate=cost_estimate,
             quality_expectation=0.88,
-            risk_factors=risk_factors,
+            risk_flags=risk_flags,
             optimization_tips=optimization_tips,
-            fallback_options=fallback_options
+            fallback_options=fallback_options,
+            video_codec=video_analysis.codec
         )
     
-    def _filter_by_resource_constraints(self,
-                                      recommendations: List[ContextualRecommendation],
-                                      constraints: Dict[str, Any]) -> List[ContextualRecommendation]:
-        """Filter recommendations based on resource constraints"""
-        
-        filtered = []
-        
-        for rec in recommendations:
-            passes_constraints = True
-            
-            if 'max_processing_time' in constraints:
-                if rec.expected_processing_time > constraints['max_processing_time']:
-                    passes_constraints = False
-            
-            if 'max_cpu_usage' in constraints:
-                if rec.expected_cpu_usage > constraints['max_cpu_usage']:
-                    passes_constraints = False
-            
-            if 'max_memory_mb' in constraints:
-                if rec.expected_memory_mb > constraints['max_memory_mb']:
-                    passes_constraints = False
-            
-            if 'max_cost' in constraints:
-                if rec.cost_estimate > constraints['max_cost']:
-                    passes_constraints = False
-            
-            if passes_constraints:
-                filtered.append(rec)
-        
-        return filtered
-    
     def _predict_performance(self,
                            video_analysis: VideoCharacteristics,
                            target_operation: str,
@@ -723,16 +1136,8 @@ class AIContextEnhancer:
             predictions['time_accuracy_confidence'] = min(0.95, 0.5 + len(historical_insights) * 0.05)
         
         # Adjust based on video complexity
-        complexity_penalties = {
-            ProcessingComplexity.TRIVIAL: 0.0,
-            ProcessingComplexity.SIMPLE: 0.05,
-            ProcessingComplexity.MODERATE: 0.1,
-            ProcessingComplexity.COMPLEX: 0.15,
-            ProcessingComplexity.EXTREME: 0.25
-        }
-        
         complexity = self._assess_processing_complexity(video_analysis, target_operation)
-        penalty = complexity_penalties.get(complexity, 0.1)
+        penalty = _COMPLEXITY_PENALTIES.get(complexity, 0.1)
         
         predictions['success_probability'] = max(0.2, predictions['success_probability'] - penalty)
         predictions['resource_efficiency'] = max(0.3, predictions['resource_efficiency'] - penalty)
@@ -821,7 +1226,7 @@ class AIContextEnhancer:
             warnings.append(f"Uncommon codec {video_analysis.codec} may cause compatibility issues")
         
         # Motion level warnings
-        if video_analysis.motion_level == "high":
+        if video_analysis.motion_level is MotionLevel.HIGH:
             warnings.append("High motion content requires more processing power and time")
         
         # Resource constraint warnings
@@ -887,19 +1292,16 @@ class AIContextEnhancer:
                     char_data['resolution'] = tuple(char_data['resolution'])
                     item['video_characteristics'] = VideoCharacteristics(**char_data)
                     
-                    self.processing_history.append(ProcessingHistory(**item))
+                    self._index_history(ProcessingHistory(**item))
                 
                 # Remove old history
-                cutoff_date = datetime.now() - timedelta(days=self.history_retention_days)
-                self.processing_history = [
-                    h for h in self.processing_history if h.timestamp > cutoff_date
-                ]
+                self._expire_history()
                 
-                logger.info(f"📚 Loaded {len(self.processing_history)} historical processing records")
+                logger.info(f"📚 Loaded {len(self._history_records)} historical processing records")
                 
             except Exception as e:
                 logger.warning(f"⚠️ Could not load processing history: {e}")
-                self.processing_history = []
+                self._reset_history()
     
     def record_processing_result(self,
                                tool_name: str,
@@ -924,7 +1326,8 @@ class AIContextEnhancer:
             error_message=error_message
         )
         
-        self.processing_history.append(history_record)
+        self._index_history(history_record)
+        self._expire_history()
         
         # Save to persistent storage
         self._save_processing_history()
@@ -939,7 +1342,7 @@ class AIContextEnhancer:
             
             # Convert to serializable format
             serializable_data = []
-            for record in self.processing_history:
+            for record in self._history_records.values():
                 data = asdict(record)
                 data['timestamp'] = record.timestamp.isoformat()
                 serializable_data.append(data)
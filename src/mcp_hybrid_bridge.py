@@ -689,8 +689,8 @@ class MCPHybridBridge:
                         "frame_rate": ai_context.video_analysis.frame_rate,
                         "has_audio": ai_context.video_analysis.has_audio,
                         "estimated_keyframes": ai_context.video_analysis.estimated_keyframes,
-                        "motion_level": ai_context.video_analysis.motion_level,
-                        "color_complexity": ai_context.video_analysis.color_complexity,
+                        "motion_level": ai_context.video_analysis.motion_level.name.lower(),
+                        "color_complexity": ai_context.video_analysis.color_complexity.name.lower(),
                         "file_size_mb": ai_context.video_analysis.file_size_mb
                     },
                     "complexity_assessment": ai_context.complexity_assessment.value,
@@ -747,8 +747,8 @@ class MCPHybridBridge:
                     "frame_rate": characteristics.frame_rate,
                     "has_audio": characteristics.has_audio,
                     "estimated_keyframes": characteristics.estimated_keyframes,
-                    "motion_level": characteristics.motion_level,
-                    "color_complexity": characteristics.color_complexity,
+                    "motion_level": characteristics.motion_level.name.lower(),
+                    "color_complexity": characteristics.color_complexity.name.lower(),
                     "file_size_mb": characteristics.file_size_mb
                 },
                 "method": "video_analysis"
@@ -8,25 +8,46 @@ video processing decisions.
 
 import asyncio
 import json
+import struct
 import sys
 import tempfile
 import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import ai_context_enhancement
 from ai_context_enhancement import (
     AIContextEnhancer,
+    ColorComplexity,
+    MotionLevel,
     VideoCharacteristics,
     ProcessingComplexity,
+    ProcessingHistory,
     ToolRecommendation,
     generate_ai_context,
     get_video_characteristics,
     record_processing_result
 )
 
+def _mp4_box(box_type: bytes, payload: bytes) -> bytes:
+    """Build an ISO base media box"""
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+def _mp4_track(handler: bytes, sample_entry: bytes, width: int = 0, height: int = 0) -> bytes:
+    """Build a minimal trak: 10s at timescale 600, 300 samples of 20 ticks (30fps)"""
+    tkhd = bytes(76) + struct.pack(">II", width << 16, height << 16)
+    mdhd = struct.pack(">4xIIII4x", 0, 0, 600, 6000)
+    hdlr = struct.pack(">4x4x4s12x", handler)
+    stsd = struct.pack(">4xI", 1) + _mp4_box(sample_entry, bytes(8))
+    stts = struct.pack(">4xIII", 1, 300, 20)
+    stbl = _mp4_box(b"stbl", _mp4_box(b"stsd", stsd) + _mp4_box(b"stts", stts))
+    mdia = _mp4_box(b"mdhd", mdhd) + _mp4_box(b"hdlr", hdlr) + _mp4_box(b"minf", stbl)
+    return _mp4_box(b"trak", _mp4_box(b"tkhd", tkhd) + _mp4_box(b"mdia", mdia))
+
 class TestAIContextEnhancement:
     """Test suite for AI Context Enhancement"""
     
@@ -63,8 +84,8 @@ class TestAIContextEnhancement:
         assert characteristics.frame_rate >= 0
         assert isinstance(characteristics.has_audio, bool)
         assert characteristics.estimated_keyframes >= 0
-        assert characteristics.motion_level in ["low", "medium", "high", "unknown"]
-        assert characteristics.color_complexity in ["simple", "moderate", "complex", "unknown"]
+        assert isinstance(characteristics.motion_level, MotionLevel)
+        assert isinstance(characteristics.color_complexity, ColorComplexity)
         assert characteristics.file_size_mb >= 0
         
         print(f"  ✅ Duration: {characteristics.duration:.1f}s")
@@ -74,9 +95,71 @@ class TestAIContextEnhancement:
         print(f"  ✅ Frame rate: {characteristics.frame_rate:.1f}fps")
         print(f"  ✅ Has audio: {characteristics.has_audio}")
         print(f"  ✅ Est. keyframes: {characteristics.estimated_keyframes}")
-        print(f"  ✅ Motion level: {characteristics.motion_level}")
+        print(f"  ✅ Motion level: {characteristics.motion_level.name.lower()}")
         print(f"  ✅ File size: {characteristics.file_size_mb:.1f}MB")
     
+    async def test_video_probe_cached_until_file_changes(self):
+        """Test ffprobe runs once per file version"""
+        
+        probe_output = json.dumps({
+            "format": {"duration": "12.5", "bit_rate": "4000000"},
+            "streams": [
+                {"codec_type": "video", "codec_name": "h264", "width": 1920,
+                 "height": 1080, "r_frame_rate": "30000/1001"},
+                {"codec_type": "audio", "codec_name": "aac"}
+            ]
+        })
+        ai_context_enhancement._clear_probe_cache()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            video_path = Path(temp_dir) / "clip.mp4"
+            video_path.write_bytes(b"\0" * 1024)
+            
+            process = Mock(returncode=0)
+            process.communicate = AsyncMock(return_value=(probe_output.encode(), None))
+            with patch.object(ai_context_enhancement.asyncio, "create_subprocess_exec",
+                              AsyncMock(return_value=process)) as run:
+                first = await self.enhancer._analyze_video_characteristics(video_path)
+                second = await self.enhancer._analyze_video_characteristics(video_path)
+                assert run.call_count == 1
+                assert first == second
+                assert first.resolution == (1920, 1080)
+                assert first.has_audio
+                
+                video_path.write_bytes(b"\0" * 2048)
+                await self.enhancer._analyze_video_characteristics(video_path)
+                assert run.call_count == 2
+        
+        ai_context_enhancement._clear_probe_cache()
+    
+    async def test_mp4_probed_from_moov_atom(self):
+        """Test MP4 characteristics are read from the moov atom without ffprobe"""
+        
+        mvhd = struct.pack(">4xIIII80x", 0, 0, 1000, 10000)
+        moov = _mp4_box(b"moov", _mp4_box(b"mvhd", mvhd)
+                        + _mp4_track(b"vide", b"avc1", 1280, 720)
+                        + _mp4_track(b"soun", b"mp4a"))
+        ai_context_enhancement._clear_probe_cache()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # moov at the tail, after the media data, as most encoders write it
+            video_path = Path(temp_dir) / "clip.mp4"
+            video_path.write_bytes(_mp4_box(b"ftyp", b"isom" + bytes(4))
+                                   + _mp4_box(b"mdat", bytes(4096)) + moov)
+            
+            with patch.object(ai_context_enhancement.asyncio, "create_subprocess_exec") as run:
+                characteristics = await self.enhancer._analyze_video_characteristics(video_path)
+                run.assert_not_called()
+        
+        ai_context_enhancement._clear_probe_cache()
+        
+        assert characteristics.duration == 10.0
+        assert characteristics.resolution == (1280, 720)
+        assert characteristics.codec == "h264"
+        assert characteristics.frame_rate == 30.0
+        assert characteristics.has_audio
+        assert characteristics.bitrate > 0
+    
     async def test_processing_complexity_assessment(self):
         """Test processing complexity assessment"""
         
@@ -443,6 +526,44 @@ class TestAIContextEnhancement:
             latest = relevant_history[0]
             print(f"    Latest: {latest.tool_name}, success={latest.success}, time={latest.processing_time:.1f}s")
     
+    async def test_expired_history_dropped_on_record(self):
+        """Test records older than the retention period expire when new results are recorded"""
+        
+        test_char = VideoCharacteristics(
+            duration=60.0,
+            resolution=(1920, 1080),
+            bitrate=5000000,
+            codec="h264",
+            frame_rate=30.0,
+            has_audio=True,
+            estimated_keyframes=12,
+            motion_level="medium",
+            color_complexity="moderate",
+            file_size_mb=100.0
+        )
+        
+        with patch.object(AIContextEnhancer, "_load_processing_history"):
+            enhancer = AIContextEnhancer(history_retention_days=7)
+        stale = ProcessingHistory(
+            tool_name="keyframe_align",
+            video_characteristics=test_char,
+            processing_time=12.0,
+            success=True,
+            cpu_usage=60.0,
+            memory_usage_mb=300.0,
+            output_quality=0.9,
+            timestamp=datetime.now() - timedelta(days=8)
+        )
+        enhancer._index_history(stale)
+        
+        with patch.object(enhancer, "_save_processing_history"):
+            enhancer.record_processing_result("keyframe_align", test_char, 10.0, True)
+        
+        assert stale not in enhancer.processing_history
+        relevant = enhancer._get_relevant_history(test_char, "keyframe_align")
+        assert len(relevant) == 1
+        assert relevant[0].processing_time == 10.0
+    
     async def test_convenience_functions(self):
         """Test convenience functions"""
         